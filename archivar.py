@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Archiva los trabajos cerrados de un año
+Mueve las obras e informes de ese año que ya tienen fecha de salida desde
+registros.xlsx a registros_<año>.xlsx. Los trabajos archivados se siguen
+pudiendo consultar desde el sistema, pero quedan de solo lectura.
+
+Uso:
+    python archivar.py <año>
+"""
+
+import sys
+
+from modules.data_manager import DataManager
+
+
+def main():
+    if len(sys.argv) != 2 or not sys.argv[1].isdigit():
+        print("Uso: python archivar.py <año>")
+        return 1
+
+    year = int(sys.argv[1])
+    data_manager = DataManager()
+    try:
+        archivados = data_manager.archive_year(year)
+    finally:
+        data_manager.close()
+    return 0 if archivados >= 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -20,6 +20,20 @@ INFORMES_PATH = BASE_PATH / "informes_tecnicos"  # Nueva carpeta
 # Rutas específicas
 EXCEL_FILE = DATA_PATH / "registros.xlsx"
 
+# Backend de almacenamiento de registros:
+# "excel" guarda directamente en registros.xlsx
+# "sqlite" guarda en registros.db y exporta a registros.xlsx al cerrar
+STORAGE_BACKEND = "excel"
+
+# Segundos sin cambios antes de guardar en disco los cambios acumulados
+# (0 = guardar cada cambio en el acto)
+WRITE_BEHIND_DELAY = 2.0
+
+# Diario de cambios (registros.journal.jsonl): cada alta o modificación queda
+# en disco en el acto y se pasa al Excel cada JOURNAL_COMPACTION_DELAY segundos
+JOURNAL_ENABLED = True
+JOURNAL_COMPACTION_DELAY = 30.0
+
 TIPOS_INFORME = [
     "Informe de Homologación-Cambio de tipo", 
     "Plan de Contingencia", 
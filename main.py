@@ -12,6 +12,10 @@ Fecha: Abril 2025
 
 import os
 import sys
+# Primero el medidor de arranque, para que el total incluya las importaciones
+from modules.startup_timer import startup_timer
+if os.environ.get("CPIM_IMPORTTIME"):
+    startup_timer.enable_import_timing()
 import customtkinter as ctk
 from modules.gui import App
 from config import ensure_directories
@@ -25,13 +29,19 @@ def main():
         # Modos: "System" (default), "Dark", "Light"
         ctk.set_default_color_theme("blue")  # Temas: "blue" (default), "dark-blue", "green"
         
-        # Asegurar que las carpetas necesarias existen
-        ensure_directories()
+        # Asegurar que las carpetas necesarias existen (única vez en el arranque)
+        with startup_timer.step("Carpetas"):
+            ensure_directories()
         
         # Iniciar la aplicación
-        app = App()
+        with startup_timer.step("Ventana principal"):
+            app = App()
+        startup_timer.report()
         app.mainloop()
         
+        # Sincronizar los datos pendientes al cerrar
+        app.data_manager.close()
+        
     except Exception as e:
         print(f"Error al iniciar la aplicación: {e}")
         import traceback
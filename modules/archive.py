@@ -0,0 +1,325 @@
+"""
+Archivo histórico por año.
+Los trabajos cerrados (ya retirados) de años anteriores se pueden mover
+desde registros.xlsx a un libro de solo lectura por año
+(registros_2023.xlsx, registros_2024.xlsx, ...), para que el libro en
+uso se mantenga chico. Un índice liviano (registros_archivo.json) dice
+qué IDs, cajas y expedientes tiene cada año, con los datos del
+directorio de profesionales y comitentes y lo necesario para saber qué
+años entran en un análisis de visados, así que un libro de archivo solo
+se lee cuando una consulta lo necesita; una vez leído queda en memoria
+junto con sus índices.
+"""
+
+import os
+import json
+import threading
+from datetime import date
+from pathlib import Path
+
+from modules.directory import parse_date, NAME_FIELDS
+from modules.caja_index import CajaIndex, caja_key
+from modules.expediente_index import ExpedienteIndex, expediente_key
+from modules.search_index import SearchIndex, SEARCH_OPTIONS
+from modules.storage.excel_backend import ExcelBackend
+
+
+def record_year(record):
+    """Año de la fecha de un registro, o None si no tiene una fecha reconocible"""
+    fecha = parse_date(record.get("fecha"))
+    return fecha.year if fecha is not None else None
+
+
+def is_closed(record):
+    """Un trabajo está cerrado cuando ya tiene fecha de salida (fue retirado)"""
+    fecha_salida = record.get("fecha_salida")
+    return fecha_salida is not None and str(fecha_salida).strip() != ""
+
+
+# Tasas de visado de una obra (ver TasasAnalyzer)
+VISADO_FIELDS = ("visado_gas", "visado_salubridad", "visado_electrica", "visado_electromecanica")
+
+
+def has_unpaid_visado(obra):
+    """Obra con alguna tasa de visado que todavía no figura como pagada"""
+    if obra.get("estado_pago_visado") == "Pagado":
+        return False
+    return any(obra.get(field) and str(obra.get(field)).strip() for field in VISADO_FIELDS)
+
+
+class ArchivedYear:
+    """Registros de un libro de archivo ya leído, con sus índices"""
+
+    def __init__(self, obras, informes):
+        self.rows = {"obra": obras, "informe": informes}
+        self.positions = {
+            work_type: {record.id: index for index, record in enumerate(rows)}
+            for work_type, rows in self.rows.items()
+        }
+        self.caja_index = CajaIndex()
+        self.caja_index.build(obras, informes)
+        self.expediente_index = ExpedienteIndex()
+        self.expediente_index.build(obras, informes)
+        self._search_indexes = {}
+
+    def find(self, work_type, row_id):
+        index = self.positions[work_type].get(row_id)
+        return None if index is None else self.rows[work_type][index]
+
+    def search_index(self, work_type):
+        """Índice de búsqueda del año, construido la primera vez que se busca"""
+        index = self._search_indexes.get(work_type)
+        if index is None:
+            index = SearchIndex(SEARCH_OPTIONS[work_type].values())
+            index.build(self.rows[work_type])
+            self._search_indexes[work_type] = index
+        return index
+
+
+class Archive:
+    """Libros de archivo por año que acompañan a registros.xlsx"""
+
+    def __init__(self, excel_file):
+        self.excel_file = Path(excel_file)
+        self.index_file = self.excel_file.with_name(f"{self.excel_file.stem}_archivo.json")
+        self._lock = threading.RLock()
+        self._loaded = {}  # {año: (firma del libro, ArchivedYear)}
+        self._index = self._read_index()
+        self._id_sets = None
+
+    def year_file(self, year):
+        """Ruta del libro de archivo de un año"""
+        return self.excel_file.with_name(f"{self.excel_file.stem}_{year}{self.excel_file.suffix}")
+
+    # Índice
+
+    def _read_index(self):
+        if not self.index_file.exists():
+            return {}
+        try:
+            with open(self.index_file, encoding="utf-8") as index_file:
+                return {int(year): data for year, data in json.load(index_file).items()}
+        except Exception as e:
+            print(f"Error al leer el índice del archivo: {e}")
+            return {}
+
+    def _write_index(self):
+        temp_path = self.index_file.with_name(self.index_file.name + ".tmp")
+        with open(temp_path, "w", encoding="utf-8") as index_file:
+            json.dump({str(year): data for year, data in sorted(self._index.items())},
+                      index_file, ensure_ascii=False, default=str)
+        os.replace(temp_path, self.index_file)
+
+    @staticmethod
+    def _year_summary(obras, informes):
+        """
+        Lo que el índice guarda de cada año: IDs, cajas, expedientes, los
+        datos del directorio de cada trabajo, el rango de fechas de salida
+        de las obras y cuántas tienen visados sin pagar
+        """
+        cajas = {}
+        expedientes = set()
+        directorio = []
+        for work_type, records in (("obra", obras), ("informe", informes)):
+            for record in records:
+                caja = caja_key(record.get("nro_caja"))
+                if caja is not None:
+                    cajas[caja] = cajas.get(caja, 0) + 1
+                expediente = expediente_key(record.get("nro_expediente_cpim"))
+                if expediente is not None:
+                    expedientes.add(expediente)
+                fecha = parse_date(record.get("fecha"))
+                directorio.append([
+                    work_type, record.id,
+                    record.get(NAME_FIELDS["profesional"][work_type]),
+                    record.get(NAME_FIELDS["comitente"][work_type]),
+                    fecha.isoformat() if fecha is not None else None,
+                    record.get("whatsapp_profesional"),
+                ])
+
+        salidas = [fecha for fecha in (parse_date(obra.get("fecha_salida")) for obra in obras) if fecha is not None]
+        return {
+            "obra": [record.id for record in obras],
+            "informe": [record.id for record in informes],
+            "cajas": [[caja, cantidad] for caja, cantidad in cajas.items()],
+            "expedientes": sorted(expedientes),
+            "directorio": directorio,
+            "salidas": [min(salidas).isoformat(), max(salidas).isoformat()] if salidas else None,
+            "visados_sin_pagar": sum(1 for obra in obras if has_unpaid_visado(obra)),
+        }
+
+    def years(self):
+        """Años archivados, en orden"""
+        return sorted(self._index)
+
+    def max_id(self, work_type):
+        """ID más alto archivado del tipo (0 si no hay): los IDs nuevos siguen desde ahí"""
+        return max((max(data[work_type], default=0) for data in self._index.values()), default=0)
+
+    def max_caja(self):
+        """Número de caja más alto usado en el archivo (0 si no hay)"""
+        return max(
+            (caja for data in self._index.values() for caja, _ in data["cajas"] if isinstance(caja, int)),
+            default=0
+        )
+
+    def caja_counts(self):
+        """{caja: cantidad de trabajos archivados en ella}"""
+        counts = {}
+        for data in self._index.values():
+            for caja, cantidad in data["cajas"]:
+                counts[caja] = counts.get(caja, 0) + cantidad
+        return counts
+
+    def years_for_visados(self, desde, hasta):
+        """
+        Años que pueden aportar obras a un análisis de visados del período:
+        los que tienen salidas entre desde y hasta o visados sin pagar
+        (las obras sin pagar se consideran sin importar la fecha)
+        """
+        desde, hasta = parse_date(desde), parse_date(hasta)
+        years = []
+        for year in self.years():
+            data = self._index[year]
+            if "salidas" not in data or data.get("visados_sin_pagar", 1):
+                years.append(year)
+                continue
+            salidas = data["salidas"]
+            if salidas and salidas[0] <= hasta.isoformat() and salidas[1] >= desde.isoformat():
+                years.append(year)
+        return years
+
+    def directory_records(self):
+        """
+        [(work_type, datos)] de los trabajos archivados con los campos que
+        usa el directorio, sin leer los libros de archivo
+        """
+        result = []
+        for year in self.years():
+            data = self._index[year]
+            if "directorio" not in data:
+                # Índice anterior a estos datos: se lee el libro del año
+                archived = self.load(year)
+                result.extend((work_type, record) for work_type, rows in archived.rows.items() for record in rows)
+                continue
+            for work_type, row_id, profesional, comitente, fecha, whatsapp in data["directorio"]:
+                result.append((work_type, {
+                    "id": row_id,
+                    NAME_FIELDS["profesional"][work_type]: profesional,
+                    NAME_FIELDS["comitente"][work_type]: comitente,
+                    "fecha": date.fromisoformat(fecha) if fecha else None,
+                    "whatsapp_profesional": whatsapp,
+                }))
+        return result
+
+    def records(self, work_type, years=None):
+        """
+        Registros archivados del tipo (sin copiar), año por año en orden
+
+        Args:
+            work_type: "obra" o "informe"
+            years: Años a incluir (None para todos); solo se leen esos libros
+        """
+        result = []
+        for year in self.years():
+            if years is None or year in years:
+                result.extend(self.load(year).rows[work_type])
+        return result
+
+    def _year_of(self, work_type, row_id):
+        with self._lock:
+            if self._id_sets is None:
+                self._id_sets = {
+                    year: {tipo: set(data[tipo]) for tipo in ("obra", "informe")}
+                    for year, data in self._index.items()
+                }
+            for year, ids in self._id_sets.items():
+                if row_id in ids[work_type]:
+                    return year
+            return None
+
+    # Lectura
+
+    def load(self, year):
+        """
+        Registros de un año archivado (se lee el libro solo la primera vez)
+
+        Returns:
+            ArchivedYear, o None si el año no está archivado
+        """
+        if year not in self._index:
+            return None
+        with self._lock:
+            backend = ExcelBackend(self.year_file(year))
+            signature = backend.signature()
+            loaded = self._loaded.get(year)
+            if loaded is None or loaded[0] != signature:
+                print(f"Cargando archivo {year}...")
+                loaded = (signature, ArchivedYear(*backend.load_all()))
+                self._loaded[year] = loaded
+            return loaded[1]
+
+    def find(self, work_type, row_id):
+        """Registro archivado con ese ID (sin copiar), o None"""
+        year = self._year_of(work_type, row_id)
+        if year is None:
+            return None
+        archived = self.load(year)
+        return archived.find(work_type, row_id) if archived is not None else None
+
+    def search(self, work_type, field, text):
+        """IDs archivados cuyo campo contiene el texto (lee todos los años la primera vez)"""
+        ids = []
+        for year in self.years():
+            ids.extend(self.load(year).search_index(work_type).search(field, text))
+        return ids
+
+    def works_in_caja(self, nro_caja):
+        """[(work_type, registro)] archivados en la caja (solo se leen los años que la usan)"""
+        key = caja_key(nro_caja)
+        result = []
+        for year in self.years():
+            if any(caja == key for caja, _ in self._index[year]["cajas"]):
+                archived = self.load(year)
+                for work_type, row_id in archived.caja_index.works_in(key):
+                    result.append((work_type, archived.find(work_type, row_id)))
+        return result
+
+    def by_expediente(self, nro_expediente):
+        """[(work_type, registro)] archivados con ese expediente (solo se leen los años que lo tienen)"""
+        key = expediente_key(nro_expediente)
+        result = []
+        if key is None:
+            return result
+        for year in self.years():
+            if key in self._index[year]["expedientes"]:
+                archived = self.load(year)
+                for work_type, row_id in archived.expediente_index.lookup(key):
+                    result.append((work_type, archived.find(work_type, row_id)))
+        return result
+
+    # Escritura
+
+    def add_year(self, year, obras, informes):
+        """
+        Agrega registros al libro de archivo de un año (creándolo si no existe)
+
+        Los registros que ya estaban archivados en ese año se conservan;
+        el libro queda ordenado por ID.
+        """
+        with self._lock:
+            if year in self._index:
+                anterior = self.load(year)
+                nuevos = {"obra": {r.id for r in obras}, "informe": {r.id for r in informes}}
+                obras = [r for r in anterior.rows["obra"] if r.id not in nuevos["obra"]] + list(obras)
+                informes = [r for r in anterior.rows["informe"] if r.id not in nuevos["informe"]] + list(informes)
+            obras = sorted(obras, key=lambda record: record.id)
+            informes = sorted(informes, key=lambda record: record.id)
+
+            backend = ExcelBackend(self.year_file(year))
+            backend.save_all(obras, informes)
+
+            self._index[year] = self._year_summary(obras, informes)
+            self._write_index()
+            self._id_sets = None
+            self._loaded[year] = (backend.signature(), ArchivedYear(obras, informes))
@@ -0,0 +1,103 @@
+"""
+Índice de cajas del archivo.
+Agrupa las obras e informes por número de caja y mantiene el número
+de caja más alto, de modo que obtener la próxima caja o listar el
+contenido de una caja no requiere recorrer las hojas.
+"""
+
+
+def caja_key(value):
+    """
+    Normaliza un número de caja
+
+    Las ventanas guardan la caja como texto ("12") y el Excel puede
+    tenerla como número (12 o 12.0); ambos se consideran la misma caja.
+
+    Returns:
+        int para cajas numéricas, el texto sin espacios para otras, o None si está vacía
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value) if value else None
+    text = str(value).strip()
+    if not text:
+        return None
+    if text.isdigit():
+        return int(text) or None
+    return text
+
+
+def caja_sort_key(caja):
+    """Orden de las cajas: primero las numéricas de menor a mayor, luego las de texto"""
+    return (not isinstance(caja, int), caja if isinstance(caja, int) else 0, str(caja))
+
+
+class CajaIndex:
+    """Índice caja -> trabajos, con el número de caja máximo"""
+
+    def __init__(self):
+        self._works = {}  # {caja: {(work_type, id): None}} (dict para mantener el orden)
+        self._max = 0
+
+    def build(self, obras, informes):
+        """Construye el índice recorriendo una vez ambas hojas"""
+        self.__init__()
+        for work_type, records in (("obra", obras), ("informe", informes)):
+            for record in records:
+                self.add(work_type, record)
+
+    def add(self, work_type, record):
+        """Incorpora un registro nuevo"""
+        self._add(work_type, record.get("id"), caja_key(record.get("nro_caja")))
+
+    def update(self, work_type, record, caja_anterior):
+        """
+        Refleja el cambio de caja de un registro
+
+        Args:
+            work_type: "obra" o "informe"
+            record: Registro ya modificado
+            caja_anterior: Valor de nro_caja antes de la modificación
+        """
+        anterior = caja_key(caja_anterior)
+        nueva = caja_key(record.get("nro_caja"))
+        if anterior == nueva:
+            return
+
+        row_id = record.get("id")
+        if anterior is not None:
+            works = self._works.get(anterior)
+            if works is not None:
+                works.pop((work_type, row_id), None)
+                if not works:
+                    del self._works[anterior]
+                    if anterior == self._max:
+                        # Se vació la caja más alta: buscar la siguiente entre las cajas, no entre las filas
+                        self._max = max((c for c in self._works if isinstance(c, int)), default=0)
+        self._add(work_type, row_id, nueva)
+
+    def _add(self, work_type, row_id, caja):
+        if caja is None:
+            return
+        self._works.setdefault(caja, {})[(work_type, row_id)] = None
+        if isinstance(caja, int) and caja > self._max:
+            self._max = caja
+
+    def max_caja(self):
+        """Número de caja más alto en uso (0 si no hay ninguna)"""
+        return self._max
+
+    def works_in(self, caja):
+        """Lista de (work_type, id) guardados en la caja, en orden de carga"""
+        return list(self._works.get(caja_key(caja), ()))
+
+    def count(self, caja):
+        """Cantidad de trabajos guardados en la caja"""
+        return len(self._works.get(caja_key(caja), ()))
+
+    def cajas(self):
+        """Números de caja en uso, ordenados (primero los numéricos)"""
+        return sorted(self._works, key=caja_sort_key)
@@ -0,0 +1,91 @@
+"""
+Cache de entidades derivadas de los registros (listas de profesionales
+y comitentes, número de caja máximo, etc.).
+Cada entidad tiene su propia versión: las escrituras incrementan la
+versión de las entidades que afectan (corrigiendo el valor guardado
+cuando es posible) y un valor solo se usa si corresponde a la versión
+vigente. Lleva contadores de aciertos y fallos para diagnóstico.
+"""
+
+import threading
+
+
+class DataCache:
+    """Valores cacheados por entidad con invalidación por versión"""
+
+    def __init__(self, entities):
+        """
+        Args:
+            entities: Nombres de las entidades que maneja el cache
+        """
+        self._lock = threading.Lock()
+        self._versions = {entity: 0 for entity in entities}
+        self._values = {}  # {entidad: (versión, valor)}
+        self._hits = {entity: 0 for entity in entities}
+        self._misses = {entity: 0 for entity in entities}
+
+    def get(self, entity, loader):
+        """
+        Devuelve el valor de la entidad, calculándolo con loader() si no está vigente
+
+        loader() se ejecuta fuera del lock del cache; si mientras tanto una
+        escritura invalidó la entidad, el valor se devuelve pero no se guarda.
+        """
+        with self._lock:
+            version = self._versions[entity]
+            cached = self._values.get(entity)
+            if cached is not None and cached[0] == version:
+                self._hits[entity] += 1
+                return cached[1]
+            self._misses[entity] += 1
+
+        value = loader()
+
+        with self._lock:
+            if self._versions[entity] == version:
+                self._values[entity] = (version, value)
+        return value
+
+    def patch(self, entity, func):
+        """
+        Aplica un cambio al valor cacheado sin descartarlo
+
+        La entidad pasa a una nueva versión; si tenía un valor vigente, se
+        guarda func(valor) con esa versión en lugar de recalcularlo todo.
+        """
+        with self._lock:
+            version = self._versions[entity]
+            self._versions[entity] = version + 1
+            cached = self._values.pop(entity, None)
+            if cached is not None and cached[0] == version:
+                self._values[entity] = (version + 1, func(cached[1]))
+
+    def invalidate(self, *entities):
+        """Incrementa la versión de las entidades indicadas (todas si no se indica ninguna)"""
+        with self._lock:
+            for entity in entities or tuple(self._versions):
+                self._versions[entity] += 1
+                self._values.pop(entity, None)
+
+    def version(self, entity):
+        """Versión vigente de una entidad"""
+        with self._lock:
+            return self._versions[entity]
+
+    def stats(self):
+        """
+        Estadísticas por entidad para diagnóstico
+
+        Returns:
+            dict: {entidad: {"version", "hits", "misses", "cached"}}
+        """
+        with self._lock:
+            return {
+                entity: {
+                    "version": self._versions[entity],
+                    "hits": self._hits[entity],
+                    "misses": self._misses[entity],
+                    "cached": entity in self._values,
+                }
+                for entity in self._versions
+            }
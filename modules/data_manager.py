@@ -1,77 +1,126 @@
 import os
+import atexit
+import threading
 import openpyxl
-from openpyxl.styles import Font
 from pathlib import Path
+from config import STORAGE_BACKEND, WRITE_BEHIND_DELAY, JOURNAL_ENABLED, JOURNAL_COMPACTION_DELAY
+from modules.storage import create_backend
+from modules.storage.base import prepare_record, prepare_update
+from modules.storage.schema import schema_for
+from modules.storage.records import record_class_for
+from modules.storage.excel_backend import (
+    ExcelBackend, create_sheet, sheet_columns, iter_records, records_from_rows, read_workbook,
+    assign_missing_ids, ids_are_valid
+)
+from modules.storage.write_behind import WriteBehindQueue
+from modules.storage.journal import Journal, journal_path_for
+from modules.storage.snapshot import load_snapshot, save_snapshot, snapshot_rows, workbook_key
+from modules.search_index import SearchIndex, SEARCH_OPTIONS
+from modules.directory import Directory
+from modules.data_cache import DataCache
+from modules.caja_index import CajaIndex, caja_key, caja_sort_key
+from modules.expediente_index import ExpedienteIndex
+from modules.archive import Archive, record_year, is_closed
+from modules.startup_timer import startup_timer
+
+# Entidades del cache: cada escritura incrementa la versión de las que afecta.
+# Las filas no están aquí: el almacén en memoria se corrige en el lugar.
+CACHE_ENTITIES = ("profesionales", "comitentes", "caja_max")
+
 
 class DataManager:
-    def __init__(self):
+    def __init__(self, backend=None):
         self.excel_file = Path("registros.xlsx")
         print(f"Usando archivo Excel: {self.excel_file.absolute()}")
-        self._ensure_excel_exists()
+        
+        # Años archivados: solo se lee su índice; cada libro se lee al consultarlo.
+        # Se necesita antes de leer el Excel: los IDs que se asignen quedan por
+        # encima de los archivados
+        self.archive = Archive(self.excel_file)
+        
+        # Una sola lectura del Excel: valida hojas y columnas y lee los registros
+        with startup_timer.step("Validación y lectura del Excel"):
+            registros = self._ensure_excel_exists()
         
         # AGREGAR ESTAS LÍNEAS PARA CACHE:
         self._obras_cache = None
         self._informes_cache = None
         self._cache_timestamp = None
-        self._profesionales_cache = None
-        self._comitentes_cache = None
-        self.excel_file = Path("registros.xlsx")
-        print(f"Usando archivo Excel: {self.excel_file.absolute()}")
-        self._ensure_excel_exists()
+        # Entidades derivadas (listas de nombres) con versión por entidad
+        self._cache = DataCache(CACHE_ENTITIES)
+        self._search_indexes = None
+        self._similar_index = None
+        self._directory = None
+        self._caja_index = None
+        self._expediente_index = None
+        # {work_type: {id: posición en la lista}} y próximo ID libre de cada hoja
+        self._positions = None
+        self._next_ids = None
+        # Las ventanas cargan datos desde un hilo de trabajo (ver gui/background_loader.py)
+        self._lock = threading.RLock()
+        
+        # Backend de almacenamiento (Excel directo o SQLite con exportación a Excel)
+        with startup_timer.step("Backend de almacenamiento"):
+            self.backend = backend or create_backend(STORAGE_BACKEND, self.excel_file)
+        print(f"Backend de almacenamiento: {self.backend.name}")
+        
+        # Si el backend trabaja sobre el mismo Excel, lo leído al validarlo ya es el cache
+        if (registros is not None and isinstance(self.backend, ExcelBackend) and
+                self.backend.excel_file == self.excel_file):
+            self._obras_cache, self._informes_cache = registros
+            self._cache_timestamp = self._get_file_signature()
+            print(f"Cache precargado con {len(self._obras_cache)} obras y {len(self._informes_cache)} informes")
+        
+        # Los cambios se aplican en memoria en el acto y se guardan en lote.
+        # Con el diario, cada cambio queda en disco al instante y el Excel se
+        # actualiza periódicamente en segundo plano.
+        if JOURNAL_ENABLED:
+            self._write_queue = WriteBehindQueue(
+                self.backend, JOURNAL_COMPACTION_DELAY, on_flush=self._on_flush,
+                journal=Journal(journal_path_for(self.excel_file))
+            )
+        else:
+            self._write_queue = WriteBehindQueue(
+                self.backend, WRITE_BEHIND_DELAY, on_flush=self._on_flush
+            )
+        self._recover_journal()
+        # Red de seguridad: guardar lo pendiente aunque no se llame a close()
+        atexit.register(self.flush)
 
-    def _apply_currency_format(self, cell, value):
+    def _recover_journal(self):
         """
-        Aplica formato de moneda a una celda y establece el valor
+        Recupera los cambios que quedaron en el diario (cierre inesperado)
         
-        Args:
-            cell: La celda de openpyxl
-            value: El valor a establecer (puede ser string con formato o número)
+        Los cambios se aplican a la memoria antes de atender cualquier
+        lectura, así el almacén los incluye y los IDs nuevos siguen después
+        de los recuperados aunque el primer guardado falle (por ejemplo, si
+        registros.xlsx está abierto en Excel); quedan en la cola hasta que
+        se puedan guardar.
         """
-        try:
-            # Si el valor está vacío o es None, no hacer nada
-            if not value or value == "":
-                cell.value = ""
-                return
-            
-            # CORRECCIÓN DEFINITIVA: Convertir directamente a float
-            numeric_value = 0.0
-            
-            if isinstance(value, str):
-                # Solo extraer números y punto/coma decimal
-                import re
-                # Remover todo excepto dígitos, punto y coma
-                clean_value = re.sub(r'[^\d.,]', '', value)
-                
-                # Si tiene coma como decimal (formato argentino), convertir a punto
-                if ',' in clean_value and '.' not in clean_value:
-                    clean_value = clean_value.replace(',', '.')
-                elif '.' in clean_value and ',' in clean_value:
-                    # Formato 12.000,50 - el punto es separador de miles, coma es decimal
-                    parts = clean_value.rsplit(',', 1)  # Dividir por la última coma
-                    integer_part = parts[0].replace('.', '')  # Quitar puntos de miles
-                    decimal_part = parts[1] if len(parts) > 1 else ''
-                    clean_value = f"{integer_part}.{decimal_part}"
-                
-                if clean_value:
-                    numeric_value = float(clean_value)
-                else:
-                    cell.value = ""
-                    return
-            else:
-                # Si ya es número, usarlo tal como viene
-                numeric_value = float(value)
-            
-            # Establecer el valor numérico exacto
-            cell.value = numeric_value
-            
-            # Aplicar formato de moneda argentino
-            cell.number_format = '"$"#,##0.00'
-            
-        except Exception as e:
-            print(f"Error al aplicar formato de moneda: {e}")
-            print(f"Valor problemático: {value} (tipo: {type(value)})")
-            # En caso de error, guardar el valor original
-            cell.value = value
+        entries = self._write_queue.recover()
+        if not entries:
+            return
+        print(f"Recuperados {len(entries)} cambios del diario")
+        
+        with self._lock:
+            positions = self._get_positions()
+            for entry in entries:
+                work_type = entry["work_type"]
+                if entry.get("op") == "add":
+                    row_id = entry["data"].get("id")
+                    if row_id is None or row_id in positions[work_type]:
+                        # Ya estaba guardado (corte antes de compactar el diario)
+                        continue
+                    record = record_class_for(work_type).from_dict(prepare_record(work_type, entry["data"]))
+                    record.id = row_id
+                    self._insert_record(work_type, record)
+                    self._next_ids[work_type] = max(self._next_ids[work_type], row_id + 1)
+                elif entry.get("op") == "update":
+                    record = self._find_record(work_type, entry["id"])
+                    if record is not None:
+                        self._apply_update(work_type, record, entry["data"])
+        
+        self._write_queue.flush()
 
     def clean_data(self, data):
         """
@@ -97,167 +146,154 @@ class DataManager:
         return cleaned_data
     
     def _ensure_excel_exists(self):
-        """Asegura que el archivo Excel existe con las hojas necesarias"""
+        """
+        Asegura que el archivo Excel existe con las hojas necesarias
+        
+        El libro se recorre una sola vez: se revisan los encabezados de
+        cada hoja y, si están completos, se leen los registros en el mismo
+        recorrido. Solo si falta algo se abre en modo edición para repararlo.
+        
+        Returns:
+            tuple: (obras, informes) leídos del Excel, o None si no se pudieron leer
+        
+        Raises:
+            RuntimeError: Si el Excel existe pero no se puede leer ni reparar
+        """
+        # Un registros.xlsx existente nunca se reemplaza: si no se puede
+        # leer ni reparar, se detiene el inicio sin tocar el archivo
+        if os.path.exists(self.excel_file):
+            # La instantánea solo existe para libros que ya estaban completos
+            registros = load_snapshot(self.excel_file)
+            if registros is not None:
+                print("Registros cargados desde la instantánea")
+                return registros
+            
+            registros = self._read_if_valid()
+            if registros is not None:
+                print("Archivo Excel existente cargado correctamente")
+                self._save_snapshot(*registros)
+                return registros
+            
+            try:
+                registros = self._repair_excel()
+            except Exception as e:
+                print(f"Error al abrir Excel existente: {e}")
+                raise RuntimeError(
+                    f"No se pudo leer ni reparar {self.excel_file.absolute()} (el archivo no se modificó). "
+                    f"Si está abierto en Excel, ciérrelo y vuelva a iniciar el sistema. Detalle: {e}"
+                ) from e
+            self._save_snapshot(*registros)
+            return registros
+        
         try:
-            # Primero intenta abrir el archivo existente
-            if os.path.exists(self.excel_file):
-                try:
-                    # Verificar si es un Excel válido
-                    workbook = openpyxl.load_workbook(str(self.excel_file))
-                    
-                    # Verificar que tiene las hojas necesarias
-                    necesita_guardar = False
-                    
-                    if "Obras en general" not in workbook.sheetnames:
-                        print("Creando hoja 'Obras en general'")
-                        obras_sheet = workbook.create_sheet("Obras en general")
-                        headers_obras = [
-                            "Fecha", "Profesión", "Formato", "Nro de Copias", "Tipo de trabajo", 
-                            "Nombre del Profesional", "Nombre del Comitente", "Ubicación", 
-                            "Nro de expte municipal", "Nro de sistema GOP", "Nro de partida inmobiliaria",
-                            "Tasa de sellado", "Tasa de visado", 
-                            "Visado de instalacion de Gas", "Visado de instalacion de Salubridad", 
-                            "Visado de instalacion electrica", "Visado de instalacion electromecanica",
-                            "Estado pago sellado", "Estado pago visado",
-                            "Nro de expediente CPIM", "Fecha de salida", "Persona que retira", 
-                            "Nro de Caja", "Ruta de carpeta", "WhatsApp Profesional", "WhatsApp Tramitador", 
-                            "Analizada en Periodo"
-                        ]
-                        for idx, header in enumerate(headers_obras, 1):
-                            cell = obras_sheet.cell(row=1, column=idx, value=header)
-                            cell.font = Font(bold=True)
-                        necesita_guardar = True
-                    else:
-                        # Verificar si ya tiene todas las columnas
-                        obras_sheet = workbook["Obras en general"]
-                        if obras_sheet.max_column < 27:  # Si no tiene todas las columnas
-                            # Agregar columnas faltantes
-                            if obras_sheet.max_column < 25:
-                                obras_sheet.cell(row=1, column=25, value="WhatsApp Profesional")
-                                obras_sheet.cell(row=1, column=25).font = Font(bold=True)
-                            if obras_sheet.max_column < 26:
-                                obras_sheet.cell(row=1, column=26, value="WhatsApp Tramitador")
-                                obras_sheet.cell(row=1, column=26).font = Font(bold=True)
-                            if obras_sheet.max_column < 27:
-                                obras_sheet.cell(row=1, column=27, value="Analizada en Periodo")
-                                obras_sheet.cell(row=1, column=27).font = Font(bold=True)
-                            necesita_guardar = True
-                    
-                    if "Informes técnicos" not in workbook.sheetnames:
-                        print("Creando hoja 'Informes técnicos'")
-                        informes_sheet = workbook.create_sheet("Informes técnicos")
-                        headers_informes = [
-                            "Fecha", "Profesión", "Formato", "Nro de Copias", "Tipo de trabajo", 
-                            "Detalle", "Profesional", "Comitente", "Tasa de sellado", 
-                            "Estado de pago", "Nro de expediente CPIM", "Fecha de salida", 
-                            "Persona que retira", "Nro de Caja", "Ruta de carpeta", "WhatsApp Profesional", "WhatsApp Tramitador"
-                        ]
-                        for idx, header in enumerate(headers_informes, 1):
-                            cell = informes_sheet.cell(row=1, column=idx, value=header)
-                            cell.font = Font(bold=True)
-                        necesita_guardar = True
-                    else:
-                        # Verificar si ya tiene las columnas de WhatsApp
-                        informes_sheet = workbook["Informes técnicos"]
-                        if informes_sheet.max_column < 17:  # Si no tiene todas las columnas
-                            # Agregar columnas de WhatsApp
-                            informes_sheet.cell(row=1, column=16, value="WhatsApp Profesional")
-                            informes_sheet.cell(row=1, column=17, value="WhatsApp Tramitador")
-                            informes_sheet.cell(row=1, column=16).font = Font(bold=True)
-                            informes_sheet.cell(row=1, column=17).font = Font(bold=True)
-                            necesita_guardar = True
-                    
-                    # Guardar si se hicieron cambios
-                    if necesita_guardar:
-                        workbook.save(str(self.excel_file))
-                        print("Archivo Excel actualizado con las hojas necesarias y campos de WhatsApp")
-                    else:
-                        print("Archivo Excel existente cargado correctamente")
-                    
-                    return  # El archivo existe y es válido
-                except Exception as e:
-                    print(f"Error al abrir Excel existente: {e}")
-                    # Si hay error, creamos uno nuevo
-            
-            # Si no existe o hubo error, crear un nuevo archivo Excel
+            # Si no existe, crear un nuevo archivo Excel
             print("Creando nuevo archivo Excel...")
             workbook = openpyxl.Workbook()
             
-            # Configurar la primera hoja
-            obras_sheet = workbook.active
-            obras_sheet.title = "Obras en general"
-            
-            # Crear hoja para informes técnicos
-            informes_sheet = workbook.create_sheet("Informes técnicos")
-            
-            # Configurar encabezados para Obras en general
-            headers_obras = [
-                "Fecha", "Profesión", "Formato", "Nro de Copias", "Tipo de trabajo", 
-                "Nombre del Profesional", "Nombre del Comitente", "Ubicación", 
-                "Nro de expte municipal", "Nro de sistema GOP", "Nro de partida inmobiliaria",
-                "Tasa de sellado", "Tasa de visado", 
-                "Visado de instalacion de Gas", "Visado de instalacion de Salubridad", 
-                "Visado de instalacion electrica", "Visado de instalacion electromecanica",
-                "Estado pago sellado", "Estado pago visado",
-                "Nro de expediente CPIM", "Fecha de salida", "Persona que retira", 
-                "Nro de Caja", "Ruta de carpeta", "WhatsApp Profesional", "WhatsApp Tramitador", 
-                "Analizada en Periodo"
-            ]
-            
-            # Configurar encabezados para Informes técnicos
-            headers_informes = [
-                "Fecha", "Profesión", "Formato", "Nro de Copias", "Tipo de trabajo", 
-                "Detalle", "Profesional", "Comitente", "Tasa de sellado", 
-                "Estado de pago", "Nro de expediente CPIM", "Fecha de salida", 
-                "Persona que retira", "Nro de Caja", "Ruta de carpeta", "WhatsApp Profesional", "WhatsApp Tramitador"
-            ]
-            
-            # Aplicar encabezados a Obras en general
-            for idx, header in enumerate(headers_obras, 1):
-                cell = obras_sheet.cell(row=1, column=idx, value=header)
-                cell.font = Font(bold=True)
-            
-            # Aplicar encabezados a Informes técnicos
-            for idx, header in enumerate(headers_informes, 1):
-                cell = informes_sheet.cell(row=1, column=idx, value=header)
-                cell.font = Font(bold=True)
+            workbook.remove(workbook.active)
+            
+            # Crear ambas hojas con sus encabezados
+            create_sheet(workbook, "obra")
+            create_sheet(workbook, "informe")
             
             # Guardar el archivo
             workbook.save(str(self.excel_file))
             print(f"Nuevo archivo Excel creado en: {self.excel_file.absolute()}")
+            return [], []
             
         except Exception as e:
             print(f"ERROR CRÍTICO al crear Excel: {e}")
-            # Si todo lo demás falla, intentamos con otro nombre
+            # Si todo lo demás falla, intentamos con otro nombre (sin reemplazarlo si ya existe)
             self.excel_file = Path("datos_cpim.xlsx")
-            self._create_basic_excel()
+            self.archive = Archive(self.excel_file)
+            if not self.excel_file.exists():
+                self._create_basic_excel()
+            return None
+
+    def _read_if_valid(self):
+        """
+        Lee ambas hojas en modo streaming si tienen todas sus columnas
+        
+        Returns:
+            tuple: (obras, informes), o None si falta alguna hoja o columna, si
+            alguna fila no tiene ID (o si el archivo no se pudo leer en modo streaming)
+        """
+        def leer(workbook):
+            registros = []
+            for work_type in ("obra", "informe"):
+                schema = schema_for(work_type)
+                if schema.sheet_name not in workbook.sheetnames:
+                    return None
+                
+                rows = workbook[schema.sheet_name].iter_rows(values_only=True)
+                header_row = next(rows, ())
+                if not any(header_row) or schema.missing_fields(header_row):
+                    return None
+                
+                records = list(records_from_rows(header_row, rows, work_type))
+                if not ids_are_valid(records):
+                    # Filas sin ID: se completan en modo edición
+                    return None
+                registros.append(records)
+            return registros[0], registros[1]
+        
+        try:
+            return read_workbook(self.excel_file, leer)
+        except Exception as e:
+            print(f"No se pudo leer el Excel en modo streaming: {e}")
+            return None
+
+    def _repair_excel(self):
+        """
+        Agrega las hojas y columnas que falten (por ejemplo, las de WhatsApp o
+        la columna ID) y completa los IDs de las filas que no lo tengan
+        
+        Returns:
+            tuple: (obras, informes) leídos del libro ya reparado
+        """
+        workbook = openpyxl.load_workbook(str(self.excel_file))
+        
+        # Verificar que tiene las hojas y columnas necesarias
+        necesita_guardar = False
+        
+        for work_type in ("obra", "informe"):
+            schema = schema_for(work_type)
+            if schema.sheet_name not in workbook.sheetnames:
+                print(f"Creando hoja '{schema.sheet_name}'")
+                create_sheet(workbook, work_type)
+                necesita_guardar = True
+            else:
+                # Agregar al final los encabezados que falten
+                sheet = workbook[schema.sheet_name]
+                header_row = [cell.value for cell in sheet[1]]
+                if not any(header_row) or schema.missing_fields(header_row):
+                    sheet_columns(sheet, work_type)
+                    necesita_guardar = True
+                if assign_missing_ids(sheet, work_type, min_id=self.archive.max_id(work_type)):
+                    necesita_guardar = True
+        
+        # Guardar si se hicieron cambios: en un archivo temporal que reemplaza
+        # al original solo cuando quedó completo
+        if necesita_guardar:
+            temp_path = self.excel_file.with_name(self.excel_file.name + ".tmp")
+            try:
+                workbook.save(str(temp_path))
+                os.replace(temp_path, self.excel_file)
+            finally:
+                if temp_path.exists():
+                    os.remove(temp_path)
+            print("Archivo Excel actualizado con las hojas necesarias y campos de WhatsApp")
+        else:
+            print("Archivo Excel existente cargado correctamente")
+        
+        obras = list(iter_records(workbook[schema_for("obra").sheet_name], "obra"))
+        informes = list(iter_records(workbook[schema_for("informe").sheet_name], "informe"))
+        return obras, informes
 
     def get_whatsapp_by_profesional(self, nombre_profesional):
         """Obtiene el número de WhatsApp asociado a un profesional"""
         try:
-            workbook = openpyxl.load_workbook(str(self.excel_file))
-            
-            # Buscar en la hoja "Obras en general"
-            if "Obras en general" in workbook.sheetnames:
-                sheet = workbook["Obras en general"]
-                for row in range(2, sheet.max_row + 1):
-                    profesional = sheet.cell(row=row, column=6).value
-                    whatsapp = sheet.cell(row=row, column=25).value
-                    if profesional and profesional.strip().lower() == nombre_profesional.strip().lower():
-                        if whatsapp and whatsapp.strip():
-                            return whatsapp.strip()
-            
-            # Buscar en la hoja "Informes técnicos"
-            if "Informes técnicos" in workbook.sheetnames:
-                sheet = workbook["Informes técnicos"]
-                for row in range(2, sheet.max_row + 1):
-                    profesional = sheet.cell(row=row, column=7).value
-                    whatsapp = sheet.cell(row=row, column=16).value
-                    if profesional and profesional.strip().lower() == nombre_profesional.strip().lower():
-                        if whatsapp and whatsapp.strip():
-                            return whatsapp.strip()
-            
-            return None
+            return self._get_directory().whatsapp_for(nombre_profesional)
         except Exception as e:
             print(f"Error al obtener WhatsApp del profesional: {e}")
             return None
@@ -265,28 +301,7 @@ class DataManager:
     def get_profesionales_with_whatsapp(self):
         """Obtiene un diccionario de profesionales con sus números de WhatsApp"""
         try:
-            workbook = openpyxl.load_workbook(str(self.excel_file))
-            profesionales_whatsapp = {}
-            
-            # Buscar en la hoja "Obras en general"
-            if "Obras en general" in workbook.sheetnames:
-                sheet = workbook["Obras en general"]
-                for row in range(2, sheet.max_row + 1):
-                    profesional = sheet.cell(row=row, column=6).value
-                    whatsapp = sheet.cell(row=row, column=25).value
-                    if profesional and whatsapp and whatsapp.strip():
-                        profesionales_whatsapp[profesional.strip()] = whatsapp.strip()
-            
-            # Buscar en la hoja "Informes técnicos"
-            if "Informes técnicos" in workbook.sheetnames:
-                sheet = workbook["Informes técnicos"]
-                for row in range(2, sheet.max_row + 1):
-                    profesional = sheet.cell(row=row, column=7).value
-                    whatsapp = sheet.cell(row=row, column=16).value
-                    if profesional and whatsapp and whatsapp.strip():
-                        profesionales_whatsapp[profesional.strip()] = whatsapp.strip()
-            
-            return profesionales_whatsapp
+            return self._get_directory().whatsapp_map()
         except Exception as e:
             print(f"Error al obtener profesionales con WhatsApp: {e}")
             return {}
@@ -294,26 +309,9 @@ class DataManager:
     def get_all_profesionales(self):
         """Obtiene la lista de todos los profesionales registrados"""
         try:
-            workbook = openpyxl.load_workbook(str(self.excel_file))
-            profesionales = set()
-            
-            # Buscar en la hoja "Obras en general"
-            if "Obras en general" in workbook.sheetnames:
-                sheet = workbook["Obras en general"]
-                for row in range(2, sheet.max_row + 1):
-                    profesional = sheet.cell(row=row, column=6).value
-                    if profesional:
-                        profesionales.add(profesional)
-            
-            # Buscar en la hoja "Informes técnicos"
-            if "Informes técnicos" in workbook.sheetnames:
-                sheet = workbook["Informes técnicos"]
-                for row in range(2, sheet.max_row + 1):
-                    profesional = sheet.cell(row=row, column=7).value
-                    if profesional:
-                        profesionales.add(profesional)
-            
-            return sorted(list(profesionales))
+            return list(self._cache.get(
+                "profesionales", lambda: self._get_directory().names("profesional")
+            ))
         except Exception as e:
             print(f"Error al obtener profesionales: {e}")
             return []
@@ -321,29 +319,37 @@ class DataManager:
     def get_all_comitentes(self):
         """Obtiene la lista de todos los comitentes registrados"""
         try:
-            workbook = openpyxl.load_workbook(str(self.excel_file))
-            comitentes = set()
-            
-            # Buscar en la hoja "Obras en general"
-            if "Obras en general" in workbook.sheetnames:
-                sheet = workbook["Obras en general"]
-                for row in range(2, sheet.max_row + 1):
-                    comitente = sheet.cell(row=row, column=7).value
-                    if comitente:
-                        comitentes.add(comitente)
-            
-            # Buscar en la hoja "Informes técnicos"
-            if "Informes técnicos" in workbook.sheetnames:
-                sheet = workbook["Informes técnicos"]
-                for row in range(2, sheet.max_row + 1):
-                    comitente = sheet.cell(row=row, column=8).value
-                    if comitente:
-                        comitentes.add(comitente)
-            
-            return sorted(list(comitentes))
+            return list(self._cache.get(
+                "comitentes", lambda: self._get_directory().names("comitente")
+            ))
         except Exception as e:
             print(f"Error al obtener comitentes: {e}")
             return []
+
+    def get_directory_entry(self, kind, nombre):
+        """
+        Obtiene los datos acumulados de un profesional o comitente
+        
+        Args:
+            kind: "profesional" o "comitente"
+            nombre: Nombre a consultar (no distingue mayúsculas ni espacios en los extremos)
+        
+        Returns:
+            dict: nombre, trabajos, ultimo_uso (date) y whatsapp (solo profesionales),
+            o None si el nombre no está registrado
+        """
+        try:
+            directory = self._get_directory()
+            entry = directory.entry(kind, nombre)
+            if entry is None:
+                return None
+            info = entry.to_dict()
+            if kind == "profesional":
+                info["whatsapp"] = directory.whatsapp_for(nombre)
+            return info
+        except Exception as e:
+            print(f"Error al obtener datos de {kind}: {e}")
+            return None
     
     def _create_basic_excel(self):
         """Crea un Excel básico como último recurso"""
@@ -359,221 +365,127 @@ class DataManager:
             raise RuntimeError("No se pudo crear el archivo Excel")
     
     def add_obra_general(self, data):
-        """Agrega un registro de Obra en general al Excel"""
-        try:
-            workbook = openpyxl.load_workbook(str(self.excel_file))
-            
-            # Verificar si la hoja existe, si no, crearla
-            if "Obras en general" not in workbook.sheetnames:
-                print("Creando hoja 'Obras en general'")
-                sheet = workbook.create_sheet("Obras en general")
-                # Añadir encabezados
-                headers = [
-                    "Fecha", "Profesión", "Formato", "Nro de Copias", "Tipo de trabajo", 
-                    "Nombre del Profesional", "Nombre del Comitente", "Ubicación", 
-                    "Nro de expte municipal", "Nro de sistema GOP", "Nro de partida inmobiliaria",
-                    "Tasa de sellado", "Tasa de visado", 
-                    "Visado de instalacion de Gas", "Visado de instalacion de Salubridad", 
-                    "Visado de instalacion electrica", "Visado de instalacion electromecanica",
-                    "Estado pago sellado", "Estado pago visado",
-                    "Nro de expediente CPIM", "Fecha de salida", "Persona que retira", 
-                    "Nro de Caja", "Ruta de carpeta", "WhatsApp Profesional", "WhatsApp Tramitador", 
-                    "Analizada en Periodo"
-                ]
-                for idx, header in enumerate(headers, 1):
-                    cell = sheet.cell(row=1, column=idx, value=header)
-                    cell.font = Font(bold=True)
-            else:
-                sheet = workbook["Obras en general"]
-            
-            # Encontrar la próxima fila vacía
-            next_row = sheet.max_row + 1
-            
-            # Mapear los datos a las columnas correspondientes
-            columns = {
-                1: data.get("fecha", ""),
-                2: data.get("profesion", ""),
-                3: data.get("formato", ""),
-                4: data.get("nro_copias", ""),
-                5: data.get("tipo_trabajo", ""),
-                6: data.get("nombre_profesional", ""),
-                7: data.get("nombre_comitente", ""),
-                8: data.get("ubicacion", ""),
-                9: data.get("nro_expte_municipal", ""),
-                10: data.get("nro_sistema_gop", ""),
-                11: data.get("nro_partida_inmobiliaria", ""),
-                12: data.get("tasa_sellado", ""),
-                13: data.get("tasa_visado", ""),
-                14: data.get("visado_gas", ""),
-                15: data.get("visado_salubridad", ""),
-                16: data.get("visado_electrica", ""),
-                17: data.get("visado_electromecanica", ""),
-                18: data.get("estado_pago_sellado", "No pagado"),
-                19: data.get("estado_pago_visado", "No pagado"),
-                20: data.get("nro_expediente_cpim", ""),
-                21: data.get("fecha_salida", ""),
-                22: data.get("persona_retira", ""),
-                23: data.get("nro_caja", ""),
-                24: data.get("ruta_carpeta", ""),
-                25: data.get("whatsapp_profesional", ""),
-                26: data.get("whatsapp_tramitador", ""),
-                27: data.get("analizada_en_periodo", "")
-            }
-            
-            # Insertar datos en la hoja con formato especial para monedas
-            for col, value in columns.items():
-                cell = sheet.cell(row=next_row, column=col)
-                
-                # Aplicar formato de moneda para campos monetarios
-                if col in [12, 13, 14, 15, 16, 17]:  # Tasas y visados
-                    self._apply_currency_format(cell, value)
-                else:
-                    cell.value = value
-            
-            workbook.save(str(self.excel_file))
-            print(f"Obra agregada en fila {next_row}")
-            self._invalidate_cache()
-            return next_row - 1  # Retorna el índice del registro (0-based)
-        except Exception as e:
-            print(f"Error al agregar obra: {e}")
-            return -1  # Retorna -1 en caso de error
+        """Agrega un registro de Obra en general"""
+        return self._add_work("obra", data)
     
     def add_informe_tecnico(self, data):
-        """Agrega un registro de Informe técnico al Excel"""
+        """Agrega un registro de Informe técnico"""
+        return self._add_work("informe", data)
+    
+    def _add_work(self, work_type, data):
+        """
+        Agrega un registro al almacén en memoria y encola su guardado
+        
+        El registro, los índices y el cache se actualizan juntos bajo el
+        lock: un hilo de carga que construya un índice ve el alta completa
+        o no la ve, y nunca la cuenta dos veces.
+        
+        Returns:
+            int: ID del nuevo registro, o -1 en caso de error
+        """
         try:
-            workbook = openpyxl.load_workbook(str(self.excel_file))
-            
-            # Verificar si la hoja existe, si no, crearla
-            if "Informes técnicos" not in workbook.sheetnames:
-                print("Creando hoja 'Informes técnicos'")
-                sheet = workbook.create_sheet("Informes técnicos")
-                # Añadir encabezados
-                headers = [
-                    "Fecha", "Profesión", "Formato", "Nro de Copias", "Tipo de trabajo", 
-                    "Detalle", "Profesional", "Comitente", "Tasa de sellado", 
-                    "Estado de pago", "Nro de expediente CPIM", "Fecha de salida", 
-                    "Persona que retira", "Nro de Caja", "Ruta de carpeta", "WhatsApp Profesional", "WhatsApp Tramitador"
-                ]
-                for idx, header in enumerate(headers, 1):
-                    cell = sheet.cell(row=1, column=idx, value=header)
-                    cell.font = Font(bold=True)
-            else:
-                sheet = workbook["Informes técnicos"]
-            
-            # Encontrar la próxima fila vacía
-            next_row = sheet.max_row + 1
-            
-            # Mapear los datos a las columnas correspondientes
-            columns = {
-                1: data.get("fecha", ""),
-                2: data.get("profesion", ""),
-                3: data.get("formato", ""),
-                4: data.get("nro_copias", ""),
-                5: data.get("tipo_trabajo", ""),
-                6: data.get("detalle", ""),
-                7: data.get("profesional", ""),
-                8: data.get("comitente", ""),
-                9: data.get("tasa_sellado", ""),
-                10: data.get("estado_pago", "No pagado"),
-                11: data.get("nro_expediente_cpim", ""),
-                12: data.get("fecha_salida", ""),
-                13: data.get("persona_retira", ""),
-                14: data.get("nro_caja", ""),
-                15: data.get("ruta_carpeta", ""),
-                16: data.get("whatsapp_profesional", ""),
-                17: data.get("whatsapp_tramitador", "")
-            }
-            
-            # Insertar datos en la hoja con formato especial para monedas
-            for col, value in columns.items():
-                cell = sheet.cell(row=next_row, column=col)
+            with self._lock:
+                self._get_positions()
+                record = record_class_for(work_type).from_dict(prepare_record(work_type, data))
+                record.id = self._next_ids[work_type]
+                self._next_ids[work_type] += 1
+                self._insert_record(work_type, record)
                 
-                # Aplicar formato de moneda para tasa de sellado
-                if col == 9:  # Tasa de sellado
-                    self._apply_currency_format(cell, value)
-                else:
-                    cell.value = value
-            
-            workbook.save(str(self.excel_file))
-            print(f"Informe agregado en fila {next_row}")
-            return next_row - 1  # Retorna el índice del registro (0-based)
+                # El ID viaja con el alta para que el backend lo guarde en la columna ID
+                self._write_queue.add(work_type, dict(data, id=record.id))
+                return record["id"]
         except Exception as e:
-            print(f"Error al agregar informe: {e}")
-            return -1  # Retorna -1 en caso de error
+            print(f"Error al agregar {work_type}: {e}")
+            return -1
+    
+    def _insert_record(self, work_type, record):
+        """Agrega un registro (con su ID ya asignado) a las filas, los índices y el cache"""
+        with self._lock:
+            obras, informes = self._get_cached_rows()
+            rows = obras if work_type == "obra" else informes
+            positions = self._get_positions()
+            positions[work_type][record.id] = len(rows)
+            rows.append(record)
+            
+            if self._search_indexes is not None:
+                self._search_indexes[work_type].add(record["id"], record)
+            if work_type == "obra" and self._similar_index is not None:
+                self._similar_index.setdefault(self._similar_key(record), []).append(record["id"])
+            if self._directory is not None:
+                self._directory.add(work_type, record)
+            if self._caja_index is not None:
+                self._caja_index.add(work_type, record)
+            if self._expediente_index is not None:
+                self._expediente_index.add(work_type, record)
+            self._patch_cache(work_type, record)
+    
+    def _update_work(self, work_type, row_id, data):
+        """
+        Aplica los cambios de un registro en memoria y encola su guardado
+        
+        Como en _add_work, el registro y sus índices se modifican bajo el lock.
+        
+        Returns:
+            bool: True si el registro existe y se actualizó
+        """
+        with self._lock:
+            record = self._find_record(work_type, row_id)
+            if record is None:
+                if self.archive.find(work_type, row_id) is not None:
+                    print(f"El trabajo ID {row_id} está archivado y no se puede modificar")
+                return False
+            
+            self._apply_update(work_type, record, data)
+            self._write_queue.update(work_type, row_id, data)
+            return True
+    
+    def _apply_update(self, work_type, record, data):
+        """Aplica cambios a un registro del almacén y corrige sus índices y el cache"""
+        with self._lock:
+            caja_anterior = record["nro_caja"]
+            expediente_anterior = record["nro_expediente_cpim"]
+            record.update(prepare_update(work_type, data))
+            
+            if self._search_indexes is not None:
+                self._search_indexes[work_type].update(record.id, record)
+            if self._directory is not None:
+                self._directory.update(work_type, record)
+            if self._caja_index is not None and "nro_caja" in data:
+                self._caja_index.update(work_type, record, caja_anterior)
+            if self._expediente_index is not None and "nro_expediente_cpim" in data:
+                self._expediente_index.update(work_type, record, expediente_anterior)
+            self._patch_cache(work_type, record, data)
     
     def get_all_works(self, work_type="obra"):
-        """Retorna todos los trabajos del tipo especificado"""
+        """Retorna todos los trabajos del tipo especificado (incluidos los archivados)"""
         try:
-            workbook = openpyxl.load_workbook(str(self.excel_file))
+            rows = self.get_all_works_detailed(work_type, copy=False)
             
-            # Verificar que existan las hojas
+            works = []
             if work_type == "obra":
-                hoja = "Obras en general"
+                for obra in rows:
+                    works.append({
+                        "id": obra["id"],
+                        "fecha": obra["fecha"],
+                        "profesion": obra["profesion"],
+                        "nombre_profesional": obra["nombre_profesional"],
+                        "nombre_comitente": obra["nombre_comitente"],
+                        "tipo_trabajo": obra["tipo_trabajo"],
+                        "ubicacion": obra["ubicacion"],
+                        "nro_expediente_cpim": obra["nro_expediente_cpim"]
+                    })
             else:
-                hoja = "Informes técnicos"
-                
-            if hoja not in workbook.sheetnames:
-                print(f"Hoja '{hoja}' no encontrada, creándola...")
-                sheet = workbook.create_sheet(hoja)
-                if work_type == "obra":
-                    headers = [
-                        "Fecha", "Profesión", "Formato", "Nro de Copias", "Tipo de trabajo", 
-                        "Nombre del Profesional", "Nombre del Comitente", "Ubicación", 
-                        "Nro de expte municipal", "Nro de sistema GOP", "Nro de partida inmobiliaria",
-                        "Tasa de sellado", "Tasa de visado", 
-                        "Visado de instalacion de Gas", "Visado de instalacion de Salubridad", 
-                        "Visado de instalacion electrica", "Visado de instalacion electromecanica",
-                        "Estado pago sellado", "Estado pago visado",
-                        "Nro de expediente CPIM", "Fecha de salida", "Persona que retira", 
-                        "Nro de Caja", "Ruta de carpeta", "WhatsApp Profesional", "WhatsApp Tramitador", 
-                        "Analizada en Periodo"
-                    ]
-                else:
-                    headers = [
-                        "Fecha", "Profesión", "Formato", "Nro de Copias", "Tipo de trabajo", 
-                        "Detalle", "Profesional", "Comitente", "Tasa de sellado", 
-                        "Estado de pago", "Nro de expediente CPIM", "Fecha de salida", 
-                        "Persona que retira", "Nro de Caja", "Ruta de carpeta", "WhatsApp Profesional", "WhatsApp Tramitador"
-                    ]
-                
-                for idx, header in enumerate(headers, 1):
-                    cell = sheet.cell(row=1, column=idx, value=header)
-                    cell.font = Font(bold=True)
-                    
-                workbook.save(str(self.excel_file))
-                return []  # Retornar lista vacía, ya que acabamos de crear la hoja
-            
-            sheet = workbook[hoja]
-            
-            works = []
-            for row in range(2, sheet.max_row + 1):  # Empezar desde la fila 2 (después de los encabezados)
-                work = {}
-                
-                # Mapear los datos según el tipo de trabajo
-                if work_type == "obra":
-                    work = {
-                        "id": row - 1,
-                        "fecha": sheet.cell(row=row, column=1).value,
-                        "profesion": sheet.cell(row=row, column=2).value,
-                        "nombre_profesional": sheet.cell(row=row, column=6).value,
-                        "nombre_comitente": sheet.cell(row=row, column=7).value,
-                        "tipo_trabajo": sheet.cell(row=row, column=5).value,
-                        "ubicacion": sheet.cell(row=row, column=8).value,
-                        "nro_expediente_cpim": sheet.cell(row=row, column=20).value
-                    }
-                else:
-                    work = {
-                        "id": row - 1,
-                        "fecha": sheet.cell(row=row, column=1).value,
-                        "profesion": sheet.cell(row=row, column=2).value,
-                        "profesional": sheet.cell(row=row, column=7).value,
-                        "comitente": sheet.cell(row=row, column=8).value,
-                        "tipo_trabajo": sheet.cell(row=row, column=5).value,
-                        "detalle": sheet.cell(row=row, column=6).value,
-                        "nro_expediente_cpim": sheet.cell(row=row, column=11).value
-                    }
-                
-                works.append(work)
+                for informe in rows:
+                    works.append({
+                        "id": informe["id"],
+                        "fecha": informe["fecha"],
+                        "profesion": informe["profesion"],
+                        "profesional": informe["profesional"],
+                        "comitente": informe["comitente"],
+                        "tipo_trabajo": informe["tipo_trabajo"],
+                        "detalle": informe["detalle"],
+                        "nro_expediente_cpim": informe["nro_expediente_cpim"]
+                    })
             
             return works
         except Exception as e:
@@ -583,150 +495,121 @@ class DataManager:
     def get_work_by_id(self, work_type, row_id):
         """Obtiene un trabajo específico por ID y tipo"""
         try:
-            workbook = openpyxl.load_workbook(str(self.excel_file))
-            
-            # Verificar que existan las hojas
-            if work_type == "obra":
-                hoja = "Obras en general"
-            else:
-                hoja = "Informes técnicos"
-                
-            if hoja not in workbook.sheetnames:
-                print(f"Hoja '{hoja}' no encontrada")
+            # El ID es el de la columna ID, no la posición de la fila
+            record = self._find_record(work_type, row_id)
+            if record is None:
+                # Puede ser un trabajo de un año archivado (solo lectura)
+                record = self.archive.find(work_type, row_id)
+            if record is None:
                 return None
             
-            sheet = workbook[hoja]
-            
-            # El ID es el índice de fila + 1 para saltar encabezados
-            row = row_id + 1
-            
-            if row > sheet.max_row:
-                return None
-            
-            if work_type == "obra":
-                work = {
-                    "id": row_id,
-                    "fecha": sheet.cell(row=row, column=1).value,
-                    "profesion": sheet.cell(row=row, column=2).value,
-                    "formato": sheet.cell(row=row, column=3).value,
-                    "nro_copias": sheet.cell(row=row, column=4).value,
-                    "tipo_trabajo": sheet.cell(row=row, column=5).value,
-                    "nombre_profesional": sheet.cell(row=row, column=6).value,
-                    "nombre_comitente": sheet.cell(row=row, column=7).value,
-                    "ubicacion": sheet.cell(row=row, column=8).value,
-                    "nro_expte_municipal": sheet.cell(row=row, column=9).value,
-                    "nro_sistema_gop": sheet.cell(row=row, column=10).value,
-                    "nro_partida_inmobiliaria": sheet.cell(row=row, column=11).value,
-                    "tasa_sellado": sheet.cell(row=row, column=12).value,
-                    "tasa_visado": sheet.cell(row=row, column=13).value,
-                    "visado_gas": sheet.cell(row=row, column=14).value,
-                    "visado_salubridad": sheet.cell(row=row, column=15).value,
-                    "visado_electrica": sheet.cell(row=row, column=16).value,
-                    "visado_electromecanica": sheet.cell(row=row, column=17).value,
-                    "estado_pago_sellado": sheet.cell(row=row, column=18).value,
-                    "estado_pago_visado": sheet.cell(row=row, column=19).value,
-                    "nro_expediente_cpim": sheet.cell(row=row, column=20).value,
-                    "fecha_salida": sheet.cell(row=row, column=21).value,
-                    "persona_retira": sheet.cell(row=row, column=22).value,
-                    "nro_caja": sheet.cell(row=row, column=23).value,
-                    "ruta_carpeta": sheet.cell(row=row, column=24).value,
-                    "whatsapp_profesional": sheet.cell(row=row, column=25).value,
-                    "whatsapp_tramitador": sheet.cell(row=row, column=26).value,
-                    "analizada_en_periodo": sheet.cell(row=row, column=27).value
-                }
-            else:
-                work = {
-                    "id": row_id,
-                    "fecha": sheet.cell(row=row, column=1).value,
-                    "profesion": sheet.cell(row=row, column=2).value,
-                    "formato": sheet.cell(row=row, column=3).value,
-                    "nro_copias": sheet.cell(row=row, column=4).value,
-                    "tipo_trabajo": sheet.cell(row=row, column=5).value,
-                    "detalle": sheet.cell(row=row, column=6).value,
-                    "profesional": sheet.cell(row=row, column=7).value,
-                    "comitente": sheet.cell(row=row, column=8).value,
-                    "tasa_sellado": sheet.cell(row=row, column=9).value,
-                    "estado_pago": sheet.cell(row=row, column=10).value,
-                    "nro_expediente_cpim": sheet.cell(row=row, column=11).value,
-                    "fecha_salida": sheet.cell(row=row, column=12).value,
-                    "persona_retira": sheet.cell(row=row, column=13).value,
-                    "nro_caja": sheet.cell(row=row, column=14).value,
-                    "ruta_carpeta": sheet.cell(row=row, column=15).value,
-                    "whatsapp_profesional": sheet.cell(row=row, column=16).value,
-                    "whatsapp_tramitador": sheet.cell(row=row, column=17).value
-                }
-            
-            return work
+            # Se devuelve una copia para que el llamador no modifique el almacén
+            return record.clone()
         except Exception as e:
             print(f"Error al obtener trabajo por ID: {e}")
             return None  # Retorna None en caso de error
     
-    def update_obra_general(self, row_id, data):
-        """Actualiza un registro de Obra en general en el Excel y opcionalmente actualiza trabajos similares"""
+    def get_all_works_detailed(self, work_type="obra", copy=True, archived_years=None):
+        """
+        Retorna todos los trabajos del tipo especificado con todos sus campos
+        
+        Equivale a llamar a get_work_by_id para cada trabajo de get_all_works,
+        pero leyendo el almacenamiento como máximo una vez. Los trabajos
+        archivados van primero (por año) y después los del libro en uso.
+        
+        Args:
+            work_type: "obra" o "informe"
+            copy: Si es False devuelve los registros del almacén sin copiarlos
+                  (solo para lectura: no deben modificarse)
+            archived_years: Años archivados a incluir (None para todos); solo
+                  se leen los libros de esos años
+        
+        Returns:
+            list: Lista de Obra / InformeTecnico con los datos completos de cada trabajo
+        """
         try:
-            workbook = openpyxl.load_workbook(str(self.excel_file))
-            
-            # Verificar que existe la hoja
-            if "Obras en general" not in workbook.sheetnames:
-                print("Hoja 'Obras en general' no encontrada")
-                return False
-            
-            sheet = workbook["Obras en general"]
-            
-            # El ID es el índice de fila + 1 para saltar encabezados
-            row = row_id + 1
+            obras, informes = self._get_cached_rows()
+            rows = self.archive.records(work_type, archived_years)
+            rows.extend(obras if work_type == "obra" else informes)
             
-            if row > sheet.max_row:
-                return False
+            if not copy:
+                return rows
             
+            # Copias para que el llamador no modifique el almacén
+            return [work.clone() for work in rows]
+        except Exception as e:
+            print(f"Error al obtener trabajos detallados: {e}")
+            return []
+    
+    def get_works_by_ids(self, work_type, ids):
+        """
+        Retorna los trabajos completos correspondientes a una lista de IDs
+        
+        Args:
+            work_type: "obra" o "informe"
+            ids: Lista de IDs (por ejemplo, el resultado de search)
+        
+        Returns:
+            list: Lista de registros en el mismo orden que ids
+        """
+        try:
+            records = []
+            for row_id in ids:
+                record = self._find_record(work_type, row_id)
+                if record is None:
+                    record = self.archive.find(work_type, row_id)
+                if record is not None:
+                    records.append(record.clone())
+            return records
+        except Exception as e:
+            print(f"Error al obtener trabajos por ID: {e}")
+            return []
+    
+    def search(self, work_type, field, text, limit=None):
+        """
+        Busca trabajos cuyo campo contiene el texto, usando el índice de búsqueda
+        
+        La búsqueda no distingue mayúsculas ni acentos ("perez" encuentra "PÉREZ").
+        
+        Args:
+            work_type: "obra" o "informe"
+            field: Campo a consultar (ver SEARCH_OPTIONS en modules.search_index)
+            text: Texto a buscar
+            limit: Cantidad máxima de resultados (None para todos)
+        
+        Returns:
+            list: IDs de los trabajos encontrados (incluidos los archivados), en orden ascendente
+        """
+        try:
+            ids = self._get_search_index(work_type).search(field, text)
+            if self.archive.years():
+                ids = sorted(ids + self.archive.search(work_type, field, text))
+            return ids if limit is None else ids[:limit]
+        except Exception as e:
+            print(f"Error al buscar trabajos: {e}")
+            return []
+    
+    def update_obra_general(self, row_id, data):
+        """Actualiza un registro de Obra en general y opcionalmente actualiza trabajos similares"""
+        try:
             # Obtener la obra actual para verificar si hay que actualizar trabajos similares
             obra_actual = self.get_work_by_id("obra", row_id)
+            if not obra_actual:
+                return False
             
             # Verificar si se están actualizando campos relacionados con la salida
             campos_salida = ["estado_pago_sellado", "estado_pago_visado", "fecha_salida", "persona_retira", "nro_caja"]
             es_actualizacion_salida = any(campo in data for campo in campos_salida)
             
-            # Actualizar solo los campos proporcionados
-            for key, value in data.items():
-                if key == "tasa_sellado":
-                    self._apply_currency_format(sheet.cell(row=row, column=12), value)
-                elif key == "tasa_visado":
-                    self._apply_currency_format(sheet.cell(row=row, column=13), value)
-                elif key == "visado_gas":
-                    self._apply_currency_format(sheet.cell(row=row, column=14), value)
-                elif key == "visado_salubridad":
-                    self._apply_currency_format(sheet.cell(row=row, column=15), value)
-                elif key == "visado_electrica":
-                    self._apply_currency_format(sheet.cell(row=row, column=16), value)
-                elif key == "visado_electromecanica":
-                    self._apply_currency_format(sheet.cell(row=row, column=17), value)
-                elif key == "estado_pago_sellado":
-                    sheet.cell(row=row, column=18, value=value)
-                elif key == "estado_pago_visado":
-                    sheet.cell(row=row, column=19, value=value)
-                elif key == "nro_expediente_cpim":
-                    sheet.cell(row=row, column=20, value=value)
-                elif key == "fecha_salida":
-                    sheet.cell(row=row, column=21, value=value)
-                elif key == "persona_retira":
-                    sheet.cell(row=row, column=22, value=value)
-                elif key == "nro_caja":
-                    sheet.cell(row=row, column=23, value=value)
-                elif key == "whatsapp_profesional":
-                    sheet.cell(row=row, column=25, value=value)
-                elif key == "whatsapp_tramitador":
-                    sheet.cell(row=row, column=26, value=value)
-                elif key == "analizada_en_periodo":
-                    sheet.cell(row=row, column=27, value=value)
-            
-            # Guardar el archivo con los cambios
-            workbook.save(str(self.excel_file))
-            print(f"Obra actualizada en fila {row}")
-            self._invalidate_cache()
-            
-            # Si se está actualizando datos de salida, buscar y actualizar otros trabajos similares
-            if es_actualizacion_salida and obra_actual:
-                self._actualizar_trabajos_similares(obra_actual, data)
+            # La obra y sus trabajos similares se guardan en el mismo lote
+            with self._write_queue.batch():
+                # Actualizar solo los campos proporcionados
+                if not self._update_work("obra", row_id, data):
+                    return False
+                
+                # Si se está actualizando datos de salida, buscar y actualizar otros trabajos similares
+                if es_actualizacion_salida:
+                    self._actualizar_trabajos_similares(obra_actual, data)
                 
             return True
         except Exception as e:
@@ -742,22 +625,15 @@ class DataManager:
             datos_actualizacion: Diccionario con los campos y valores a actualizar
         """
         try:
-            # Obtener todas las obras
-            todas_obras = self.get_all_works("obra")
+            # Obras con el mismo comitente, ubicación y partida (sin recorrer todas)
+            similares = self._get_similar_index().get(self._similar_key(obra_referencia), [])
             
             # Inicializar contador de obras actualizadas
             obras_actualizadas = 0
             
-            for obra in todas_obras:
-                # Obtener datos completos
-                obra_completa = self.get_work_by_id("obra", obra["id"])
-                
-                # Verificar si es similar (mismo comitente, ubicación, tipo y no es la misma obra)
-                if (obra_completa["id"] != obra_referencia["id"] and
-                    obra_completa["nombre_comitente"] == obra_referencia["nombre_comitente"] and
-                    obra_completa["ubicacion"] == obra_referencia["ubicacion"] and
-                    obra_completa["nro_partida_inmobiliaria"] == obra_referencia["nro_partida_inmobiliaria"]):
-                    
+            for obra_id in similares:
+                # Verificar que no sea la misma obra
+                if obra_id != obra_referencia["id"]:
                     # Es un trabajo similar, actualizar los campos de salida
                     datos_a_actualizar = {}
                     
@@ -783,7 +659,7 @@ class DataManager:
                     # Si hay campos para actualizar, hacerlo
                     if datos_a_actualizar:
                         # Evitamos llamar a update_obra_general para no entrar en recursión
-                        self._actualizar_obra_sin_recursion(obra_completa["id"], datos_a_actualizar)
+                        self._actualizar_obra_sin_recursion(obra_id, datos_a_actualizar)
                         obras_actualizadas += 1
             
             if obras_actualizadas > 0:
@@ -799,211 +675,481 @@ class DataManager:
         Actualiza un registro de Obra en general sin buscar trabajos similares
         (para evitar la recursión)
         """
-        try:
-            workbook = openpyxl.load_workbook(str(self.excel_file))
-            
-            # Verificar que existe la hoja
-            if "Obras en general" not in workbook.sheetnames:
-                return False
-            
-            sheet = workbook["Obras en general"]
-            
-            # El ID es el índice de fila + 1 para saltar encabezados
-            row = row_id + 1
-            
-            if row > sheet.max_row:
-                return False
-            
-            # Actualizar solo los campos proporcionados (igual que en update_obra_general)
-            for key, value in data.items():
-                if key == "tasa_sellado":
-                    self._apply_currency_format(sheet.cell(row=row, column=12), value)
-                elif key == "tasa_visado":
-                    self._apply_currency_format(sheet.cell(row=row, column=13), value)
-                elif key == "visado_gas":
-                    self._apply_currency_format(sheet.cell(row=row, column=14), value)
-                elif key == "visado_salubridad":
-                    self._apply_currency_format(sheet.cell(row=row, column=15), value)
-                elif key == "visado_electrica":
-                    self._apply_currency_format(sheet.cell(row=row, column=16), value)
-                elif key == "visado_electromecanica":
-                    self._apply_currency_format(sheet.cell(row=row, column=17), value)
-                elif key == "estado_pago_sellado":
-                    sheet.cell(row=row, column=18, value=value)
-                elif key == "estado_pago_visado":
-                    sheet.cell(row=row, column=19, value=value)
-                elif key == "nro_expediente_cpim":
-                    sheet.cell(row=row, column=20, value=value)
-                elif key == "fecha_salida":
-                    sheet.cell(row=row, column=21, value=value)
-                elif key == "persona_retira":
-                    sheet.cell(row=row, column=22, value=value)
-                elif key == "nro_caja":
-                    sheet.cell(row=row, column=23, value=value)
-                elif key == "whatsapp_profesional":
-                    sheet.cell(row=row, column=25, value=value)
-                elif key == "whatsapp_tramitador":
-                    sheet.cell(row=row, column=26, value=value)
-                elif key == "analizada_en_periodo":
-                    sheet.cell(row=row, column=27, value=value)
-            
-            workbook.save(str(self.excel_file))
-            print(f"Trabajo similar actualizado en fila {row}")
-            return True
-        except Exception as e:
-            print(f"Error al actualizar trabajo similar: {e}")
+        if not self._update_work("obra", row_id, data):
             return False
+        print(f"Trabajo similar actualizado (ID {row_id})")
+        return True
     
     def update_informe_tecnico(self, row_id, data):
-        """Actualiza un registro de Informe técnico en el Excel"""
+        """Actualiza un registro de Informe técnico"""
         try:
-            workbook = openpyxl.load_workbook(str(self.excel_file))
-            
-            # Verificar que existe la hoja
-            if "Informes técnicos" not in workbook.sheetnames:
-                print("Hoja 'Informes técnicos' no encontrada")
-                return False
-            
-            sheet = workbook["Informes técnicos"]
-            
-            # El ID es el índice de fila + 1 para saltar encabezados
-            row = row_id + 1
-            
-            if row > sheet.max_row:
-                return False
-            
-            # Actualizar solo los campos proporcionados
-            for key, value in data.items():
-                if key == "tasa_sellado":
-                    self._apply_currency_format(sheet.cell(row=row, column=9), value)
-                elif key == "estado_pago":
-                    sheet.cell(row=row, column=10, value=value)
-                elif key == "nro_expediente_cpim":
-                    sheet.cell(row=row, column=11, value=value)
-                elif key == "fecha_salida":
-                    sheet.cell(row=row, column=12, value=value)
-                elif key == "persona_retira":
-                    sheet.cell(row=row, column=13, value=value)
-                elif key == "nro_caja":
-                    sheet.cell(row=row, column=14, value=value)
-                elif key == "whatsapp_profesional":
-                    sheet.cell(row=row, column=16, value=value)
-                elif key == "whatsapp_tramitador":
-                    sheet.cell(row=row, column=17, value=value)
-            
-            workbook.save(str(self.excel_file))
-            print(f"Informe actualizado en fila {row}")
-            return True
+            return self._update_work("informe", row_id, data)
         except Exception as e:
             print(f"Error al actualizar informe: {e}")
-            return False  # Retorna False en caso de error
+            return False
+    
+    def update_many(self, work_type, rows, fields):
+        """
+        Actualiza los mismos campos en varios registros con un solo guardado
+        
+        No propaga cambios a trabajos similares (ver update_obra_general).
+        
+        Args:
+            work_type: "obra" o "informe"
+            rows: IDs de los registros a actualizar
+            fields: Diccionario con los campos y valores a aplicar a todos
+        
+        Returns:
+            int: Cantidad de registros actualizados
+        """
+        try:
+            actualizados = 0
+            with self._write_queue.batch():
+                for row_id in rows:
+                    if self._update_work(work_type, row_id, fields):
+                        actualizados += 1
+            
+            # Guardar todo el lote de una vez, sin esperar la escritura diferida
+            if actualizados:
+                self.flush()
+            
+            print(f"Actualizados {actualizados} registros ({work_type})")
+            return actualizados
+        except Exception as e:
+            print(f"Error al actualizar registros: {e}")
+            return 0
     
     def get_next_caja_number(self):
         """Obtiene el próximo número de caja disponible"""
         try:
-            workbook = openpyxl.load_workbook(str(self.excel_file))
-            
-            # Revisar en ambas hojas
-            max_caja = 0
-            
-            # Verificar que existan las hojas
-            if "Obras en general" in workbook.sheetnames:
-                # Revisar en "Obras en general"
-                sheet = workbook["Obras en general"]
-                for row in range(2, sheet.max_row + 1):
-                    caja = sheet.cell(row=row, column=23).value
-                    if caja and isinstance(caja, (int, float)):
-                        max_caja = max(max_caja, int(caja))
-            
-            if "Informes técnicos" in workbook.sheetnames:
-                # Revisar en "Informes técnicos"
-                sheet = workbook["Informes técnicos"]
-                for row in range(2, sheet.max_row + 1):
-                    caja = sheet.cell(row=row, column=14).value
-                    if caja and isinstance(caja, (int, float)):
-                        max_caja = max(max_caja, int(caja))
-            
-            return max_caja + 1
+            return self._cache.get("caja_max", self._load_caja_max) + 1
         except Exception as e:
             print(f"Error al obtener número de caja: {e}")
             return 1  # Retorna 1 en caso de error (comenzar desde 1)
+    
+    def _load_caja_max(self):
+        """Número de caja más alto en uso, incluidas las de los años archivados"""
+        return max(self._get_caja_index().max_caja(), self.archive.max_caja())
+    
+    def get_works_in_caja(self, nro_caja):
+        """
+        Retorna las obras e informes guardados en una caja (incluidos los archivados)
+        
+        Args:
+            nro_caja: Número de caja (número o texto, "12" y 12 son la misma caja)
+        
+        Returns:
+            dict: {"obra": [registros], "informe": [registros]} en orden de carga
+        """
+        try:
+            result = {"obra": [], "informe": []}
+            for work_type, row_id in self._get_caja_index().works_in(nro_caja):
+                record = self._find_record(work_type, row_id)
+                if record is not None:
+                    result[work_type].append(record.clone())
+            for work_type, record in self.archive.works_in_caja(nro_caja):
+                result[work_type].append(record.clone())
+            return result
+        except Exception as e:
+            print(f"Error al obtener trabajos de la caja: {e}")
+            return {"obra": [], "informe": []}
+    
+    def get_by_expediente(self, nro_expediente):
+        """
+        Busca los trabajos con un número de expediente CPIM (incluidos los archivados)
+        
+        Args:
+            nro_expediente: Número de expediente (no distingue mayúsculas ni espacios de más)
+        
+        Returns:
+            list: [(work_type, registro)] en orden de carga; normalmente uno solo,
+            o varios si el expediente se comparte entre trabajos similares
+        """
+        try:
+            result = []
+            for work_type, row_id in self._get_expediente_index().lookup(nro_expediente):
+                record = self._find_record(work_type, row_id)
+                if record is not None:
+                    result.append((work_type, record.clone()))
+            for work_type, record in self.archive.by_expediente(nro_expediente):
+                result.append((work_type, record.clone()))
+            return result
+        except Exception as e:
+            print(f"Error al buscar expediente: {e}")
+            return []
+    
+    def find_expediente_conflicts(self, work_type, row_id, nro_expediente):
+        """
+        Busca otros trabajos que ya tienen asignado un número de expediente
+        
+        No cuenta el propio trabajo ni, para obras, sus trabajos similares
+        (mismo comitente, ubicación y partida), que comparten el expediente
+        a propósito (ver _actualizar_trabajos_similares).
+        
+        Args:
+            work_type: "obra" o "informe" del trabajo que se está guardando
+            row_id: ID del trabajo que se está guardando (None para uno nuevo)
+            nro_expediente: Número de expediente a guardar
+        
+        Returns:
+            list: [(work_type, registro)] de los trabajos en conflicto
+        """
+        conflictos = []
+        similares = set()
+        if work_type == "obra" and row_id is not None:
+            obra = self.get_work_by_id("obra", row_id)
+            if obra:
+                similares = set(self._get_similar_index().get(self._similar_key(obra), []))
+        
+        for tipo, work in self.get_by_expediente(nro_expediente):
+            if tipo == work_type and work["id"] == row_id:
+                continue
+            if tipo == "obra" and work["id"] in similares:
+                continue
+            conflictos.append((tipo, work))
+        return conflictos
+    
+    def get_all_cajas(self):
+        """
+        Retorna los números de caja en uso (también por trabajos archivados)
+        con la cantidad de trabajos de cada una
+        
+        Returns:
+            list: [(caja, cantidad)] ordenada por número de caja
+        """
+        try:
+            caja_index = self._get_caja_index()
+            counts = self.archive.caja_counts()
+            for caja in caja_index.cajas():
+                counts[caja] = counts.get(caja, 0) + caja_index.count(caja)
+            return [(caja, counts[caja]) for caja in sorted(counts, key=caja_sort_key)]
+        except Exception as e:
+            print(f"Error al obtener cajas: {e}")
+            return []
+    
+    def _patch_cache(self, work_type, record, data=None):
+        """
+        Corrige las entidades del cache afectadas por una escritura, sin descartarlas
+        
+        Args:
+            work_type: "obra" o "informe"
+            record: Registro ya agregado o modificado en memoria
+            data: Campos modificados (None para un alta)
+        """
+        if data is None:
+            # Alta: los nombres nuevos se insertan en las listas ordenadas
+            campos = (("profesionales", "nombre_profesional", "profesional"),
+                      ("comitentes", "nombre_comitente", "comitente"))
+            for entity, campo_obra, campo_informe in campos:
+                nombre = record[campo_obra if work_type == "obra" else campo_informe]
+                if nombre:
+                    self._cache.patch(entity, lambda names, n=nombre: names if n in names else sorted(names + [n]))
+            
+            caja = caja_key(record["nro_caja"])
+            if isinstance(caja, int):
+                self._cache.patch("caja_max", lambda maximo, c=caja: max(maximo, c))
+        elif "nro_caja" in data:
+            # Al mover un trabajo la caja más alta puede quedar vacía: se recalcula
+            self._cache.invalidate("caja_max")
+    
+    def get_cache_stats(self):
+        """
+        Estadísticas del cache para diagnóstico
+        
+        Returns:
+            dict: {entidad: {"version", "hits", "misses", "cached"}}
+        """
+        return self._cache.stats()
         
     def _invalidate_cache(self):
-        """Invalida el cache cuando se hacen cambios"""
+        """
+        Descarta todo el cache para forzar una relectura completa
+        
+        Las escrituras propias no lo usan: corrigen en el lugar las filas,
+        los índices y las entidades derivadas (ver _patch_cache).
+        """
         self._obras_cache = None
         self._informes_cache = None
-        self._profesionales_cache = None
-        self._comitentes_cache = None
+        self._cache.invalidate()
+        self._search_indexes = None
+        self._similar_index = None
+        self._directory = None
+        self._caja_index = None
+        self._expediente_index = None
+        self._positions = None
         self._cache_timestamp = None
 
-    def _get_cached_obras(self):
-        """Obtiene obras del cache o las carga si es necesario"""
-        import os
-        from datetime import datetime
+    def _get_file_signature(self):
+        """Devuelve la firma del almacenamiento para detectar cambios externos"""
+        return self.backend.signature()
+
+    def _get_cached_rows(self):
+        """
+        Devuelve las filas de ambas hojas desde el almacén en memoria.
         
-        try:
-            # Verificar si el archivo fue modificado
-            file_mtime = os.path.getmtime(self.excel_file)
+        El backend se lee completo una sola vez. Las escrituras propias
+        actualizan la memoria en el lugar; la firma (fecha de modificación
+        y tamaño del Excel) solo sirve de resguardo para detectar cambios
+        hechos desde fuera de la aplicación.
+        
+        Returns:
+            tuple: (lista de obras, lista de informes)
+        """
+        with self._lock:
+            # Con cambios sin guardar, la memoria es más reciente que el archivo
+            if self._obras_cache is not None and self._write_queue.has_pending():
+                return self._obras_cache, self._informes_cache
+            
+            signature = self._get_file_signature()
             
             if (self._obras_cache is None or 
+                self._informes_cache is None or 
                 self._cache_timestamp is None or 
-                file_mtime > self._cache_timestamp):
+                signature != self._cache_timestamp):
                 
-                print("Cargando obras al cache...")
-                self._obras_cache = self._load_all_obras_detailed()
-                self._cache_timestamp = file_mtime
-                print(f"Cache actualizado con {len(self._obras_cache)} obras")
+                print("Cargando registros al cache...")
+                self._obras_cache, self._informes_cache = self._load_all_rows()
+                self._search_indexes = None
+                self._similar_index = None
+                self._directory = None
+                self._caja_index = None
+                self._expediente_index = None
+                self._positions = None
+                self._cache.invalidate()
+                self._cache_timestamp = signature
+                print(f"Cache actualizado con {len(self._obras_cache)} obras y {len(self._informes_cache)} informes")
+            
+            return self._obras_cache, self._informes_cache
+
+    def _get_positions(self):
+        """
+        Obtiene el mapa ID -> posición en la lista de cada hoja, construyéndolo si es necesario
+        
+        Returns:
+            dict: {work_type: {id: posición}}
+        """
+        with self._lock:
+            obras, informes = self._get_cached_rows()
+            
+            if self._positions is None:
+                positions = {}
+                next_ids = {}
+                for work_type, rows in (("obra", obras), ("informe", informes)):
+                    positions[work_type] = {record.id: index for index, record in enumerate(rows)}
+                    # Los IDs de los años archivados no se reutilizan
+                    next_ids[work_type] = max(max(positions[work_type], default=0),
+                                              self.archive.max_id(work_type)) + 1
+                self._next_ids = next_ids
+                self._positions = positions
+            
+            return self._positions
+
+    def _find_record(self, work_type, row_id):
+        """Devuelve el registro del almacén con ese ID (sin copiar), o None si no existe"""
+        with self._lock:
+            obras, informes = self._get_cached_rows()
+            index = self._get_positions()[work_type].get(row_id)
+            if index is None:
+                return None
+            return (obras if work_type == "obra" else informes)[index]
+
+    def _get_search_index(self, work_type):
+        """Obtiene el índice de búsqueda del tipo de trabajo, construyéndolo si es necesario"""
+        with self._lock:
+            obras, informes = self._get_cached_rows()
+            
+            if self._search_indexes is None:
+                indexes = {}
+                for tipo, rows in (("obra", obras), ("informe", informes)):
+                    index = SearchIndex(SEARCH_OPTIONS[tipo].values())
+                    index.build(rows)
+                    indexes[tipo] = index
+                self._search_indexes = indexes
+            
+            return self._search_indexes[work_type]
+
+    @staticmethod
+    def _similar_key(obra):
+        """Clave de trabajos similares: mismo comitente, ubicación y partida inmobiliaria"""
+        return (obra.get("nombre_comitente"), obra.get("ubicacion"), obra.get("nro_partida_inmobiliaria"))
+
+    def _get_similar_index(self):
+        """
+        Obtiene el índice (comitente, ubicación, partida) -> IDs de obras,
+        construyéndolo si es necesario
+        """
+        with self._lock:
+            obras = self._get_cached_rows()[0]
+            
+            if self._similar_index is None:
+                similar_index = {}
+                for obra in obras:
+                    similar_index.setdefault(self._similar_key(obra), []).append(obra["id"])
+                self._similar_index = similar_index
+            
+            return self._similar_index
+
+    def _get_directory(self):
+        """Obtiene el directorio de profesionales y comitentes, construyéndolo si es necesario"""
+        with self._lock:
+            obras, informes = self._get_cached_rows()
+            
+            if self._directory is None:
+                directory = Directory()
+                directory.build(obras, informes)
+                # Los trabajos archivados siguen aportando nombres y WhatsApp
+                for work_type, record in self.archive.directory_records():
+                    directory.add(work_type, record)
+                self._directory = directory
+            
+            return self._directory
+
+    def _get_caja_index(self):
+        """Obtiene el índice de cajas, construyéndolo si es necesario"""
+        with self._lock:
+            obras, informes = self._get_cached_rows()
+            
+            if self._caja_index is None:
+                caja_index = CajaIndex()
+                caja_index.build(obras, informes)
+                self._caja_index = caja_index
+            
+            return self._caja_index
+
+    def _get_expediente_index(self):
+        """Obtiene el índice de expedientes CPIM, construyéndolo si es necesario"""
+        with self._lock:
+            obras, informes = self._get_cached_rows()
+            
+            if self._expediente_index is None:
+                expediente_index = ExpedienteIndex()
+                expediente_index.build(obras, informes)
+                self._expediente_index = expediente_index
             
-            return self._obras_cache
+            return self._expediente_index
+
+    def _get_cached_obras(self):
+        """Obtiene obras del cache o las carga si es necesario"""
+        try:
+            return self._get_cached_rows()[0]
         except Exception as e:
             print(f"Error en cache, cargando directamente: {e}")
-            return self._load_all_obras_detailed()
+            return self._load_all_rows()[0]
 
-    def _load_all_obras_detailed(self):
-        """Carga todas las obras con detalles completos"""
+    def _get_cached_informes(self):
+        """Obtiene informes del cache o los carga si es necesario"""
         try:
-            workbook = openpyxl.load_workbook(str(self.excel_file))
-            
-            if "Obras en general" not in workbook.sheetnames:
-                return []
-            
-            sheet = workbook["Obras en general"]
-            obras_detailed = []
-            
-            for row in range(2, sheet.max_row + 1):
-                obra = {
-                    "id": row - 1,
-                    "fecha": sheet.cell(row=row, column=1).value,
-                    "profesion": sheet.cell(row=row, column=2).value,
-                    "formato": sheet.cell(row=row, column=3).value,
-                    "nro_copias": sheet.cell(row=row, column=4).value,
-                    "tipo_trabajo": sheet.cell(row=row, column=5).value,
-                    "nombre_profesional": sheet.cell(row=row, column=6).value,
-                    "nombre_comitente": sheet.cell(row=row, column=7).value,
-                    "ubicacion": sheet.cell(row=row, column=8).value,
-                    "nro_expte_municipal": sheet.cell(row=row, column=9).value,
-                    "nro_sistema_gop": sheet.cell(row=row, column=10).value,
-                    "nro_partida_inmobiliaria": sheet.cell(row=row, column=11).value,
-                    "tasa_sellado": sheet.cell(row=row, column=12).value,
-                    "tasa_visado": sheet.cell(row=row, column=13).value,
-                    "visado_gas": sheet.cell(row=row, column=14).value,
-                    "visado_salubridad": sheet.cell(row=row, column=15).value,
-                    "visado_electrica": sheet.cell(row=row, column=16).value,
-                    "visado_electromecanica": sheet.cell(row=row, column=17).value,
-                    "estado_pago_sellado": sheet.cell(row=row, column=18).value,
-                    "estado_pago_visado": sheet.cell(row=row, column=19).value,
-                    "nro_expediente_cpim": sheet.cell(row=row, column=20).value,
-                    "fecha_salida": sheet.cell(row=row, column=21).value,
-                    "persona_retira": sheet.cell(row=row, column=22).value,
-                    "nro_caja": sheet.cell(row=row, column=23).value,
-                    "ruta_carpeta": sheet.cell(row=row, column=24).value,
-                    "whatsapp_profesional": sheet.cell(row=row, column=25).value,
-                    "whatsapp_tramitador": sheet.cell(row=row, column=26).value,
-                    "analizada_en_periodo": sheet.cell(row=row, column=27).value
+            return self._get_cached_rows()[1]
+        except Exception as e:
+            print(f"Error en cache, cargando directamente: {e}")
+            return self._load_all_rows()[1]
+
+    def _load_all_rows(self):
+        """Carga ambas hojas con detalles completos en una sola lectura"""
+        # Las filas nuevas sin ID (cargadas a mano) no toman IDs de años archivados
+        return self.backend.load_all(min_ids=self._archived_max_ids())
+
+    def _archived_max_ids(self):
+        """ID más alto archivado de cada hoja"""
+        return {work_type: self.archive.max_id(work_type) for work_type in ("obra", "informe")}
+
+    def _on_flush(self):
+        """
+        Después de guardar, el archivo coincide con la memoria: se toma su
+        nueva firma para no volver a leerlo y se renueva la instantánea
+        
+        Todo se toma bajo el lock: como cada cambio se aplica en memoria y
+        se encola dentro de él (ver _add_work), sin nada pendiente las filas
+        son exactamente lo guardado y la clave del Excel es la de ese guardado.
+        """
+        with self._lock:
+            if self._write_queue.has_pending():
+                return
+            self._cache_timestamp = self._get_file_signature()
+            if (self._obras_cache is None or not isinstance(self.backend, ExcelBackend) or
+                    self.backend.excel_file != self.excel_file):
+                return
+            obras_rows = snapshot_rows(self._obras_cache)
+            informes_rows = snapshot_rows(self._informes_cache)
+            key = workbook_key(self.excel_file)
+        # Solo la escritura del archivo se hace fuera del lock
+        self._save_snapshot(obras_rows, informes_rows, convertidas=True, key=key)
+
+    def _save_snapshot(self, obras, informes, convertidas=False, key=None):
+        """Guarda la instantánea de los registros del Excel (ver storage/snapshot.py)"""
+        if not convertidas:
+            obras, informes = snapshot_rows(obras), snapshot_rows(informes)
+        save_snapshot(self.excel_file, obras, informes, key)
+
+    def flush(self):
+        """
+        Guarda en disco todos los cambios pendientes en una sola operación
+        
+        Returns:
+            bool: True si no quedaron cambios sin guardar
+        """
+        return self._write_queue.flush()
+
+    def archive_year(self, year):
+        """
+        Mueve al libro de archivo del año los trabajos cerrados de ese año
+        
+        Se archivan las obras e informes cuya fecha es de ese año y que ya
+        tienen fecha de salida; los que siguen abiertos quedan en el libro
+        en uso. Los trabajos archivados siguen apareciendo en los listados,
+        el directorio, las búsquedas y las consultas por ID, caja y
+        expediente, pero no se pueden modificar.
+        
+        Args:
+            year: Año a archivar (por ejemplo 2023)
+        
+        Returns:
+            int: Cantidad de trabajos archivados, o -1 en caso de error
+        """
+        if not isinstance(self.backend, ExcelBackend) or self.backend.excel_file != self.excel_file:
+            print("El archivo por año solo está disponible con el backend de Excel")
+            return -1
+        
+        try:
+            # Lo pendiente se guarda antes para archivar los datos tal como están
+            if not self.flush():
+                print("No se pudo archivar: hay cambios sin guardar")
+                return -1
+            
+            with self._lock:
+                obras, informes = self._get_cached_rows()
+                seleccion = {
+                    work_type: [record.clone() for record in rows
+                                if record_year(record) == year and is_closed(record)]
+                    for work_type, rows in (("obra", obras), ("informe", informes))
                 }
-                obras_detailed.append(obra)
-            
-            return obras_detailed
+                total = len(seleccion["obra"]) + len(seleccion["informe"])
+                if not total:
+                    print(f"No hay trabajos cerrados de {year} para archivar")
+                    return 0
+                
+                # Primero se escribe el archivo: si algo falla después, volver a
+                # archivar el año reemplaza esos mismos registros sin duplicarlos
+                self.archive.add_year(year, seleccion["obra"], seleccion["informe"])
+                self.backend.remove({
+                    work_type: {record.id for record in records}
+                    for work_type, records in seleccion.items()
+                })
+                self._invalidate_cache()
+            
+            print(f"Archivados {total} trabajos de {year} en {self.archive.year_file(year).name}")
+            return total
         except Exception as e:
-            print(f"Error al cargar obras detalladas: {e}")
-            return []
\ No newline at end of file
+            print(f"Error al archivar el año {year}: {e}")
+            return -1
+
+    def sync_to_excel(self):
+        """Exporta a registros.xlsx los cambios pendientes del backend (si aplica)"""
+        self.flush()
+        if hasattr(self.backend, "export_to_excel"):
+            self.backend.export_to_excel()
+
+    def close(self):
+        """Cierra el backend de almacenamiento sincronizando los cambios pendientes"""
+        self._write_queue.close()
+        self.backend.close()
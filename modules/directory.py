@@ -0,0 +1,149 @@
+"""
+Directorio de profesionales y comitentes.
+Reúne en una sola pasada sobre los registros los nombres usados, sus
+números de WhatsApp, la cantidad de trabajos y la fecha del último uso,
+y se mantiene al día con cada alta o modificación sin volver a recorrer
+todas las filas.
+"""
+
+from datetime import datetime, date
+
+
+# Campo con el nombre del profesional y del comitente en cada tipo de trabajo
+NAME_FIELDS = {
+    "profesional": {"obra": "nombre_profesional", "informe": "profesional"},
+    "comitente": {"obra": "nombre_comitente", "informe": "comitente"},
+}
+
+# El WhatsApp de un profesional se busca primero en obras y luego en informes
+_SHEET_ORDER = {"obra": 0, "informe": 1}
+
+
+def name_key(nombre):
+    """Clave normalizada de un nombre (sin espacios en los extremos y en minúsculas)"""
+    return str(nombre).strip().lower()
+
+
+def parse_date(value):
+    """
+    Convierte la fecha de un registro (date, datetime o texto dd/mm/aaaa) a date
+
+    Returns:
+        date o None si el valor no es una fecha reconocible
+    """
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str):
+        try:
+            return datetime.strptime(value.strip(), "%d/%m/%Y").date()
+        except ValueError:
+            return None
+    return None
+
+
+class DirectoryEntry:
+    """Datos acumulados de un profesional o comitente"""
+
+    __slots__ = ("name", "key", "count", "last_used")
+
+    def __init__(self, name, key):
+        self.name = name
+        self.key = key
+        self.count = 0
+        self.last_used = None
+
+    def to_dict(self):
+        return {
+            "nombre": self.name,
+            "trabajos": self.count,
+            "ultimo_uso": self.last_used,
+        }
+
+
+class Directory:
+    """
+    Directorio construido una vez por versión de los datos.
+
+    - Nombres distintos de profesionales y comitentes.
+    - Por clave normalizada: cantidad de trabajos y fecha del último trabajo.
+    - Números de WhatsApp de cada profesional, en el orden de las hojas.
+    """
+
+    def __init__(self):
+        self._names = {kind: set() for kind in NAME_FIELDS}
+        self._entries = {kind: {} for kind in NAME_FIELDS}
+        # {clave: {(orden de hoja, id): (nombre, número)}}
+        self._whatsapp = {}
+
+    def build(self, obras, informes):
+        """Construye el directorio completo recorriendo una vez ambas hojas"""
+        self.__init__()
+        for work_type, records in (("obra", obras), ("informe", informes)):
+            for record in records:
+                self.add(work_type, record)
+
+    def add(self, work_type, record):
+        """Incorpora un registro nuevo"""
+        fecha = parse_date(record.get("fecha"))
+
+        for kind, fields in NAME_FIELDS.items():
+            nombre = record.get(fields[work_type])
+            if not nombre:
+                continue
+
+            self._names[kind].add(nombre)
+
+            key = name_key(nombre)
+            entry = self._entries[kind].get(key)
+            if entry is None:
+                entry = self._entries[kind][key] = DirectoryEntry(str(nombre).strip(), key)
+            entry.count += 1
+            if fecha is not None and (entry.last_used is None or fecha > entry.last_used):
+                entry.last_used = fecha
+
+        self.update(work_type, record)
+
+    def update(self, work_type, record):
+        """
+        Actualiza el WhatsApp de un registro modificado
+
+        Los nombres y la fecha no son campos editables, así que lo único
+        que puede cambiar en el directorio es el número de WhatsApp.
+        """
+        nombre = record.get(NAME_FIELDS["profesional"][work_type])
+        if not nombre:
+            return
+
+        numbers = self._whatsapp.setdefault(name_key(nombre), {})
+        position = (_SHEET_ORDER[work_type], record.get("id"))
+        whatsapp = record.get("whatsapp_profesional")
+
+        if whatsapp and str(whatsapp).strip():
+            numbers[position] = (str(nombre).strip(), str(whatsapp).strip())
+        else:
+            numbers.pop(position, None)
+
+    def names(self, kind):
+        """Lista ordenada de nombres distintos ("profesional" o "comitente")"""
+        return sorted(self._names[kind])
+
+    def entry(self, kind, nombre):
+        """Datos acumulados de un nombre, o None si no está registrado"""
+        return self._entries[kind].get(name_key(nombre))
+
+    def whatsapp_for(self, nombre):
+        """Primer número de WhatsApp registrado para el profesional (obras antes que informes)"""
+        numbers = self._whatsapp.get(name_key(nombre))
+        if not numbers:
+            return None
+        return numbers[min(numbers)][1]
+
+    def whatsapp_map(self):
+        """Diccionario nombre -> WhatsApp (el último registrado para cada nombre)"""
+        result = {}
+        positions = [item for numbers in self._whatsapp.values() for item in numbers.items()]
+        for _, (nombre, whatsapp) in sorted(positions):
+            result[nombre] = whatsapp
+        return result
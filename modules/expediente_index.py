@@ -0,0 +1,72 @@
+"""
+Índice de números de expediente CPIM.
+Relaciona cada número de expediente con las obras e informes que lo
+tienen asignado, para buscar un expediente sin recorrer las hojas y
+detectar números repetidos al guardar.
+"""
+
+
+def expediente_key(value):
+    """
+    Normaliza un número de expediente CPIM
+
+    Ignora mayúsculas y espacios de más; 1234 y 1234.0 (como puede
+    leerse del Excel) equivalen a "1234".
+
+    Returns:
+        str o None si el valor está vacío
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    text = " ".join(str(value).split()).upper()
+    return text or None
+
+
+class ExpedienteIndex:
+    """Índice expediente CPIM -> trabajos que lo tienen asignado"""
+
+    def __init__(self):
+        self._works = {}  # {expediente: {(work_type, id): None}} (dict para mantener el orden)
+
+    def build(self, obras, informes):
+        """Construye el índice recorriendo una vez ambas hojas"""
+        self.__init__()
+        for work_type, records in (("obra", obras), ("informe", informes)):
+            for record in records:
+                self.add(work_type, record)
+
+    def add(self, work_type, record):
+        """Incorpora un registro nuevo"""
+        key = expediente_key(record.get("nro_expediente_cpim"))
+        if key is not None:
+            self._works.setdefault(key, {})[(work_type, record.get("id"))] = None
+
+    def update(self, work_type, record, expediente_anterior):
+        """
+        Refleja el cambio de expediente de un registro
+
+        Args:
+            work_type: "obra" o "informe"
+            record: Registro ya modificado
+            expediente_anterior: Valor de nro_expediente_cpim antes de la modificación
+        """
+        anterior = expediente_key(expediente_anterior)
+        if anterior == expediente_key(record.get("nro_expediente_cpim")):
+            return
+
+        if anterior is not None:
+            works = self._works.get(anterior)
+            if works is not None:
+                works.pop((work_type, record.get("id")), None)
+                if not works:
+                    del self._works[anterior]
+        self.add(work_type, record)
+
+    def lookup(self, nro_expediente):
+        """Lista de (work_type, id) con ese expediente, en orden de carga"""
+        key = expediente_key(nro_expediente)
+        if key is None:
+            return []
+        return list(self._works.get(key, ()))
@@ -1043,25 +1043,21 @@ class App(ctk.CTk):
             messagebox.showwarning("Búsqueda vacía", "Por favor ingrese un texto para buscar")
             return
         
-        # Obtener todas las obras de nuevo (por si se agregaron nuevas)
-        self.obras = self.data_manager.get_all_works("obra")
+        # Obtener todas las obras con sus datos completos en una sola lectura
+        self.obras = self.data_manager.get_all_works_detailed("obra")
         
         # Filtrar según el criterio
         filtered_obras = []
         
-        for obra in self.obras:
-            # Obtener obra completa para acceder a todos los campos
-            obra_completa = self.data_manager.get_work_by_id("obra", obra["id"])
-            
-            if obra_completa:
-                if search_option == "Profesional" and obra_completa["nombre_profesional"] and search_text in obra_completa["nombre_profesional"].lower():
-                    filtered_obras.append(obra)
-                elif search_option == "Comitente" and obra_completa["nombre_comitente"] and search_text in obra_completa["nombre_comitente"].lower():
-                    filtered_obras.append(obra)
-                elif search_option == "Partida Inmobiliaria" and obra_completa["nro_partida_inmobiliaria"] and search_text in str(obra_completa["nro_partida_inmobiliaria"]).lower():
-                    filtered_obras.append(obra)
-                elif search_option == "Número GOP" and obra_completa["nro_sistema_gop"] and search_text in str(obra_completa["nro_sistema_gop"]).lower():
-                    filtered_obras.append(obra)
+        for obra_completa in self.obras:
+            if search_option == "Profesional" and obra_completa["nombre_profesional"] and search_text in obra_completa["nombre_profesional"].lower():
+                filtered_obras.append(obra_completa)
+            elif search_option == "Comitente" and obra_completa["nombre_comitente"] and search_text in obra_completa["nombre_comitente"].lower():
+                filtered_obras.append(obra_completa)
+            elif search_option == "Partida Inmobiliaria" and obra_completa["nro_partida_inmobiliaria"] and search_text in str(obra_completa["nro_partida_inmobiliaria"]).lower():
+                filtered_obras.append(obra_completa)
+            elif search_option == "Número GOP" and obra_completa["nro_sistema_gop"] and search_text in str(obra_completa["nro_sistema_gop"]).lower():
+                filtered_obras.append(obra_completa)
         
         # Actualizar la lista de obras mostradas
         if filtered_obras:
@@ -1517,25 +1513,21 @@ class App(ctk.CTk):
             messagebox.showwarning("Búsqueda vacía", "Por favor ingrese un texto para buscar")
             return
         
-        # Obtener todas las obras de nuevo (por si se agregaron nuevas)
-        self.duplicate_obras = self.data_manager.get_all_works("obra")
+        # Obtener todas las obras con sus datos completos en una sola lectura
+        self.duplicate_obras = self.data_manager.get_all_works_detailed("obra")
         
         # Filtrar según el criterio
         filtered_obras = []
         
-        for obra in self.duplicate_obras:
-            # Obtener obra completa para acceder a todos los campos
-            obra_completa = self.data_manager.get_work_by_id("obra", obra["id"])
-            
-            if obra_completa:
-                if search_option == "Profesional" and obra_completa["nombre_profesional"] and search_text in obra_completa["nombre_profesional"].lower():
-                    filtered_obras.append(obra)
-                elif search_option == "Comitente" and obra_completa["nombre_comitente"] and search_text in obra_completa["nombre_comitente"].lower():
-                    filtered_obras.append(obra)
-                elif search_option == "Partida Inmobiliaria" and obra_completa["nro_partida_inmobiliaria"] and search_text in str(obra_completa["nro_partida_inmobiliaria"]).lower():
-                    filtered_obras.append(obra)
-                elif search_option == "Número GOP" and obra_completa["nro_sistema_gop"] and search_text in str(obra_completa["nro_sistema_gop"]).lower():
-                    filtered_obras.append(obra)
+        for obra_completa in self.duplicate_obras:
+            if search_option == "Profesional" and obra_completa["nombre_profesional"] and search_text in obra_completa["nombre_profesional"].lower():
+                filtered_obras.append(obra_completa)
+            elif search_option == "Comitente" and obra_completa["nombre_comitente"] and search_text in obra_completa["nombre_comitente"].lower():
+                filtered_obras.append(obra_completa)
+            elif search_option == "Partida Inmobiliaria" and obra_completa["nro_partida_inmobiliaria"] and search_text in str(obra_completa["nro_partida_inmobiliaria"]).lower():
+                filtered_obras.append(obra_completa)
+            elif search_option == "Número GOP" and obra_completa["nro_sistema_gop"] and search_text in str(obra_completa["nro_sistema_gop"]).lower():
+                filtered_obras.append(obra_completa)
         
         # Actualizar la lista de obras mostradas
         if filtered_obras:
@@ -1728,23 +1720,19 @@ class App(ctk.CTk):
             messagebox.showwarning("Búsqueda vacía", "Por favor ingrese un texto para buscar")
             return
         
-        # Obtener todos los informes de nuevo (por si se agregaron nuevos)
-        self.informes = self.data_manager.get_all_works("informe")
+        # Obtener todos los informes con sus datos completos en una sola lectura
+        self.informes = self.data_manager.get_all_works_detailed("informe")
         
         # Filtrar según el criterio
         filtered_informes = []
         
-        for informe in self.informes:
-            # Obtener informe completo para acceder a todos los campos
-            informe_completo = self.data_manager.get_work_by_id("informe", informe["id"])
-            
-            if informe_completo:
-                if search_option == "Profesional" and informe_completo["profesional"] and search_text in informe_completo["profesional"].lower():
-                    filtered_informes.append(informe)
-                elif search_option == "Comitente" and informe_completo["comitente"] and search_text in informe_completo["comitente"].lower():
-                    filtered_informes.append(informe)
-                elif search_option == "Tipo de Informe" and informe_completo["tipo_trabajo"] and search_text in str(informe_completo["tipo_trabajo"]).lower():
-                    filtered_informes.append(informe)
+        for informe_completo in self.informes:
+            if search_option == "Profesional" and informe_completo["profesional"] and search_text in informe_completo["profesional"].lower():
+                filtered_informes.append(informe_completo)
+            elif search_option == "Comitente" and informe_completo["comitente"] and search_text in informe_completo["comitente"].lower():
+                filtered_informes.append(informe_completo)
+            elif search_option == "Tipo de Informe" and informe_completo["tipo_trabajo"] and search_text in str(informe_completo["tipo_trabajo"]).lower():
+                filtered_informes.append(informe_completo)
         
         # Actualizar la lista de informes mostrados
         if filtered_informes:
@@ -2039,25 +2027,21 @@ class App(ctk.CTk):
             messagebox.showwarning("Búsqueda vacía", "Por favor ingrese un texto para buscar")
             return
         
-        # Obtener todas las obras de nuevo (por si se agregaron nuevas)
-        self.word_obras = self.data_manager.get_all_works("obra")
+        # Obtener todas las obras con sus datos completos en una sola lectura
+        self.word_obras = self.data_manager.get_all_works_detailed("obra")
         
         # Filtrar según el criterio
         filtered_obras = []
         
-        for obra in self.word_obras:
-            # Obtener obra completa para acceder a todos los campos
-            obra_completa = self.data_manager.get_work_by_id("obra", obra["id"])
-            
-            if obra_completa:
-                if search_option == "Profesional" and obra_completa["nombre_profesional"] and search_text in obra_completa["nombre_profesional"].lower():
-                    filtered_obras.append(obra)
-                elif search_option == "Comitente" and obra_completa["nombre_comitente"] and search_text in obra_completa["nombre_comitente"].lower():
-                    filtered_obras.append(obra)
-                elif search_option == "Partida Inmobiliaria" and obra_completa["nro_partida_inmobiliaria"] and search_text in str(obra_completa["nro_partida_inmobiliaria"]).lower():
-                    filtered_obras.append(obra)
-                elif search_option == "Número GOP" and obra_completa["nro_sistema_gop"] and search_text in str(obra_completa["nro_sistema_gop"]).lower():
-                    filtered_obras.append(obra)
+        for obra_completa in self.word_obras:
+            if search_option == "Profesional" and obra_completa["nombre_profesional"] and search_text in obra_completa["nombre_profesional"].lower():
+                filtered_obras.append(obra_completa)
+            elif search_option == "Comitente" and obra_completa["nombre_comitente"] and search_text in obra_completa["nombre_comitente"].lower():
+                filtered_obras.append(obra_completa)
+            elif search_option == "Partida Inmobiliaria" and obra_completa["nro_partida_inmobiliaria"] and search_text in str(obra_completa["nro_partida_inmobiliaria"]).lower():
+                filtered_obras.append(obra_completa)
+            elif search_option == "Número GOP" and obra_completa["nro_sistema_gop"] and search_text in str(obra_completa["nro_sistema_gop"]).lower():
+                filtered_obras.append(obra_completa)
         
         # Actualizar la lista de obras mostradas
         if filtered_obras:
@@ -2231,23 +2215,19 @@ class App(ctk.CTk):
             messagebox.showwarning("Búsqueda vacía", "Por favor ingrese un texto para buscar")
             return
         
-        # Obtener todos los informes de nuevo (por si se agregaron nuevos)
-        self.word_informes = self.data_manager.get_all_works("informe")
+        # Obtener todos los informes con sus datos completos en una sola lectura
+        self.word_informes = self.data_manager.get_all_works_detailed("informe")
         
         # Filtrar según el criterio
         filtered_informes = []
         
-        for informe in self.word_informes:
-            # Obtener informe completo para acceder a todos los campos
-            informe_completo = self.data_manager.get_work_by_id("informe", informe["id"])
-            
-            if informe_completo:
-                if search_option == "Profesional" and informe_completo["profesional"] and search_text in informe_completo["profesional"].lower():
-                    filtered_informes.append(informe)
-                elif search_option == "Comitente" and informe_completo["comitente"] and search_text in informe_completo["comitente"].lower():
-                    filtered_informes.append(informe)
-                elif search_option == "Tipo de trabajo" and informe_completo["tipo_trabajo"] and search_text in str(informe_completo["tipo_trabajo"]).lower():
-                    filtered_informes.append(informe)
+        for informe_completo in self.word_informes:
+            if search_option == "Profesional" and informe_completo["profesional"] and search_text in informe_completo["profesional"].lower():
+                filtered_informes.append(informe_completo)
+            elif search_option == "Comitente" and informe_completo["comitente"] and search_text in informe_completo["comitente"].lower():
+                filtered_informes.append(informe_completo)
+            elif search_option == "Tipo de trabajo" and informe_completo["tipo_trabajo"] and search_text in str(informe_completo["tipo_trabajo"]).lower():
+                filtered_informes.append(informe_completo)
         
         # Actualizar la lista de informes mostrados
         if filtered_informes:
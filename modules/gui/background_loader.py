@@ -0,0 +1,111 @@
+"""
+Carga de datos en segundo plano para las ventanas de la GUI.
+Las consultas a DataManager se ejecutan en un hilo de trabajo y el
+resultado se entrega en el hilo de Tk mediante after(), de modo que
+la ventana no se congela mientras se lee registros.xlsx.
+"""
+
+import tkinter as tk
+import customtkinter as ctk
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Un único hilo de trabajo: las cargas sobre DataManager se ejecutan de a una
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cargador")
+
+# Cada cuánto se revisa si terminó la carga (milisegundos)
+POLL_INTERVAL_MS = 50
+
+
+class BackgroundLoader:
+    """
+    Ejecuta funciones fuera del hilo de Tk y entrega sus resultados en él.
+
+    Las cargas se cancelan automáticamente cuando se destruye el widget
+    asociado (por ejemplo, al volver al menú principal).
+    """
+
+    def __init__(self, widget):
+        """
+        Args:
+            widget: Widget de la ventana; al destruirse se cancelan las cargas pendientes
+        """
+        self.widget = widget
+        self._jobs = []
+        self._cancelled = False
+
+        # Se usa el bind de tkinter: CTkFrame redirige bind() a su canvas interno
+        tk.Misc.bind(widget, "<Destroy>", self._on_destroy, add="+")
+
+    def load(self, func, on_done, on_error=None, indicator=None):
+        """
+        Ejecuta func() en el hilo de trabajo
+
+        Args:
+            func: Función sin argumentos que obtiene los datos
+            on_done: Función que recibe el resultado (se llama en el hilo de Tk)
+            on_error: Función opcional que recibe la excepción si la carga falla
+            indicator: LoadingIndicator opcional a quitar cuando termina la carga
+
+        Returns:
+            Future de la carga
+        """
+        future = _executor.submit(func)
+        self._jobs.append(future)
+        self.widget.after(POLL_INTERVAL_MS, self._poll, future, on_done, on_error, indicator)
+        return future
+
+    def _poll(self, future, on_done, on_error, indicator):
+        """Revisa desde el hilo de Tk si la carga terminó"""
+        if self._cancelled or future.cancelled():
+            return
+
+        if not future.done():
+            self.widget.after(POLL_INTERVAL_MS, self._poll, future, on_done, on_error, indicator)
+            return
+
+        self._jobs.remove(future)
+        if indicator is not None:
+            indicator.stop()
+
+        error = future.exception()
+        if error is not None:
+            print(f"Error al cargar datos en segundo plano: {error}")
+            if on_error:
+                on_error(error)
+            return
+
+        on_done(future.result())
+
+    def cancel(self):
+        """Cancela las cargas pendientes; sus resultados ya no se entregan"""
+        self._cancelled = True
+        for future in self._jobs:
+            future.cancel()
+        self._jobs = []
+
+    def _on_destroy(self, event):
+        if str(event.widget) == str(self.widget):
+            self.cancel()
+
+
+class LoadingIndicator(ctk.CTkFrame):
+    """Indicador de carga: texto y barra de progreso indeterminada"""
+
+    def __init__(self, parent, text="Cargando datos..."):
+        super().__init__(parent, fg_color="transparent")
+
+        ctk.CTkLabel(self, text=text, font=ctk.CTkFont(size=12)).pack(side=tk.LEFT, padx=5)
+
+        self.progress = ctk.CTkProgressBar(self, mode="indeterminate", width=150)
+        self.progress.pack(side=tk.LEFT, padx=5)
+        self.progress.start()
+
+    def stop(self):
+        """Detiene la animación y quita el indicador"""
+        try:
+            self.progress.stop()
+            self.destroy()
+        except tk.TclError:
+            # La ventana ya fue destruida
+            pass
@@ -0,0 +1,167 @@
+import tkinter as tk
+import customtkinter as ctk
+from tkinter import messagebox
+from .background_loader import BackgroundLoader, LoadingIndicator
+
+
+class CajaInventoryWindow:
+    def __init__(self, parent, data_manager, return_callback):
+        self.parent = parent
+        self.data_manager = data_manager
+        self.return_callback = return_callback
+        self.cajas = []
+
+        self.setup_window()
+
+    def setup_window(self):
+        """Configura la ventana de inventario de cajas"""
+        # Crear frame principal
+        main_frame = ctk.CTkFrame(self.parent)
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+
+        # Título
+        title = ctk.CTkLabel(
+            main_frame,
+            text="🗄️ Inventario de Cajas",
+            font=ctk.CTkFont(size=20, weight="bold")
+        )
+        title.pack(pady=10)
+
+        subtitle = ctk.CTkLabel(
+            main_frame,
+            text="Obras e informes técnicos archivados en cada caja",
+            font=ctk.CTkFont(size=12),
+            text_color="gray"
+        )
+        subtitle.pack(pady=(0, 10))
+
+        # Frame para búsqueda
+        search_frame = ctk.CTkFrame(main_frame)
+        search_frame.pack(fill=tk.X, padx=10, pady=10)
+
+        ctk.CTkLabel(search_frame, text="Nro. de Caja:").grid(row=0, column=0, padx=5, pady=5)
+
+        self.caja_entry = ctk.CTkEntry(search_frame, width=120)
+        self.caja_entry.grid(row=0, column=1, padx=5, pady=5)
+        self.caja_entry.bind("<Return>", lambda event: self.show_caja())
+
+        # Botón de búsqueda (se habilita al terminar la carga)
+        self.search_button = ctk.CTkButton(search_frame, text="Ver contenido", command=self.show_caja, state="disabled")
+        self.search_button.grid(row=0, column=2, padx=5, pady=5)
+
+        self.next_caja_label = ctk.CTkLabel(search_frame, text="", text_color="gray")
+        self.next_caja_label.grid(row=0, column=3, padx=15, pady=5, sticky="e")
+        search_frame.grid_columnconfigure(3, weight=1)
+
+        # Indicador mientras se construye el índice de cajas
+        self.loading_indicator = LoadingIndicator(main_frame, text="Cargando cajas...")
+        self.loading_indicator.pack(pady=5)
+
+        # Lista de cajas a la izquierda y contenido de la caja a la derecha
+        content_frame = ctk.CTkFrame(main_frame)
+        content_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        list_frame = ctk.CTkFrame(content_frame)
+        list_frame.pack(side=tk.LEFT, fill=tk.Y, padx=5, pady=5)
+
+        ctk.CTkLabel(list_frame, text="Cajas en uso", font=ctk.CTkFont(size=14, weight="bold")).pack(pady=5)
+
+        self.cajas_listbox = tk.Listbox(list_frame, height=20, width=28)
+        self.cajas_listbox.pack(side=tk.LEFT, fill=tk.Y, padx=(5, 0), pady=5)
+        self.cajas_listbox.bind("<<ListboxSelect>>", self.on_caja_selected)
+
+        scrollbar = tk.Scrollbar(list_frame, command=self.cajas_listbox.yview)
+        scrollbar.pack(side=tk.LEFT, fill=tk.Y, pady=5)
+        self.cajas_listbox.configure(yscrollcommand=scrollbar.set)
+
+        self.works_frame = ctk.CTkScrollableFrame(content_frame)
+        self.works_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        ctk.CTkLabel(self.works_frame, text="Seleccione o ingrese un número de caja", font=ctk.CTkFont(size=14, weight="bold")).pack(pady=20)
+
+        # Botón para volver al menú principal
+        btn_back = ctk.CTkButton(
+            main_frame,
+            text="Volver al Menú Principal",
+            font=ctk.CTkFont(size=14),
+            command=self.return_callback
+        )
+        btn_back.pack(pady=10)
+
+        # Cargar las cajas sin bloquear la ventana
+        self.loader = BackgroundLoader(main_frame)
+        self.loader.load(self.load_data, self.on_data_loaded, indicator=self.loading_indicator)
+
+    def load_data(self):
+        """Obtiene las cajas en uso y la próxima caja libre (se ejecuta en segundo plano)"""
+        return {
+            "cajas": self.data_manager.get_all_cajas(),
+            "next_caja": self.data_manager.get_next_caja_number(),
+        }
+
+    def on_data_loaded(self, data):
+        """Muestra las cajas cargadas en segundo plano (se ejecuta en el hilo de Tk)"""
+        self.cajas = data["cajas"]
+
+        self.cajas_listbox.delete(0, tk.END)
+        for caja, cantidad in self.cajas:
+            trabajos = "trabajo" if cantidad == 1 else "trabajos"
+            self.cajas_listbox.insert(tk.END, f"Caja {caja} ({cantidad} {trabajos})")
+
+        self.next_caja_label.configure(text=f"Próxima caja disponible: {data['next_caja']}")
+        self.search_button.configure(state="normal")
+
+    def on_caja_selected(self, event=None):
+        """Muestra el contenido de la caja seleccionada en la lista"""
+        selection = self.cajas_listbox.curselection()
+        if not selection:
+            return
+
+        caja = self.cajas[selection[0]][0]
+        self.caja_entry.delete(0, tk.END)
+        self.caja_entry.insert(0, str(caja))
+        self.show_caja()
+
+    def show_caja(self):
+        """Muestra las obras e informes guardados en la caja ingresada"""
+        nro_caja = self.caja_entry.get().strip()
+        if not nro_caja:
+            messagebox.showwarning("Caja vacía", "Por favor ingrese un número de caja")
+            return
+
+        # Limpiar el frame de resultados
+        for widget in self.works_frame.winfo_children():
+            widget.destroy()
+
+        works = self.data_manager.get_works_in_caja(nro_caja)
+        total = len(works["obra"]) + len(works["informe"])
+
+        if not total:
+            ctk.CTkLabel(self.works_frame, text=f"La caja {nro_caja} no tiene trabajos registrados", font=ctk.CTkFont(size=14, weight="bold")).pack(pady=20)
+            return
+
+        ctk.CTkLabel(self.works_frame, text=f"Caja {nro_caja}: {total} trabajos", font=ctk.CTkFont(size=16, weight="bold")).pack(pady=10)
+
+        if works["obra"]:
+            ctk.CTkLabel(self.works_frame, text=f"Obras en general ({len(works['obra'])})", font=ctk.CTkFont(size=14, weight="bold")).pack(anchor="w", padx=10, pady=(10, 5))
+            for obra in works["obra"]:
+                info_text = f"{obra['nombre_profesional']} - {obra['nombre_comitente']} ({obra['fecha']})\n"
+                info_text += f"Expediente CPIM: {obra['nro_expediente_cpim'] or '-'}   "
+                info_text += f"Fecha de salida: {obra['fecha_salida'] or '-'}   "
+                info_text += f"Retiró: {obra['persona_retira'] or '-'}"
+                self._add_work_label(info_text)
+
+        if works["informe"]:
+            ctk.CTkLabel(self.works_frame, text=f"Informes técnicos ({len(works['informe'])})", font=ctk.CTkFont(size=14, weight="bold")).pack(anchor="w", padx=10, pady=(10, 5))
+            for informe in works["informe"]:
+                info_text = f"{informe['profesional']} - {informe['comitente']} - {informe['tipo_trabajo']} ({informe['fecha']})\n"
+                info_text += f"Expediente CPIM: {informe['nro_expediente_cpim'] or '-'}   "
+                info_text += f"Fecha de salida: {informe['fecha_salida'] or '-'}   "
+                info_text += f"Retiró: {informe['persona_retira'] or '-'}"
+                self._add_work_label(info_text)
+
+    def _add_work_label(self, text):
+        """Agrega un trabajo a la lista de resultados"""
+        frame = ctk.CTkFrame(self.works_frame)
+        frame.pack(fill=tk.X, padx=10, pady=3)
+        ctk.CTkLabel(frame, text=text, justify=tk.LEFT, anchor="w").pack(fill=tk.X, padx=10, pady=5)
@@ -2,6 +2,8 @@ import tkinter as tk
 import customtkinter as ctk
 from tkinter import messagebox
 from .autocomplete_widget import AutocompleteEntry
+from ..search_index import SEARCH_OPTIONS
+from .background_loader import BackgroundLoader, LoadingIndicator
 
 
 class DuplicateWorkWindow:
@@ -41,42 +43,41 @@ class DuplicateWorkWindow:
         option_menu = ctk.CTkOptionMenu(search_frame, values=search_options, variable=self.duplicate_search_option_var)
         option_menu.grid(row=0, column=1, padx=5, pady=5)
         
-        # Obtener listas de profesionales y comitentes existentes
-        profesionales = self.data_manager.get_all_profesionales()
-        comitentes = self.data_manager.get_all_comitentes()
+        # Las listas de profesionales y comitentes se cargan en segundo plano (ver load_data)
+        self.profesionales = []
+        self.comitentes = []
         
         # Campo de búsqueda con autocompletado
-        self.duplicate_search_entry = AutocompleteEntry(search_frame, width=200, options=profesionales)
+        self.duplicate_search_entry = AutocompleteEntry(search_frame, width=200, options=self.profesionales)
         self.duplicate_search_entry.grid(row=0, column=2, padx=5, pady=5)
         
         # Actualizar opciones de autocompletado según el criterio seleccionado
         def update_search_options(*args):
             option = self.duplicate_search_option_var.get()
             if option == "Profesional":
-                self.duplicate_search_entry.update_options(profesionales)
+                self.duplicate_search_entry.update_options(self.profesionales)
             elif option == "Comitente":
-                self.duplicate_search_entry.update_options(comitentes)
+                self.duplicate_search_entry.update_options(self.comitentes)
             else:
                 self.duplicate_search_entry.update_options([])  # Sin autocompletado para otros campos
         
         # Vincular el cambio de opción de búsqueda
         self.duplicate_search_option_var.trace_add("write", update_search_options)
+        self.update_search_options = update_search_options
         
-        # Botón de búsqueda
-        search_button = ctk.CTkButton(search_frame, text="Buscar", command=self.search_obras_for_duplication)
-        search_button.grid(row=0, column=3, padx=5, pady=5)
+        # Botón de búsqueda (se habilita al terminar la carga)
+        self.search_button = ctk.CTkButton(search_frame, text="Buscar", command=self.search_obras_for_duplication, state="disabled")
+        self.search_button.grid(row=0, column=3, padx=5, pady=5)
         
         # Configurar grid para ser responsive
         search_frame.grid_columnconfigure(2, weight=1)
         
-        # Obtener todas las obras
-        self.duplicate_obras = self.data_manager.get_all_works("obra")
+        # Indicador mientras se cargan los datos
+        self.loading_indicator = LoadingIndicator(main_frame)
+        self.loading_indicator.pack(pady=5)
         
-        # Crear lista de obras para mostrar
-        obras_display = []
-        for obra in self.duplicate_obras:
-            display = f"{obra['nombre_profesional']} - {obra['nombre_comitente']} ({obra['fecha']})"
-            obras_display.append(display)
+        # Las obras se cargan en segundo plano
+        self.duplicate_obras = []
         
         # Selector de obra
         selection_frame = ctk.CTkFrame(main_frame)
@@ -85,15 +86,16 @@ class DuplicateWorkWindow:
         ctk.CTkLabel(selection_frame, text="Seleccionar Obra:").pack(side=tk.LEFT, padx=5)
         
         # Usamos una variable separada para el texto mostrado
-        self.duplicate_obra_selector_var = ctk.StringVar(value="Seleccione una obra" if obras_display else "No hay obras registradas")
+        self.duplicate_obra_selector_var = ctk.StringVar(value="Cargando obras...")
         
         self.duplicate_obra_selector = ctk.CTkOptionMenu(
             selection_frame, 
-            values=obras_display if obras_display else ["No hay obras registradas"],
+            values=["Cargando obras..."],
             variable=self.duplicate_obra_selector_var,
             command=self.on_duplicate_obra_selected,
             dynamic_resizing=False,
-            width=300
+            width=300,
+            state="disabled"
         )
         self.duplicate_obra_selector.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
         
@@ -112,6 +114,36 @@ class DuplicateWorkWindow:
             command=self.return_callback
         )
         btn_back.pack(pady=10)
+        
+        # Cargar profesionales, comitentes y obras sin bloquear la ventana
+        self.loader = BackgroundLoader(main_frame)
+        self.loader.load(self.load_data, self.on_data_loaded, indicator=self.loading_indicator)
+    
+    def load_data(self):
+        """Obtiene los datos de la ventana (se ejecuta en segundo plano)"""
+        return {
+            "profesionales": self.data_manager.get_all_profesionales(),
+            "comitentes": self.data_manager.get_all_comitentes(),
+            "obras": self.data_manager.get_all_works("obra"),
+        }
+    
+    def on_data_loaded(self, data):
+        """Muestra los datos cargados en segundo plano (se ejecuta en el hilo de Tk)"""
+        # Autocompletado de búsqueda
+        self.profesionales = data["profesionales"]
+        self.comitentes = data["comitentes"]
+        self.update_search_options()
+        self.search_button.configure(state="normal")
+        
+        # Crear lista de obras para mostrar
+        self.duplicate_obras = data["obras"]
+        obras_display = []
+        for obra in self.duplicate_obras:
+            display = f"{obra['nombre_profesional']} - {obra['nombre_comitente']} ({obra['fecha']})"
+            obras_display.append(display)
+        
+        self.duplicate_obra_selector.configure(values=obras_display if obras_display else ["No hay obras registradas"], state="normal")
+        self.duplicate_obra_selector_var.set("Seleccione una obra" if obras_display else "No hay obras registradas")
 
     def search_obras_for_duplication(self):
         """Busca obras para duplicar según el criterio seleccionado"""
@@ -122,25 +154,10 @@ class DuplicateWorkWindow:
             messagebox.showwarning("Búsqueda vacía", "Por favor ingrese un texto para buscar")
             return
         
-        # Obtener todas las obras de nuevo (por si se agregaron nuevas)
-        self.duplicate_obras = self.data_manager.get_all_works("obra")
-        
-        # Filtrar según el criterio
-        filtered_obras = []
-        
-        for obra in self.duplicate_obras:
-            # Obtener obra completa para acceder a todos los campos
-            obra_completa = self.data_manager.get_work_by_id("obra", obra["id"])
-            
-            if obra_completa:
-                if search_option == "Profesional" and obra_completa["nombre_profesional"] and search_text in obra_completa["nombre_profesional"].lower():
-                    filtered_obras.append(obra)
-                elif search_option == "Comitente" and obra_completa["nombre_comitente"] and search_text in obra_completa["nombre_comitente"].lower():
-                    filtered_obras.append(obra)
-                elif search_option == "Partida Inmobiliaria" and obra_completa["nro_partida_inmobiliaria"] and search_text in str(obra_completa["nro_partida_inmobiliaria"]).lower():
-                    filtered_obras.append(obra)
-                elif search_option == "Número GOP" and obra_completa["nro_sistema_gop"] and search_text in str(obra_completa["nro_sistema_gop"]).lower():
-                    filtered_obras.append(obra)
+        # Buscar en el índice según el criterio seleccionado
+        field = SEARCH_OPTIONS["obra"][search_option]
+        ids = self.data_manager.search("obra", field, search_text)
+        filtered_obras = self.data_manager.get_works_by_ids("obra", ids)
         
         # Actualizar la lista de obras mostradas
         if filtered_obras:
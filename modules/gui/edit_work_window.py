@@ -4,6 +4,8 @@ from tkinter import messagebox
 from .autocomplete_widget import AutocompleteEntry
 from ..whatsapp_sender import WhatsAppSender
 from .currency_entry import CurrencyEntry
+from ..search_index import SEARCH_OPTIONS
+from .background_loader import BackgroundLoader, LoadingIndicator
 
 
 class EditWorkWindow:
@@ -42,6 +44,14 @@ class EditWorkWindow:
         self.setup_edit_obra_tab(tab_obra)
         self.setup_edit_informe_tab(tab_informe)
         
+        # Indicador mientras se cargan los datos
+        self.loading_indicator = LoadingIndicator(main_frame)
+        self.loading_indicator.pack(before=tab_view, pady=5)
+        
+        # Cargar profesionales, comitentes y trabajos sin bloquear la ventana
+        self.loader = BackgroundLoader(main_frame)
+        self.loader.load(self.load_data, self.on_data_loaded, indicator=self.loading_indicator)
+        
         # Botón para volver al menú principal
         btn_back = ctk.CTkButton(
             main_frame, 
@@ -70,42 +80,37 @@ class EditWorkWindow:
         option_menu = ctk.CTkOptionMenu(search_frame, values=search_options, variable=self.search_option_var)
         option_menu.grid(row=0, column=1, padx=5, pady=5)
         
-        # Obtener listas de profesionales y comitentes existentes
-        profesionales = self.data_manager.get_all_profesionales()
-        comitentes = self.data_manager.get_all_comitentes()
+        # Las listas de profesionales y comitentes se cargan en segundo plano (ver load_data)
+        self.profesionales = []
+        self.comitentes = []
         
         # Campo de búsqueda con autocompletado
-        self.search_entry = AutocompleteEntry(search_frame, width=200, options=profesionales)
+        self.search_entry = AutocompleteEntry(search_frame, width=200, options=self.profesionales)
         self.search_entry.grid(row=0, column=2, padx=5, pady=5)
         
         # Actualizar opciones de autocompletado según el criterio seleccionado
         def update_search_options(*args):
             option = self.search_option_var.get()
             if option == "Profesional":
-                self.search_entry.update_options(profesionales)
+                self.search_entry.update_options(self.profesionales)
             elif option == "Comitente":
-                self.search_entry.update_options(comitentes)
+                self.search_entry.update_options(self.comitentes)
             else:
                 self.search_entry.update_options([])  # Sin autocompletado para otros campos
         
         # Vincular el cambio de opción de búsqueda
         self.search_option_var.trace_add("write", update_search_options)
+        self.update_obra_search_options = update_search_options
         
-        # Botón de búsqueda
-        search_button = ctk.CTkButton(search_frame, text="Buscar", command=self.search_obras)
-        search_button.grid(row=0, column=3, padx=5, pady=5)
+        # Botón de búsqueda (se habilita al terminar la carga)
+        self.obra_search_button = ctk.CTkButton(search_frame, text="Buscar", command=self.search_obras, state="disabled")
+        self.obra_search_button.grid(row=0, column=3, padx=5, pady=5)
         
         # Configurar grid para ser responsive
         search_frame.grid_columnconfigure(2, weight=1)
         
-        # Obtener todas las OBRAS (no informes)
-        self.obras = self.data_manager.get_all_works("obra")
-        
-        # Crear lista de OBRAS para mostrar
-        obras_display = []
-        for obra in self.obras:
-            display = f"{obra['nombre_profesional']} - {obra['nombre_comitente']} ({obra['fecha']})"
-            obras_display.append(display)
+        # Las OBRAS se cargan en segundo plano
+        self.obras = []
         
         # Selector de OBRA
         selection_menu_frame = ctk.CTkFrame(selection_frame)
@@ -114,15 +119,16 @@ class EditWorkWindow:
         ctk.CTkLabel(selection_menu_frame, text="Seleccionar Obra:").pack(side=tk.LEFT, padx=5)
         
         # Variable para OBRA
-        self.obra_selector_var = ctk.StringVar(value="Seleccione una obra" if obras_display else "No hay obras registradas")
+        self.obra_selector_var = ctk.StringVar(value="Cargando obras...")
         
         self.obra_selector = ctk.CTkOptionMenu(
             selection_menu_frame, 
-            values=obras_display if obras_display else ["No hay obras registradas"],
+            values=["Cargando obras..."],
             variable=self.obra_selector_var,
             command=self.on_obra_selected,
             dynamic_resizing=False,
-            width=300
+            width=300,
+            state="disabled"
         )
         self.obra_selector.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
         
@@ -145,23 +151,10 @@ class EditWorkWindow:
             messagebox.showwarning("Búsqueda vacía", "Por favor ingrese un texto para buscar")
             return
         
-        # Obtener todos los informes de nuevo (por si se agregaron nuevos)
-        self.informes = self.data_manager.get_all_works("informe")
-        
-        # Filtrar según el criterio
-        filtered_informes = []
-        
-        for informe in self.informes:
-            # Obtener informe completo para acceder a todos los campos
-            informe_completo = self.data_manager.get_work_by_id("informe", informe["id"])
-            
-            if informe_completo:
-                if search_option == "Profesional" and informe_completo["profesional"] and search_text in informe_completo["profesional"].lower():
-                    filtered_informes.append(informe)
-                elif search_option == "Comitente" and informe_completo["comitente"] and search_text in informe_completo["comitente"].lower():
-                    filtered_informes.append(informe)
-                elif search_option == "Tipo de Informe" and informe_completo["tipo_trabajo"] and search_text in str(informe_completo["tipo_trabajo"]).lower():
-                    filtered_informes.append(informe)
+        # Buscar en el índice según el criterio seleccionado
+        field = SEARCH_OPTIONS["informe"][search_option]
+        ids = self.data_manager.search("informe", field, search_text)
+        filtered_informes = self.data_manager.get_works_by_ids("informe", ids)
         
         # Actualizar la lista de informes mostrados
         if filtered_informes:
@@ -328,6 +321,10 @@ class EditWorkWindow:
                     # Para widgets Entry y CurrencyEntry
                     data[key] = widget.get()
             
+            # Avisar si el expediente CPIM ya está asignado a otro trabajo
+            if not self.confirm_expediente("informe", informe_id, data.get("nro_expediente_cpim")):
+                return
+            
             # Guardar cambios
             if self.data_manager.update_informe_tecnico(informe_id, data):
                 # Verificar si hay tasa para enviar WhatsApp
@@ -374,7 +371,7 @@ class EditWorkWindow:
         
     
     def search_obras(self):
-        """Busca obras según el criterio seleccionado (VERSIÓN OPTIMIZADA)"""
+        """Busca obras según el criterio seleccionado"""
         search_text = self.search_entry.get().strip().lower()
         search_option = self.search_option_var.get()
         
@@ -382,45 +379,10 @@ class EditWorkWindow:
             messagebox.showwarning("Búsqueda vacía", "Por favor ingrese un texto para buscar")
             return
         
-        # Usar cache para búsqueda rápida
-        todas_obras_detalladas = self.data_manager._get_cached_obras()
-        
-        # Filtrar según el criterio (SIN llamadas adicionales a get_work_by_id)
-        filtered_obras = []
-        
-        for obra_completa in todas_obras_detalladas:
-            if search_option == "Profesional" and obra_completa["nombre_profesional"]:
-                if search_text in obra_completa["nombre_profesional"].lower():
-                    filtered_obras.append({
-                        "id": obra_completa["id"],
-                        "nombre_profesional": obra_completa["nombre_profesional"],
-                        "nombre_comitente": obra_completa["nombre_comitente"],
-                        "fecha": obra_completa["fecha"]
-                    })
-            elif search_option == "Comitente" and obra_completa["nombre_comitente"]:
-                if search_text in obra_completa["nombre_comitente"].lower():
-                    filtered_obras.append({
-                        "id": obra_completa["id"],
-                        "nombre_profesional": obra_completa["nombre_profesional"],
-                        "nombre_comitente": obra_completa["nombre_comitente"],
-                        "fecha": obra_completa["fecha"]
-                    })
-            elif search_option == "Partida Inmobiliaria" and obra_completa["nro_partida_inmobiliaria"]:
-                if search_text in str(obra_completa["nro_partida_inmobiliaria"]).lower():
-                    filtered_obras.append({
-                        "id": obra_completa["id"],
-                        "nombre_profesional": obra_completa["nombre_profesional"],
-                        "nombre_comitente": obra_completa["nombre_comitente"],
-                        "fecha": obra_completa["fecha"]
-                    })
-            elif search_option == "Número GOP" and obra_completa["nro_sistema_gop"]:
-                if search_text in str(obra_completa["nro_sistema_gop"]).lower():
-                    filtered_obras.append({
-                        "id": obra_completa["id"],
-                        "nombre_profesional": obra_completa["nombre_profesional"],
-                        "nombre_comitente": obra_completa["nombre_comitente"],
-                        "fecha": obra_completa["fecha"]
-                    })
+        # Buscar en el índice según el criterio seleccionado
+        field = SEARCH_OPTIONS["obra"][search_option]
+        ids = self.data_manager.search("obra", field, search_text)
+        filtered_obras = self.data_manager.get_works_by_ids("obra", ids)
         
         # Actualizar la lista de obras mostradas
         if filtered_obras:
@@ -629,6 +591,10 @@ class EditWorkWindow:
                     # Para widgets Entry y CurrencyEntry
                     data[key] = widget.get()
             
+            # Avisar si el expediente CPIM ya está asignado a otro trabajo
+            if not self.confirm_expediente("obra", obra_id, data.get("nro_expediente_cpim")):
+                return
+            
             # Guardar cambios
             if self.data_manager.update_obra_general(obra_id, data):
                 # Determinar si son datos de salida
@@ -698,6 +664,41 @@ class EditWorkWindow:
         except Exception as e:
             messagebox.showerror("Error", f"Error al guardar cambios: {str(e)}")
 
+    def confirm_expediente(self, work_type, work_id, nro_expediente):
+        """
+        Pide confirmación si el expediente CPIM ya está asignado a otro trabajo
+        
+        Returns:
+            bool: True si se puede guardar
+        """
+        if not nro_expediente or not str(nro_expediente).strip():
+            return True
+        
+        # Solo se revisa cuando el expediente cambia
+        actual = self.data_manager.get_work_by_id(work_type, work_id)
+        if actual and str(actual["nro_expediente_cpim"] or "").strip() == str(nro_expediente).strip():
+            return True
+        
+        conflictos = self.data_manager.find_expediente_conflicts(work_type, work_id, nro_expediente)
+        if not conflictos:
+            return True
+        
+        detalle = []
+        for tipo, work in conflictos[:5]:
+            if tipo == "obra":
+                detalle.append(f"• Obra {work['id']}: {work['nombre_profesional']} - {work['nombre_comitente']} ({work['fecha']})")
+            else:
+                detalle.append(f"• Informe {work['id']}: {work['profesional']} - {work['comitente']} ({work['fecha']})")
+        if len(conflictos) > 5:
+            detalle.append(f"• ... y {len(conflictos) - 5} más")
+        
+        return messagebox.askyesno(
+            "Expediente duplicado",
+            f"El expediente CPIM {str(nro_expediente).strip()} ya está asignado a:\n\n" +
+            "\n".join(detalle) +
+            "\n\n¿Desea guardar de todos modos?"
+        )
+    
     def repeat_obra_with_new_professional(self, obra_id):
         """Prepara un nuevo registro basado en una obra existente pero para otro profesional"""
         # Obtener los datos completos de la obra
@@ -731,42 +732,33 @@ class EditWorkWindow:
         option_menu = ctk.CTkOptionMenu(search_frame, values=search_options, variable=self.informe_search_option_var)
         option_menu.grid(row=0, column=1, padx=5, pady=5)
         
-        # Obtener listas de profesionales y comitentes existentes
-        profesionales = self.data_manager.get_all_profesionales()
-        comitentes = self.data_manager.get_all_comitentes()
-        
-        # Campo de búsqueda con autocompletado
-        self.informe_search_entry = AutocompleteEntry(search_frame, width=200, options=profesionales)
+        # Campo de búsqueda con autocompletado (las listas se cargan en segundo plano)
+        self.informe_search_entry = AutocompleteEntry(search_frame, width=200, options=self.profesionales)
         self.informe_search_entry.grid(row=0, column=2, padx=5, pady=5)
         
         # Actualizar opciones de autocompletado según el criterio seleccionado
         def update_search_options(*args):
             option = self.informe_search_option_var.get()
             if option == "Profesional":
-                self.informe_search_entry.update_options(profesionales)
+                self.informe_search_entry.update_options(self.profesionales)
             elif option == "Comitente":
-                self.informe_search_entry.update_options(comitentes)
+                self.informe_search_entry.update_options(self.comitentes)
             else:
                 self.informe_search_entry.update_options([])  # Sin autocompletado para otros campos
         
         # Vincular el cambio de opción de búsqueda
         self.informe_search_option_var.trace_add("write", update_search_options)
+        self.update_informe_search_options = update_search_options
         
-        # Botón de búsqueda
-        search_button = ctk.CTkButton(search_frame, text="Buscar", command=self.search_informes)
-        search_button.grid(row=0, column=3, padx=5, pady=5)
+        # Botón de búsqueda (se habilita al terminar la carga)
+        self.informe_search_button = ctk.CTkButton(search_frame, text="Buscar", command=self.search_informes, state="disabled")
+        self.informe_search_button.grid(row=0, column=3, padx=5, pady=5)
         
         # Configurar grid para ser responsive
         search_frame.grid_columnconfigure(2, weight=1)
         
-        # Obtener todos los informes
-        self.informes = self.data_manager.get_all_works("informe")
-        
-        # Crear lista de informes para mostrar
-        informes_display = []
-        for informe in self.informes:
-            display = f"{informe['profesional']} - {informe['comitente']} ({informe['fecha']})"
-            informes_display.append(display)
+        # Los informes se cargan en segundo plano
+        self.informes = []
         
         # Selector de informe
         selection_menu_frame = ctk.CTkFrame(selection_frame)
@@ -775,15 +767,16 @@ class EditWorkWindow:
         ctk.CTkLabel(selection_menu_frame, text="Seleccionar Informe:").pack(side=tk.LEFT, padx=5)
         
         # Usamos una variable separada para el texto mostrado
-        self.informe_selector_var = ctk.StringVar(value="Seleccione un informe" if informes_display else "No hay informes registrados")
+        self.informe_selector_var = ctk.StringVar(value="Cargando informes...")
         
         self.informe_selector = ctk.CTkOptionMenu(
             selection_menu_frame, 
-            values=informes_display if informes_display else ["No hay informes registrados"],
+            values=["Cargando informes..."],
             variable=self.informe_selector_var,
             command=self.on_informe_selected,
             dynamic_resizing=False,
-            width=300
+            width=300,
+            state="disabled"
         )
         self.informe_selector.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
         
@@ -796,6 +789,45 @@ class EditWorkWindow:
         
         # Indicar que no hay informe seleccionado
         ctk.CTkLabel(self.informe_edit_frame, text="Seleccione un informe para editar", font=ctk.CTkFont(size=14, weight="bold")).pack(pady=20)
+    
+    def load_data(self):
+        """Obtiene los datos de la ventana (se ejecuta en segundo plano)"""
+        return {
+            "profesionales": self.data_manager.get_all_profesionales(),
+            "comitentes": self.data_manager.get_all_comitentes(),
+            "obras": self.data_manager.get_all_works("obra"),
+            "informes": self.data_manager.get_all_works("informe"),
+        }
+    
+    def on_data_loaded(self, data):
+        """Muestra los datos cargados en segundo plano (se ejecuta en el hilo de Tk)"""
+        # Autocompletado de búsqueda
+        self.profesionales = data["profesionales"]
+        self.comitentes = data["comitentes"]
+        self.update_obra_search_options()
+        self.update_informe_search_options()
+        self.obra_search_button.configure(state="normal")
+        self.informe_search_button.configure(state="normal")
+        
+        # Crear lista de OBRAS para mostrar
+        self.obras = data["obras"]
+        obras_display = []
+        for obra in self.obras:
+            display = f"{obra['nombre_profesional']} - {obra['nombre_comitente']} ({obra['fecha']})"
+            obras_display.append(display)
+        
+        self.obra_selector.configure(values=obras_display if obras_display else ["No hay obras registradas"], state="normal")
+        self.obra_selector_var.set("Seleccione una obra" if obras_display else "No hay obras registradas")
+        
+        # Crear lista de informes para mostrar
+        self.informes = data["informes"]
+        informes_display = []
+        for informe in self.informes:
+            display = f"{informe['profesional']} - {informe['comitente']} ({informe['fecha']})"
+            informes_display.append(display)
+        
+        self.informe_selector.configure(values=informes_display if informes_display else ["No hay informes registrados"], state="normal")
+        self.informe_selector_var.set("Seleccione un informe" if informes_display else "No hay informes registrados")
         
         # Seleccionar el primer informe si hay alguno
         if informes_display:
@@ -811,23 +843,10 @@ class EditWorkWindow:
             messagebox.showwarning("Búsqueda vacía", "Por favor ingrese un texto para buscar")
             return
         
-        # Obtener todos los informes de nuevo (por si se agregaron nuevos)
-        self.informes = self.data_manager.get_all_works("informe")
-        
-        # Filtrar según el criterio
-        filtered_informes = []
-        
-        for informe in self.informes:
-            # Obtener informe completo para acceder a todos los campos
-            informe_completo = self.data_manager.get_work_by_id("informe", informe["id"])
-            
-            if informe_completo:
-                if search_option == "Profesional" and informe_completo["profesional"] and search_text in informe_completo["profesional"].lower():
-                    filtered_informes.append(informe)
-                elif search_option == "Comitente" and informe_completo["comitente"] and search_text in informe_completo["comitente"].lower():
-                    filtered_informes.append(informe)
-                elif search_option == "Tipo de Informe" and informe_completo["tipo_trabajo"] and search_text in str(informe_completo["tipo_trabajo"]).lower():
-                    filtered_informes.append(informe)
+        # Buscar en el índice según el criterio seleccionado
+        field = SEARCH_OPTIONS["informe"][search_option]
+        ids = self.data_manager.search("informe", field, search_text)
+        filtered_informes = self.data_manager.get_works_by_ids("informe", ids)
         
         # Actualizar la lista de informes mostrados
         if filtered_informes:
@@ -994,6 +1013,10 @@ class EditWorkWindow:
                     # Para widgets Entry y CurrencyEntry
                     data[key] = widget.get()
             
+            # Avisar si el expediente CPIM ya está asignado a otro trabajo
+            if not self.confirm_expediente("informe", informe_id, data.get("nro_expediente_cpim")):
+                return
+            
             # Guardar cambios
             if self.data_manager.update_informe_tecnico(informe_id, data):
                 # Verificar si hay tasa para enviar WhatsApp
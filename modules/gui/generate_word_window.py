@@ -6,6 +6,8 @@ from pathlib import Path
 import subprocess
 import os
 from .autocomplete_widget import AutocompleteEntry
+from ..search_index import SEARCH_OPTIONS
+from .background_loader import BackgroundLoader, LoadingIndicator
 
 
 class GenerateWordWindow:
@@ -44,6 +46,14 @@ class GenerateWordWindow:
         self.setup_word_obra_tab(tab_obra)
         self.setup_word_informe_tab(tab_informe)
         
+        # Indicador mientras se cargan los datos
+        self.loading_indicator = LoadingIndicator(main_frame)
+        self.loading_indicator.pack(before=tab_view, pady=5)
+        
+        # Cargar profesionales, comitentes y trabajos sin bloquear la ventana
+        self.loader = BackgroundLoader(main_frame)
+        self.loader.load(self.load_data, self.on_data_loaded, indicator=self.loading_indicator)
+        
         # Botón para volver al menú principal
         btn_back = ctk.CTkButton(
             main_frame, 
@@ -72,42 +82,37 @@ class GenerateWordWindow:
         option_menu = ctk.CTkOptionMenu(search_frame, values=search_options, variable=self.word_search_option_var)
         option_menu.grid(row=0, column=1, padx=5, pady=5)
         
-        # Obtener listas de profesionales y comitentes existentes
-        profesionales = self.data_manager.get_all_profesionales()
-        comitentes = self.data_manager.get_all_comitentes()
+        # Las listas de profesionales y comitentes se cargan en segundo plano (ver load_data)
+        self.profesionales = []
+        self.comitentes = []
         
         # Campo de búsqueda con autocompletado
-        self.word_search_entry = AutocompleteEntry(search_frame, width=200, options=profesionales)
+        self.word_search_entry = AutocompleteEntry(search_frame, width=200, options=self.profesionales)
         self.word_search_entry.grid(row=0, column=2, padx=5, pady=5)
         
         # Actualizar opciones de autocompletado según el criterio seleccionado
         def update_search_options(*args):
             option = self.word_search_option_var.get()
             if option == "Profesional":
-                self.word_search_entry.update_options(profesionales)
+                self.word_search_entry.update_options(self.profesionales)
             elif option == "Comitente":
-                self.word_search_entry.update_options(comitentes)
+                self.word_search_entry.update_options(self.comitentes)
             else:
                 self.word_search_entry.update_options([])  # Sin autocompletado para otros campos
         
         # Vincular el cambio de opción de búsqueda
         self.word_search_option_var.trace_add("write", update_search_options)
+        self.update_obra_search_options = update_search_options
         
-        # Botón de búsqueda
-        search_button = ctk.CTkButton(search_frame, text="Buscar", command=self.search_word_obras)
-        search_button.grid(row=0, column=3, padx=5, pady=5)
+        # Botón de búsqueda (se habilita al terminar la carga)
+        self.obra_search_button = ctk.CTkButton(search_frame, text="Buscar", command=self.search_word_obras, state="disabled")
+        self.obra_search_button.grid(row=0, column=3, padx=5, pady=5)
         
         # Configurar grid para ser responsive
         search_frame.grid_columnconfigure(2, weight=1)
         
-        # Obtener todas las obras
-        self.word_obras = self.data_manager.get_all_works("obra")
-        
-        # Crear lista de obras para mostrar
-        obras_display = []
-        for obra in self.word_obras:
-            display = f"{obra['nombre_profesional']} - {obra['nombre_comitente']} ({obra['fecha']})"
-            obras_display.append(display)
+        # Las obras se cargan en segundo plano
+        self.word_obras = []
         
         # Selector de obra
         selection_menu_frame = ctk.CTkFrame(selection_frame)
@@ -116,29 +121,22 @@ class GenerateWordWindow:
         ctk.CTkLabel(selection_menu_frame, text="Seleccionar Obra:").pack(side=tk.LEFT, padx=5)
         
         # Usamos una variable separada para el texto mostrado
-        self.word_obra_selector_var = ctk.StringVar(value="Seleccione una obra" if obras_display else "No hay obras registradas")
+        self.word_obra_selector_var = ctk.StringVar(value="Cargando obras...")
         
         self.word_obra_selector = ctk.CTkOptionMenu(
             selection_menu_frame, 
-            values=obras_display if obras_display else ["No hay obras registradas"],
+            values=["Cargando obras..."],
             variable=self.word_obra_selector_var,
             command=self.on_word_obra_selected,
             dynamic_resizing=False,
-            width=300
+            width=300,
+            state="disabled"
         )
         self.word_obra_selector.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
         
         # Frame para las opciones de generación
         self.word_obra_frame = ctk.CTkFrame(parent)
         self.word_obra_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        # Indicar que seleccione una obra
-        if not obras_display:
-            ctk.CTkLabel(self.word_obra_frame, text="No hay obras disponibles", font=ctk.CTkFont(size=14, weight="bold")).pack(pady=20)
-        else:
-            # Seleccionar la primera obra
-            self.word_obra_selector.set(obras_display[0])
-            self.on_word_obra_selected(obras_display[0])
 
     def search_word_obras(self):
         """Busca obras para generar Word según el criterio seleccionado"""
@@ -149,25 +147,10 @@ class GenerateWordWindow:
             messagebox.showwarning("Búsqueda vacía", "Por favor ingrese un texto para buscar")
             return
         
-        # Obtener todas las obras de nuevo (por si se agregaron nuevas)
-        self.word_obras = self.data_manager.get_all_works("obra")
-        
-        # Filtrar según el criterio
-        filtered_obras = []
-        
-        for obra in self.word_obras:
-            # Obtener obra completa para acceder a todos los campos
-            obra_completa = self.data_manager.get_work_by_id("obra", obra["id"])
-            
-            if obra_completa:
-                if search_option == "Profesional" and obra_completa["nombre_profesional"] and search_text in obra_completa["nombre_profesional"].lower():
-                    filtered_obras.append(obra)
-                elif search_option == "Comitente" and obra_completa["nombre_comitente"] and search_text in obra_completa["nombre_comitente"].lower():
-                    filtered_obras.append(obra)
-                elif search_option == "Partida Inmobiliaria" and obra_completa["nro_partida_inmobiliaria"] and search_text in str(obra_completa["nro_partida_inmobiliaria"]).lower():
-                    filtered_obras.append(obra)
-                elif search_option == "Número GOP" and obra_completa["nro_sistema_gop"] and search_text in str(obra_completa["nro_sistema_gop"]).lower():
-                    filtered_obras.append(obra)
+        # Buscar en el índice según el criterio seleccionado
+        field = SEARCH_OPTIONS["obra"][search_option]
+        ids = self.data_manager.search("obra", field, search_text)
+        filtered_obras = self.data_manager.get_works_by_ids("obra", ids)
         
         # Actualizar la lista de obras mostradas
         if filtered_obras:
@@ -269,42 +252,33 @@ class GenerateWordWindow:
         option_menu = ctk.CTkOptionMenu(search_frame, values=search_options, variable=self.word_informe_search_option_var)
         option_menu.grid(row=0, column=1, padx=5, pady=5)
         
-        # Obtener listas de profesionales y comitentes existentes
-        profesionales = self.data_manager.get_all_profesionales()
-        comitentes = self.data_manager.get_all_comitentes()
-        
         # Campo de búsqueda con autocompletado
-        self.word_informe_search_entry = AutocompleteEntry(search_frame, width=200, options=profesionales)
+        self.word_informe_search_entry = AutocompleteEntry(search_frame, width=200, options=self.profesionales)
         self.word_informe_search_entry.grid(row=0, column=2, padx=5, pady=5)
         
         # Actualizar opciones de autocompletado según el criterio seleccionado
         def update_search_options(*args):
             option = self.word_informe_search_option_var.get()
             if option == "Profesional":
-                self.word_informe_search_entry.update_options(profesionales)
+                self.word_informe_search_entry.update_options(self.profesionales)
             elif option == "Comitente":
-                self.word_informe_search_entry.update_options(comitentes)
+                self.word_informe_search_entry.update_options(self.comitentes)
             else:
                 self.word_informe_search_entry.update_options([])  # Sin autocompletado para otros campos
         
         # Vincular el cambio de opción de búsqueda
         self.word_informe_search_option_var.trace_add("write", update_search_options)
+        self.update_informe_search_options = update_search_options
         
-        # Botón de búsqueda
-        search_button = ctk.CTkButton(search_frame, text="Buscar", command=self.search_word_informes)
-        search_button.grid(row=0, column=3, padx=5, pady=5)
+        # Botón de búsqueda (se habilita al terminar la carga)
+        self.informe_search_button = ctk.CTkButton(search_frame, text="Buscar", command=self.search_word_informes, state="disabled")
+        self.informe_search_button.grid(row=0, column=3, padx=5, pady=5)
         
         # Configurar grid para ser responsive
         search_frame.grid_columnconfigure(2, weight=1)
         
-        # Obtener todos los informes
-        self.word_informes = self.data_manager.get_all_works("informe")
-        
-        # Crear lista de informes para mostrar
-        informes_display = []
-        for informe in self.word_informes:
-            display = f"{informe['profesional']} - {informe['comitente']} ({informe['fecha']})"
-            informes_display.append(display)
+        # Los informes se cargan en segundo plano
+        self.word_informes = []
         
         # Selector de informe
         selection_menu_frame = ctk.CTkFrame(selection_frame)
@@ -313,21 +287,69 @@ class GenerateWordWindow:
         ctk.CTkLabel(selection_menu_frame, text="Seleccionar Informe:").pack(side=tk.LEFT, padx=5)
         
         # Variable para el texto mostrado
-        self.word_informe_selector_var = ctk.StringVar(value="Seleccione un informe" if informes_display else "No hay informes registrados")
+        self.word_informe_selector_var = ctk.StringVar(value="Cargando informes...")
         
         self.word_informe_selector = ctk.CTkOptionMenu(
             selection_menu_frame, 
-            values=informes_display if informes_display else ["No hay informes registrados"],
+            values=["Cargando informes..."],
             variable=self.word_informe_selector_var,
             command=self.on_word_informe_selected,
             dynamic_resizing=False,
-            width=300
+            width=300,
+            state="disabled"
         )
         self.word_informe_selector.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
         
         # Frame para las opciones de generación
         self.word_informe_frame = ctk.CTkFrame(parent)
         self.word_informe_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+    def load_data(self):
+        """Obtiene los datos de la ventana (se ejecuta en segundo plano)"""
+        return {
+            "profesionales": self.data_manager.get_all_profesionales(),
+            "comitentes": self.data_manager.get_all_comitentes(),
+            "obras": self.data_manager.get_all_works("obra"),
+            "informes": self.data_manager.get_all_works("informe"),
+        }
+
+    def on_data_loaded(self, data):
+        """Muestra los datos cargados en segundo plano (se ejecuta en el hilo de Tk)"""
+        # Autocompletado de búsqueda
+        self.profesionales = data["profesionales"]
+        self.comitentes = data["comitentes"]
+        self.update_obra_search_options()
+        self.update_informe_search_options()
+        self.obra_search_button.configure(state="normal")
+        self.informe_search_button.configure(state="normal")
+        
+        # Crear lista de obras para mostrar
+        self.word_obras = data["obras"]
+        obras_display = []
+        for obra in self.word_obras:
+            display = f"{obra['nombre_profesional']} - {obra['nombre_comitente']} ({obra['fecha']})"
+            obras_display.append(display)
+        
+        self.word_obra_selector.configure(values=obras_display if obras_display else ["No hay obras registradas"], state="normal")
+        self.word_obra_selector_var.set("Seleccione una obra" if obras_display else "No hay obras registradas")
+        
+        # Indicar que seleccione una obra
+        if not obras_display:
+            ctk.CTkLabel(self.word_obra_frame, text="No hay obras disponibles", font=ctk.CTkFont(size=14, weight="bold")).pack(pady=20)
+        else:
+            # Seleccionar la primera obra
+            self.word_obra_selector.set(obras_display[0])
+            self.on_word_obra_selected(obras_display[0])
+        
+        # Crear lista de informes para mostrar
+        self.word_informes = data["informes"]
+        informes_display = []
+        for informe in self.word_informes:
+            display = f"{informe['profesional']} - {informe['comitente']} ({informe['fecha']})"
+            informes_display.append(display)
+        
+        self.word_informe_selector.configure(values=informes_display if informes_display else ["No hay informes registrados"], state="normal")
+        self.word_informe_selector_var.set("Seleccione un informe" if informes_display else "No hay informes registrados")
         
         # Indicar que seleccione un informe
         if not informes_display:
@@ -346,23 +368,10 @@ class GenerateWordWindow:
             messagebox.showwarning("Búsqueda vacía", "Por favor ingrese un texto para buscar")
             return
         
-        # Obtener todos los informes de nuevo (por si se agregaron nuevos)
-        self.word_informes = self.data_manager.get_all_works("informe")
-        
-        # Filtrar según el criterio
-        filtered_informes = []
-        
-        for informe in self.word_informes:
-            # Obtener informe completo para acceder a todos los campos
-            informe_completo = self.data_manager.get_work_by_id("informe", informe["id"])
-            
-            if informe_completo:
-                if search_option == "Profesional" and informe_completo["profesional"] and search_text in informe_completo["profesional"].lower():
-                    filtered_informes.append(informe)
-                elif search_option == "Comitente" and informe_completo["comitente"] and search_text in informe_completo["comitente"].lower():
-                    filtered_informes.append(informe)
-                elif search_option == "Tipo de Informe" and informe_completo["tipo_trabajo"] and search_text in str(informe_completo["tipo_trabajo"]).lower():
-                    filtered_informes.append(informe)
+        # Buscar en el índice según el criterio seleccionado
+        field = SEARCH_OPTIONS["informe"][search_option]
+        ids = self.data_manager.search("informe", field, search_text)
+        filtered_informes = self.data_manager.get_works_by_ids("informe", ids)
         
         # Actualizar la lista de informes mostrados
         if filtered_informes:
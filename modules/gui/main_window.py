@@ -2,14 +2,11 @@ import tkinter as tk
 import customtkinter as ctk
 from modules.data_manager import DataManager
 from modules.file_manager import FileManager
-from modules.word_generator import WordGenerator
-from modules.whatsapp_sender import WhatsAppSender
-from config import TRABAJOS_PATH, ensure_directories
-from .new_record_window import NewRecordWindow
-from .edit_work_window import EditWorkWindow
-from .duplicate_work_window import DuplicateWorkWindow
-from .generate_word_window import GenerateWordWindow
-from .tasas_analysis_window import TasasAnalysisWindow
+from config import TRABAJOS_PATH
+from modules.startup_timer import startup_timer
+
+# Las ventanas, WordGenerator (python-docx) y WhatsAppSender se importan
+# recién cuando se usan, para que el menú principal aparezca cuanto antes
 
 
 class App(ctk.CTk):
@@ -21,20 +18,44 @@ class App(ctk.CTk):
         self.geometry("1200x700")
         self.minsize(900, 600)
         
-        # Inicializar managers
-        self.data_manager = DataManager()
-        self.file_manager = FileManager()
-        self.word_generator = WordGenerator()
-        self.whatsapp_sender = WhatsAppSender()
-
-        # Asegurarse de que las carpetas existan
-        ensure_directories()
+        # Inicializar managers (las carpetas ya las creó main.py)
+        with startup_timer.step("DataManager"):
+            self.data_manager = DataManager()
+        with startup_timer.step("FileManager"):
+            self.file_manager = FileManager()
+        self._word_generator = None
+        self._whatsapp_sender = None
         
         # Variables para las ventanas
         self.current_window = None
         
         # Crear menú principal
-        self.create_main_menu()
+        with startup_timer.step("Menú principal"):
+            self.create_main_menu()
+        
+        # Guardar los cambios pendientes antes de cerrar la ventana
+        self.protocol("WM_DELETE_WINDOW", self.on_closing)
+    
+    @property
+    def word_generator(self):
+        """WordGenerator, creado (e importado python-docx) en el primer uso"""
+        if self._word_generator is None:
+            from modules.word_generator import WordGenerator
+            self._word_generator = WordGenerator()
+        return self._word_generator
+    
+    @property
+    def whatsapp_sender(self):
+        """WhatsAppSender, creado en el primer uso"""
+        if self._whatsapp_sender is None:
+            from modules.whatsapp_sender import WhatsAppSender
+            self._whatsapp_sender = WhatsAppSender()
+        return self._whatsapp_sender
+    
+    def on_closing(self):
+        """Guarda en disco los cambios pendientes y cierra la aplicación"""
+        self.data_manager.flush()
+        self.destroy()
     
     def create_main_menu(self):
         """Crea el menú principal de la aplicación"""
@@ -132,6 +153,15 @@ class App(ctk.CTk):
         )
         btn_tasas.grid(row=3, column=0, columnspan=2, padx=20, pady=20, sticky="nsew")
 
+        btn_cajas = ctk.CTkButton(
+            btn_frame, 
+            text="🗄️ Inventario de Cajas", 
+            font=ctk.CTkFont(size=16),
+            height=80,
+            command=self.show_caja_inventory_window
+        )
+        btn_cajas.grid(row=4, column=0, columnspan=2, padx=20, pady=20, sticky="nsew")
+
         
         # Frame para información adicional
         info_frame = ctk.CTkFrame(main_frame)
@@ -157,12 +187,18 @@ class App(ctk.CTk):
     
     def clear_window(self):
         """Limpia todos los widgets de la ventana"""
+        # Cancelar las cargas en segundo plano de la ventana anterior
+        loader = getattr(self.current_window, "loader", None)
+        if loader is not None:
+            loader.cancel()
+        
         for widget in self.winfo_children():
             widget.destroy()
         self.current_window = None
     
     def show_new_record_window(self):
         """Muestra la ventana para registrar un nuevo trabajo"""
+        from .new_record_window import NewRecordWindow
         self.clear_window()
         self.current_window = NewRecordWindow(
             self, 
@@ -173,6 +209,7 @@ class App(ctk.CTk):
     
     def show_edit_work_window(self):
         """Muestra la ventana para editar un trabajo existente"""
+        from .edit_work_window import EditWorkWindow
         self.clear_window()
         self.current_window = EditWorkWindow(
             self, 
@@ -183,6 +220,7 @@ class App(ctk.CTk):
     
     def show_duplicate_work_window(self):
         """Muestra la ventana para duplicar un trabajo"""
+        from .duplicate_work_window import DuplicateWorkWindow
         self.clear_window()
         self.current_window = DuplicateWorkWindow(
             self, 
@@ -194,6 +232,7 @@ class App(ctk.CTk):
     
     def show_generate_word_window(self):
         """Muestra la ventana para generar documentos Word"""
+        from .generate_word_window import GenerateWordWindow
         self.clear_window()
         self.current_window = GenerateWordWindow(
             self, 
@@ -205,11 +244,20 @@ class App(ctk.CTk):
         
     def show_tasas_analysis_window(self):
         """Muestra la ventana de análisis de tasas de visado"""
+        from .tasas_analysis_window import TasasAnalysisWindow
         self.clear_window()
         self.current_window = TasasAnalysisWindow(
             self, 
             self.data_manager, 
             self.create_main_menu
         )
-
-    
\ No newline at end of file
+    
+    def show_caja_inventory_window(self):
+        """Muestra el inventario de cajas del archivo"""
+        from .caja_inventory_window import CajaInventoryWindow
+        self.clear_window()
+        self.current_window = CajaInventoryWindow(
+            self, 
+            self.data_manager, 
+            self.create_main_menu
+        )
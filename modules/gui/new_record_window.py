@@ -7,6 +7,7 @@ from datetime import datetime
 from config import PROFESIONES, TIPOS_OBRA, TIPOS_INFORME
 from .autocomplete_widget import AutocompleteEntry
 from .currency_entry import CurrencyEntry
+from .background_loader import BackgroundLoader, LoadingIndicator
 
 
 class NewRecordWindow:
@@ -44,6 +45,14 @@ class NewRecordWindow:
         self.setup_obra_tab(tab_obra)
         self.setup_informe_tab(tab_informe)
         
+        # Indicador mientras se cargan las listas de autocompletado
+        self.loading_indicator = LoadingIndicator(main_frame, text="Cargando profesionales y comitentes...")
+        self.loading_indicator.pack(before=self.tab_view, pady=5)
+        
+        # Cargar profesionales y comitentes sin bloquear la ventana
+        self.loader = BackgroundLoader(main_frame)
+        self.loader.load(self.load_data, self.on_data_loaded, indicator=self.loading_indicator)
+        
         # Botón para volver al menú principal
         btn_back = ctk.CTkButton(
             main_frame, 
@@ -53,6 +62,20 @@ class NewRecordWindow:
         )
         btn_back.pack(pady=10)
     
+    def load_data(self):
+        """Obtiene las listas de autocompletado (se ejecuta en segundo plano)"""
+        return {
+            "profesionales": self.data_manager.get_all_profesionales(),
+            "comitentes": self.data_manager.get_all_comitentes(),
+        }
+    
+    def on_data_loaded(self, data):
+        """Carga las opciones de autocompletado (se ejecuta en el hilo de Tk)"""
+        self.prof_entry.update_options(data["profesionales"])
+        self.comit_entry.update_options(data["comitentes"])
+        self.informe_prof_entry.update_options(data["profesionales"])
+        self.informe_comit_entry.update_options(data["comitentes"])
+    
     def validate_length(self, text, max_length):
         """Valida que el texto no exceda la longitud máxima"""
         return len(text) <= max_length
@@ -63,9 +86,7 @@ class NewRecordWindow:
         scroll_frame = ctk.CTkScrollableFrame(parent)
         scroll_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
-        # Obtener listas de profesionales y comitentes existentes
-        profesionales = self.data_manager.get_all_profesionales()
-        comitentes = self.data_manager.get_all_comitentes()
+        # Las listas de profesionales y comitentes se cargan en segundo plano (ver load_data)
         
         # Crear variables
         self.obra_vars = {
@@ -150,7 +171,7 @@ class NewRecordWindow:
         
         # Nombre del profesional (con autocompletado y límite de caracteres)
         ctk.CTkLabel(scroll_frame, text="Nombre del Profesional:").grid(row=row, column=0, sticky="w", pady=5, padx=5)
-        self.prof_entry = AutocompleteEntry(scroll_frame, options=profesionales)
+        self.prof_entry = AutocompleteEntry(scroll_frame, options=[])
         # Configurar callback para autocompletar WhatsApp cuando cambie el profesional
         self.prof_entry.entry_var.trace_add("write", self.on_profesional_change_obra)
         
@@ -167,7 +188,7 @@ class NewRecordWindow:
         
         # Nombre del comitente (con autocompletado y límite de caracteres)
         ctk.CTkLabel(scroll_frame, text="Nombre del Comitente:").grid(row=row, column=0, sticky="w", pady=5, padx=5)
-        self.comit_entry = AutocompleteEntry(scroll_frame, options=comitentes)
+        self.comit_entry = AutocompleteEntry(scroll_frame, options=[])
         
         # APLICAR LÍMITE DE 80 CARACTERES AL COMITENTE
         validate_comit_cmd = (self.parent.register(lambda text: self.validate_length(text, 50)), '%P')
@@ -288,9 +309,7 @@ class NewRecordWindow:
         scroll_frame = ctk.CTkScrollableFrame(parent)
         scroll_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
-        # Obtener listas de profesionales y comitentes existentes
-        profesionales = self.data_manager.get_all_profesionales()
-        comitentes = self.data_manager.get_all_comitentes()
+        # Las listas de profesionales y comitentes se cargan en segundo plano (ver load_data)
         
         # Crear variables
         self.informe_vars = {
@@ -365,7 +384,7 @@ class NewRecordWindow:
         
         # Profesional (con autocompletado y límite de caracteres)
         ctk.CTkLabel(scroll_frame, text="Profesional:").grid(row=row, column=0, sticky="w", pady=5, padx=5)
-        self.informe_prof_entry = AutocompleteEntry(scroll_frame, options=profesionales)
+        self.informe_prof_entry = AutocompleteEntry(scroll_frame, options=[])
         # Configurar callback para autocompletar WhatsApp cuando cambie el profesional
         self.informe_prof_entry.entry_var.trace_add("write", self.on_profesional_change_informe)
         
@@ -382,7 +401,7 @@ class NewRecordWindow:
         
         # Comitente (con autocompletado y límite de caracteres)
         ctk.CTkLabel(scroll_frame, text="Comitente:").grid(row=row, column=0, sticky="w", pady=5, padx=5)
-        self.informe_comit_entry = AutocompleteEntry(scroll_frame, options=comitentes)
+        self.informe_comit_entry = AutocompleteEntry(scroll_frame, options=[])
         
         # APLICAR LÍMITE DE 80 CARACTERES AL COMITENTE
         validate_inf_comit_cmd = (self.parent.register(lambda text: self.validate_length(text, 50)), '%P')
@@ -0,0 +1,157 @@
+"""
+Índice invertido para las búsquedas de las ventanas de la aplicación.
+Normaliza los textos (minúsculas y sin acentos) e indexa n-gramas de
+cada palabra, de modo que buscar un texto no requiere recorrer todos
+los registros.
+"""
+
+import re
+import unicodedata
+
+
+# Opciones de búsqueda de las ventanas y el campo que consulta cada una
+SEARCH_OPTIONS = {
+    "obra": {
+        "Profesional": "nombre_profesional",
+        "Comitente": "nombre_comitente",
+        "Partida Inmobiliaria": "nro_partida_inmobiliaria",
+        "Número GOP": "nro_sistema_gop",
+    },
+    "informe": {
+        "Profesional": "profesional",
+        "Comitente": "comitente",
+        "Tipo de Informe": "tipo_trabajo",
+    },
+}
+
+# Longitud de los n-gramas indexados
+NGRAM_SIZE = 3
+
+_TOKEN_SPLIT = re.compile(r"\W+")
+
+
+def normalize_text(value):
+    """
+    Normaliza un valor para búsqueda: texto en minúsculas y sin acentos
+
+    Args:
+        value: Valor de la celda (texto, número o None)
+
+    Returns:
+        str: Texto normalizado ("" si el valor está vacío)
+    """
+    if value is None:
+        return ""
+    text = unicodedata.normalize("NFKD", str(value))
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return text.lower().strip()
+
+
+def _tokens(text):
+    """Divide un texto normalizado en palabras"""
+    return [token for token in _TOKEN_SPLIT.split(text) if token]
+
+
+def _ngrams(token):
+    """Devuelve los n-gramas de una palabra (la palabra entera si es corta)"""
+    if len(token) <= NGRAM_SIZE:
+        return {token}
+    return {token[i:i + NGRAM_SIZE] for i in range(len(token) - NGRAM_SIZE + 1)}
+
+
+class SearchIndex:
+    """
+    Índice de búsqueda por subcadena sobre algunos campos de los registros.
+
+    Para cada campo guarda el texto normalizado de cada registro y un
+    índice invertido n-grama -> IDs. Una búsqueda intersecta los IDs de
+    los n-gramas de la consulta y solo verifica esos candidatos.
+    """
+
+    def __init__(self, fields):
+        self.fields = tuple(fields)
+        self._values = {field: {} for field in self.fields}
+        self._postings = {field: {} for field in self.fields}
+
+    def build(self, records):
+        """Construye el índice completo a partir de una lista de registros"""
+        self._values = {field: {} for field in self.fields}
+        self._postings = {field: {} for field in self.fields}
+        for record in records:
+            self.add(record["id"], record)
+
+    def add(self, row_id, record):
+        """Agrega un registro al índice"""
+        for field in self.fields:
+            text = normalize_text(record.get(field))
+            if not text:
+                continue
+            self._values[field][row_id] = text
+            postings = self._postings[field]
+            for token in _tokens(text):
+                for gram in _ngrams(token):
+                    postings.setdefault(gram, set()).add(row_id)
+
+    def remove(self, row_id):
+        """Quita un registro del índice"""
+        for field in self.fields:
+            text = self._values[field].pop(row_id, None)
+            if not text:
+                continue
+            postings = self._postings[field]
+            for token in _tokens(text):
+                for gram in _ngrams(token):
+                    ids = postings.get(gram)
+                    if ids is not None:
+                        ids.discard(row_id)
+                        if not ids:
+                            del postings[gram]
+
+    def update(self, row_id, record):
+        """Reindexa un registro con sus valores actuales"""
+        self.remove(row_id)
+        self.add(row_id, record)
+
+    def search(self, field, text, limit=None):
+        """
+        Busca los registros cuyo campo contiene el texto (sin distinguir acentos ni mayúsculas)
+
+        Args:
+            field: Campo a consultar (debe estar indexado)
+            text: Texto a buscar
+            limit: Cantidad máxima de resultados (None para todos)
+
+        Returns:
+            list: IDs de los registros encontrados, en orden ascendente
+        """
+        query = normalize_text(text)
+        if not query or field not in self._values:
+            return []
+
+        values = self._values[field]
+        postings = self._postings[field]
+
+        # Candidatos: intersección de los n-gramas de las palabras largas de la consulta
+        candidates = None
+        for token in _tokens(query):
+            if len(token) < NGRAM_SIZE:
+                continue
+            for gram in _ngrams(token):
+                ids = postings.get(gram)
+                if not ids:
+                    return []
+                if candidates is None:
+                    candidates = set(ids)
+                else:
+                    candidates &= ids
+                if not candidates:
+                    return []
+
+        # Consultas muy cortas: recorrer los textos ya normalizados
+        if candidates is None:
+            candidates = values.keys()
+
+        results = sorted(row_id for row_id in candidates if query in values[row_id])
+        if limit is not None:
+            results = results[:limit]
+        return results
@@ -0,0 +1,125 @@
+"""
+Medición del tiempo de arranque de la aplicación.
+Cada etapa del inicio (carpetas, validación del Excel, carga del cache,
+ventana principal) se registra con su duración y al final se imprime
+un resumen para poder comparar arranques en frío.
+
+Con la variable de entorno CPIM_IMPORTTIME=1 también se mide cuánto
+tarda cada importación, al estilo de "python -X importtime" (útil en el
+ejecutable de PyInstaller, donde no se pueden pasar opciones al intérprete).
+"""
+
+import sys
+import time
+import builtins
+from contextlib import contextmanager
+
+
+class StartupTimer:
+    """Acumula la duración de las etapas del arranque"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.steps = []  # [[etapa, segundos, nivel]]
+        self._depth = 0
+        self.imports = []  # [[módulo, segundos acumulados, nivel]]
+        self._import_depth = 0
+        self._original_import = None
+
+    @contextmanager
+    def step(self, name):
+        """
+        Mide la duración del bloque como una etapa del arranque
+
+        Las etapas pueden anidarse: en el resumen, las internas se
+        muestran debajo de la que las contiene.
+
+        Uso:
+            with startup_timer.step("Validación del Excel"):
+                ...
+        """
+        entry = [name, 0.0, self._depth]
+        self.steps.append(entry)
+        self._depth += 1
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry[1] = time.perf_counter() - inicio
+            self._depth -= 1
+
+    def enable_import_timing(self):
+        """
+        Mide las importaciones que cargan módulos nuevos desde este momento
+
+        Reemplaza builtins.__import__ por una versión que registra el tiempo
+        acumulado (incluidas sus dependencias) de cada import que agrega
+        módulos a sys.modules.
+        """
+        if self._original_import is not None:
+            return
+
+        original = self._original_import = builtins.__import__
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            full_name = name
+            if level and globals:
+                # Import relativo: mostrar el nombre completo del módulo
+                package = globals.get("__package__") or ""
+                base = package.rsplit(".", level - 1)[0] if level > 1 else package
+                full_name = f"{base}.{name}" if name else base
+
+            if full_name in sys.modules and not fromlist:
+                return original(name, globals, locals, fromlist, level)
+
+            entry = [full_name, 0.0, self._import_depth]
+            cargados = len(sys.modules)
+            self._import_depth += 1
+            inicio = time.perf_counter()
+            try:
+                return original(name, globals, locals, fromlist, level)
+            finally:
+                entry[1] = time.perf_counter() - inicio
+                self._import_depth -= 1
+                if len(sys.modules) > cargados:
+                    self.imports.append(entry)
+
+        builtins.__import__ = timed_import
+
+    def disable_import_timing(self):
+        """Restaura el mecanismo de importación original"""
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def total(self):
+        """Segundos transcurridos desde que se creó el medidor"""
+        return time.perf_counter() - self.start
+
+    def report(self, min_import_ms=5.0):
+        """
+        Imprime el desglose de tiempos del arranque
+
+        Args:
+            min_import_ms: Si se midieron importaciones, solo se listan las que
+                tardaron al menos estos milisegundos (acumulados)
+        """
+        total = self.total()
+        if self.imports:
+            self.disable_import_timing()
+            print("Importaciones (acumulado, incluye dependencias):")
+            # Se listan en orden de finalización, como -X importtime
+            for name, seconds, depth in self.imports:
+                if seconds * 1000 >= min_import_ms:
+                    label = "  " * depth + name
+                    print(f"  {label:<40} {seconds * 1000:8.1f} ms")
+
+        print("Tiempos de arranque:")
+        for name, seconds, depth in self.steps:
+            label = "  " * depth + name
+            print(f"  {label:<40} {seconds * 1000:8.1f} ms")
+        print(f"  {'Total':<40} {total * 1000:8.1f} ms")
+
+
+# Medidor compartido por main.py y los módulos que participan del arranque
+startup_timer = StartupTimer()
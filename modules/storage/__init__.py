@@ -0,0 +1,35 @@
+"""
+Backends de almacenamiento para DataManager.
+El backend "excel" trabaja directamente sobre registros.xlsx y el
+backend "sqlite" usa una base local, manteniendo el Excel como
+formato de importación/exportación.
+"""
+
+from pathlib import Path
+
+from .base import StorageBackend
+from .excel_backend import ExcelBackend
+from .sqlite_backend import SQLiteBackend
+from .records import Obra, InformeTecnico, record_class_for
+
+
+def create_backend(name, excel_file):
+    """
+    Crea el backend de almacenamiento indicado
+
+    Args:
+        name: "excel" o "sqlite"
+        excel_file: Ruta de registros.xlsx
+
+    Returns:
+        StorageBackend: Instancia del backend
+    """
+    if name == "sqlite":
+        return SQLiteBackend(Path(excel_file).with_suffix(".db"), excel_file)
+    return ExcelBackend(excel_file)
+
+
+__all__ = [
+    'StorageBackend', 'ExcelBackend', 'SQLiteBackend', 'create_backend',
+    'Obra', 'InformeTecnico', 'record_class_for'
+]
@@ -0,0 +1,208 @@
+"""
+Definiciones comunes a todos los backends de almacenamiento.
+Expone las columnas de cada hoja (definidas en schema.py) y la
+interfaz que debe implementar cada backend.
+"""
+
+import re
+
+from .schema import OBRA_SCHEMA, INFORME_SCHEMA
+
+
+# Las definiciones de columnas se derivan del esquema central (schema.py)
+SHEET_OBRAS = OBRA_SCHEMA.sheet_name
+SHEET_INFORMES = INFORME_SCHEMA.sheet_name
+
+# Campos de cada hoja en el orden por defecto de las columnas
+OBRA_FIELDS = OBRA_SCHEMA.names
+INFORME_FIELDS = INFORME_SCHEMA.names
+
+OBRA_HEADERS = OBRA_SCHEMA.headers
+INFORME_HEADERS = INFORME_SCHEMA.headers
+
+# Campos monetarios (se guardan como número con formato de moneda)
+OBRA_CURRENCY_FIELDS = OBRA_SCHEMA.currency_fields
+INFORME_CURRENCY_FIELDS = INFORME_SCHEMA.currency_fields
+
+# Campos que se pueden modificar desde las ventanas de edición
+OBRA_UPDATABLE_FIELDS = OBRA_SCHEMA.updatable_fields
+INFORME_UPDATABLE_FIELDS = INFORME_SCHEMA.updatable_fields
+
+# Valores por defecto al agregar un registro
+OBRA_DEFAULTS = OBRA_SCHEMA.defaults
+INFORME_DEFAULTS = INFORME_SCHEMA.defaults
+
+CURRENCY_FORMAT = '"$"#,##0.00'
+
+
+def fields_for(work_type):
+    """Devuelve la tupla de campos según el tipo de trabajo ("obra" o "informe")"""
+    return OBRA_FIELDS if work_type == "obra" else INFORME_FIELDS
+
+
+def currency_fields_for(work_type):
+    """Devuelve los campos monetarios según el tipo de trabajo"""
+    return OBRA_CURRENCY_FIELDS if work_type == "obra" else INFORME_CURRENCY_FIELDS
+
+
+def updatable_fields_for(work_type):
+    """Devuelve los campos editables según el tipo de trabajo"""
+    return OBRA_UPDATABLE_FIELDS if work_type == "obra" else INFORME_UPDATABLE_FIELDS
+
+
+def defaults_for(work_type):
+    """Devuelve los valores por defecto según el tipo de trabajo"""
+    return OBRA_DEFAULTS if work_type == "obra" else INFORME_DEFAULTS
+
+
+def parse_currency(value):
+    """
+    Convierte un valor monetario a float
+
+    Args:
+        value: String con formato ("$ 12.000,50", "1500") o número
+
+    Returns:
+        float con el valor, "" si está vacío, o el valor original si no se pudo convertir
+    """
+    try:
+        # Si el valor está vacío o es None, no hay monto
+        if not value or value == "":
+            return ""
+
+        if isinstance(value, str):
+            # Remover todo excepto dígitos, punto y coma
+            clean_value = re.sub(r'[^\d.,]', '', value)
+
+            # Si tiene coma como decimal (formato argentino), convertir a punto
+            if ',' in clean_value and '.' not in clean_value:
+                clean_value = clean_value.replace(',', '.')
+            elif '.' in clean_value and ',' in clean_value:
+                # Formato 12.000,50 - el punto es separador de miles, coma es decimal
+                parts = clean_value.rsplit(',', 1)  # Dividir por la última coma
+                integer_part = parts[0].replace('.', '')  # Quitar puntos de miles
+                decimal_part = parts[1] if len(parts) > 1 else ''
+                clean_value = f"{integer_part}.{decimal_part}"
+
+            if not clean_value:
+                return ""
+            return float(clean_value)
+
+        # Si ya es número, usarlo tal como viene
+        return float(value)
+    except Exception as e:
+        print(f"Error al aplicar formato de moneda: {e}")
+        print(f"Valor problemático: {value} (tipo: {type(value)})")
+        # En caso de error, guardar el valor original
+        return value
+
+
+def prepare_record(work_type, data):
+    """
+    Construye el registro completo tal como queda guardado al agregarlo
+
+    Args:
+        work_type: "obra" o "informe"
+        data: Diccionario con los datos del formulario
+
+    Returns:
+        dict: Todos los campos de la hoja, con valores por defecto y montos convertidos
+    """
+    defaults = defaults_for(work_type)
+    currency_fields = currency_fields_for(work_type)
+    record = {}
+    for field in fields_for(work_type):
+        value = data.get(field, defaults.get(field, ""))
+        record[field] = parse_currency(value) if field in currency_fields else value
+    return record
+
+
+def prepare_update(work_type, data):
+    """
+    Filtra y convierte los cambios de una actualización tal como quedan guardados
+
+    Args:
+        work_type: "obra" o "informe"
+        data: Diccionario con los campos a actualizar
+
+    Returns:
+        dict: Solo los campos editables, con los montos convertidos
+    """
+    updatable = updatable_fields_for(work_type)
+    currency_fields = currency_fields_for(work_type)
+    changes = {}
+    for field, value in data.items():
+        if field in updatable:
+            changes[field] = parse_currency(value) if field in currency_fields else value
+    return changes
+
+
+class StorageBackend:
+    """
+    Interfaz de un backend de almacenamiento para DataManager.
+
+    Los registros se representan como Obra / InformeTecnico (ver
+    records.py), con "id" (identificador estable, columna ID del Excel)
+    más los campos de la hoja. El "id" no depende de la posición de la
+    fila, así que sigue siendo válido si se ordenan o borran filas.
+    """
+
+    name = "base"
+
+    def signature(self):
+        """Devuelve un valor que cambia cada vez que cambian los datos almacenados"""
+        raise NotImplementedError
+
+    def load_all(self, min_ids=None):
+        """
+        Carga todos los registros
+
+        Args:
+            min_ids: {work_type: ID} opcional; si el backend tiene que asignar
+                IDs a registros que no lo tienen, quedan por encima de estos
+
+        Returns:
+            tuple: (lista de obras, lista de informes)
+        """
+        raise NotImplementedError
+
+    def append(self, work_type, data):
+        """
+        Agrega un registro (data["id"] trae el ID asignado por DataManager)
+
+        Returns:
+            int: ID del nuevo registro, o -1 en caso de error
+        """
+        raise NotImplementedError
+
+    def update(self, work_type, row_id, data):
+        """
+        Actualiza los campos editables de un registro
+
+        Returns:
+            bool: True si se actualizó correctamente
+        """
+        raise NotImplementedError
+
+    def apply_batch(self, appends, updates):
+        """
+        Aplica un lote de cambios de una sola vez
+
+        Args:
+            appends: Lista de (work_type, data) a agregar, en orden
+            updates: Diccionario {(work_type, row_id): data} con los cambios a aplicar
+
+        Returns:
+            bool: True si todos los cambios se guardaron correctamente
+        """
+        # Implementación genérica: una operación por cambio
+        ok = True
+        for work_type, data in appends:
+            ok = self.append(work_type, data) != -1 and ok
+        for (work_type, row_id), data in updates.items():
+            ok = self.update(work_type, row_id, data) and ok
+        return ok
+
+    def close(self):
+        """Libera recursos y sincroniza los datos pendientes"""
+        pass
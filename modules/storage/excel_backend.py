@@ -0,0 +1,553 @@
+import os
+import openpyxl
+from openpyxl.styles import Font
+from pathlib import Path
+
+from .base import (
+    StorageBackend, SHEET_OBRAS, SHEET_INFORMES, OBRA_HEADERS, INFORME_HEADERS,
+    CURRENCY_FORMAT, parse_currency
+)
+from .schema import CURRENCY, schema_for, parse_id
+from .records import record_class_for
+from .snapshot import load_snapshot, save_snapshot, snapshot_rows
+from .xlsx_reader import XlsxReader
+from .xlsx_patch import patch_workbook
+
+
+def apply_currency_format(cell, value):
+    """
+    Aplica formato de moneda a una celda y establece el valor
+
+    Args:
+        cell: La celda de openpyxl
+        value: El valor a establecer (puede ser string con formato o número)
+    """
+    numeric_value = parse_currency(value)
+    cell.value = numeric_value
+
+    # Aplicar formato de moneda argentino solo si se pudo convertir
+    if isinstance(numeric_value, float):
+        cell.number_format = CURRENCY_FORMAT
+
+
+def sheet_name_for(work_type):
+    """Devuelve el nombre de la hoja según el tipo de trabajo"""
+    return SHEET_OBRAS if work_type == "obra" else SHEET_INFORMES
+
+
+def headers_for(work_type):
+    """Devuelve los encabezados de la hoja según el tipo de trabajo"""
+    return OBRA_HEADERS if work_type == "obra" else INFORME_HEADERS
+
+
+def create_sheet(workbook, work_type):
+    """Crea la hoja del tipo de trabajo con sus encabezados"""
+    sheet = workbook.create_sheet(sheet_name_for(work_type))
+    for idx, header in enumerate(headers_for(work_type), 1):
+        cell = sheet.cell(row=1, column=idx, value=header)
+        cell.font = Font(bold=True)
+    return sheet
+
+
+def get_or_create_sheet(workbook, work_type):
+    """Obtiene la hoja del tipo de trabajo, creándola con encabezados si no existe"""
+    hoja = sheet_name_for(work_type)
+    if hoja in workbook.sheetnames:
+        return workbook[hoja]
+
+    print(f"Creando hoja '{hoja}'")
+    return create_sheet(workbook, work_type)
+
+
+def sheet_columns(sheet, work_type, add_missing=True):
+    """
+    Ubica las columnas de cada campo según los encabezados de la hoja
+
+    Args:
+        sheet: Hoja de openpyxl (modo normal)
+        work_type: "obra" o "informe"
+        add_missing: Si es True agrega al final los encabezados que falten
+
+    Returns:
+        dict: {nombre del campo: columna 1-based}, incluida la columna ID ("id")
+    """
+    schema = schema_for(work_type)
+    header_row = [cell.value for cell in sheet[1]]
+    columns = schema.locate_columns(header_row)
+
+    if add_missing and all(value in (None, "") for value in header_row):
+        # Hoja sin encabezados: escribirlos en las posiciones por defecto
+        for field in schema.columns:
+            cell = sheet.cell(row=1, column=field.column, value=field.header)
+            cell.font = Font(bold=True)
+        return columns
+
+    if add_missing:
+        next_column = max([len(header_row)] + list(columns.values())) + 1
+        for field in schema.columns:
+            if field.name in columns:
+                continue
+            cell = sheet.cell(row=1, column=next_column, value=field.header)
+            cell.font = Font(bold=True)
+            print(f"Agregada columna '{field.header}' en '{sheet.title}'")
+            columns[field.name] = next_column
+            next_column += 1
+
+    return columns
+
+
+def write_row(sheet, row, work_type, data, only_updatable=False, columns=None):
+    """
+    Escribe los campos de un registro en una fila de la hoja
+
+    Args:
+        sheet: Hoja de openpyxl
+        row: Número de fila (1-based)
+        work_type: "obra" o "informe"
+        data: Diccionario con los valores a escribir
+        only_updatable: Si es True solo se escriben los campos editables presentes en data
+        columns: Columnas de cada campo (ver sheet_columns); se calculan si no se indican
+    """
+    schema = schema_for(work_type)
+    if columns is None:
+        columns = sheet_columns(sheet, work_type)
+
+    for field in schema.fields:
+        name = field.name
+        if only_updatable:
+            if name not in data or name not in schema.updatable_fields:
+                continue
+            value = data[name]
+        else:
+            value = data.get(name, schema.defaults.get(name, ""))
+
+        cell = sheet.cell(row=row, column=columns[name])
+        if field.kind == CURRENCY:
+            apply_currency_format(cell, value)
+        else:
+            cell.value = value
+
+    # El ID se escribe solo al crear la fila: no cambia nunca
+    if not only_updatable and data.get("id") is not None and "id" in columns:
+        sheet.cell(row=row, column=columns["id"], value=data["id"])
+
+
+def delete_rows(sheet, rows):
+    """
+    Elimina filas de una hoja (las consecutivas juntas, de abajo hacia arriba)
+
+    Returns:
+        int: Cantidad de filas eliminadas
+    """
+    filas = sorted(set(rows), reverse=True)
+    index = 0
+    while index < len(filas):
+        fin = index
+        while fin + 1 < len(filas) and filas[fin + 1] == filas[fin] - 1:
+            fin += 1
+        sheet.delete_rows(filas[fin], fin - index + 1)
+        index = fin + 1
+    return len(filas)
+
+
+def read_ids(sheet, columns):
+    """
+    Lee la columna ID de una hoja (modo normal)
+
+    Returns:
+        dict: {id: fila} de las filas con un ID válido (el primero si se repite)
+    """
+    rows = {}
+    if "id" not in columns:
+        return rows
+    column = columns["id"]
+    for row, (value,) in enumerate(
+        sheet.iter_rows(min_row=2, min_col=column, max_col=column, values_only=True), 2
+    ):
+        row_id = parse_id(value)
+        if row_id is not None and row_id not in rows:
+            rows[row_id] = row
+    return rows
+
+
+def assign_missing_ids(sheet, work_type, columns=None, min_id=0):
+    """
+    Completa la columna ID de las filas sin un ID válido (o con uno repetido)
+
+    A cada fila se le asigna su posición (fila - 1), que era el ID que
+    usaba la aplicación antes de existir la columna, salvo que ya esté
+    usado o no supere min_id; en ese caso recibe el siguiente ID libre.
+
+    Args:
+        sheet: Hoja de openpyxl (modo normal)
+        work_type: "obra" o "informe"
+        columns: Columnas de la hoja (ver sheet_columns); se calculan si no se indican
+        min_id: Ningún ID asignado queda en este valor o por debajo (por
+            ejemplo, el ID más alto de los años archivados)
+
+    Returns:
+        int: Cantidad de filas a las que se les asignó un ID
+    """
+    if columns is None:
+        columns = sheet_columns(sheet, work_type)
+    column = columns["id"]
+
+    ids = read_ids(sheet, columns)
+    usados = set(ids)
+    filas_con_id = set(ids.values())
+
+    asignados = 0
+    for row in range(2, sheet.max_row + 1):
+        if row in filas_con_id:
+            continue
+        row_id = row - 1
+        if row_id in usados or row_id <= min_id:
+            row_id = max(max(usados, default=0), min_id) + 1
+        usados.add(row_id)
+        sheet.cell(row=row, column=column, value=row_id)
+        asignados += 1
+
+    if asignados:
+        print(f"Asignados {asignados} IDs en '{sheet.title}'")
+    return asignados
+
+
+def ids_are_valid(records):
+    """Indica si todos los registros tienen un ID válido y sin repetir"""
+    ids = [record["id"] for record in records]
+    return None not in ids and len(set(ids)) == len(ids)
+
+
+def iter_records(sheet, work_type):
+    """
+    Recorre una hoja en modo streaming devolviendo un registro por fila
+
+    Usa iter_rows(values_only=True), que en un libro abierto con
+    read_only=True lee la hoja fila por fila sin materializar las celdas.
+    Las columnas se ubican por los encabezados de la primera fila.
+
+    Args:
+        sheet: Hoja de openpyxl (preferentemente de solo lectura)
+        work_type: "obra" o "informe"
+
+    Yields:
+        Obra o InformeTecnico: Registro con "id" (columna ID) y los campos de la hoja
+    """
+    rows = sheet.iter_rows(values_only=True)
+    header_row = next(rows, ())
+    return records_from_rows(header_row, rows, work_type)
+
+
+def records_from_rows(header_row, rows, work_type):
+    """
+    Convierte filas de valores (sin la de encabezados) en registros
+
+    Permite revisar la fila de encabezados antes de decidir leer el
+    resto de la hoja con el mismo recorrido.
+
+    Args:
+        header_row: Valores de la fila de encabezados
+        rows: Iterable con los valores de las filas de datos, desde la fila 2
+        work_type: "obra" o "informe"
+
+    Yields:
+        Obra o InformeTecnico: Registro con "id" (columna ID, None si falta) y los campos de la hoja
+    """
+    convert, _ = schema_for(work_type).row_converter(header_row, record_class_for(work_type))
+
+    for values in rows:
+        yield convert(values)
+
+
+def read_records(workbook):
+    """
+    Lee los registros de ambas hojas de un libro abierto para lectura
+
+    Returns:
+        tuple: (obras, informes); una hoja que falta se lee como vacía
+    """
+    obras = []
+    if SHEET_OBRAS in workbook.sheetnames:
+        obras = list(iter_records(workbook[SHEET_OBRAS], "obra"))
+
+    informes = []
+    if SHEET_INFORMES in workbook.sheetnames:
+        informes = list(iter_records(workbook[SHEET_INFORMES], "informe"))
+    return obras, informes
+
+
+def open_for_reading(excel_file):
+    """Abre el Excel en modo de solo lectura (streaming)"""
+    return openpyxl.load_workbook(str(excel_file), read_only=True)
+
+
+def read_workbook(excel_file, read):
+    """
+    Lee el Excel llamando a read(libro) con el lector rápido (xlsx_reader.py)
+
+    El libro que recibe read() ofrece sheetnames, libro[hoja] e
+    iter_rows(values_only=True). Si el lector rápido no puede con el
+    archivo, se vuelve a leer con openpyxl en modo de solo lectura.
+
+    Returns:
+        Lo que devuelva read()
+    """
+    try:
+        workbook = XlsxReader(excel_file)
+    except Exception as e:
+        print(f"Lector rápido no disponible para el Excel ({e}), se usa openpyxl")
+    else:
+        try:
+            return read(workbook)
+        except Exception as e:
+            print(f"Lector rápido no disponible para el Excel ({e}), se usa openpyxl")
+        finally:
+            workbook.close()
+
+    workbook = open_for_reading(excel_file)
+    try:
+        return read(workbook)
+    finally:
+        # En modo solo lectura el archivo queda abierto hasta cerrar el libro
+        workbook.close()
+
+
+class ExcelBackend(StorageBackend):
+    """Backend que guarda los registros directamente en registros.xlsx"""
+
+    name = "excel"
+
+    def __init__(self, excel_file):
+        self.excel_file = Path(excel_file)
+
+    def signature(self):
+        """Devuelve (mtime, tamaño) del Excel para detectar cambios externos"""
+        try:
+            stat = os.stat(self.excel_file)
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
+
+    def load_all(self, min_ids=None):
+        """
+        Carga ambas hojas con detalles completos en una sola lectura (streaming) del Excel
+
+        Si la instantánea (snapshot.py) corresponde al Excel actual se usa
+        en lugar de leer el libro; si no, se lee el libro y se renueva.
+
+        Args:
+            min_ids: {work_type: ID} opcional; los IDs que haya que asignar
+                quedan por encima (ver assign_missing_ids)
+        """
+        try:
+            registros = load_snapshot(self.excel_file)
+            if registros is not None:
+                return registros
+
+            obras, informes = self._read_records()
+            if not (ids_are_valid(obras) and ids_are_valid(informes)):
+                # Filas sin ID (por ejemplo, agregadas a mano en el Excel): asignarlos y volver a leer
+                self.assign_ids(min_ids)
+                obras, informes = self._read_records()
+            save_snapshot(self.excel_file, snapshot_rows(obras), snapshot_rows(informes))
+            return obras, informes
+        except Exception as e:
+            print(f"Error al cargar registros: {e}")
+            return [], []
+
+    def _read_records(self):
+        return read_workbook(self.excel_file, read_records)
+
+    def assign_ids(self, min_ids=None):
+        """Agrega la columna ID si falta y completa los IDs de las filas que no lo tengan"""
+        min_ids = min_ids or {}
+        workbook = openpyxl.load_workbook(str(self.excel_file))
+        for work_type in ("obra", "informe"):
+            hoja = sheet_name_for(work_type)
+            if hoja in workbook.sheetnames:
+                assign_missing_ids(workbook[hoja], work_type, min_id=min_ids.get(work_type, 0))
+        workbook.save(str(self.excel_file))
+
+    def append(self, work_type, data):
+        """Agrega un registro al final de la hoja correspondiente"""
+        try:
+            workbook = openpyxl.load_workbook(str(self.excel_file))
+            sheet = get_or_create_sheet(workbook, work_type)
+            columns = sheet_columns(sheet, work_type)
+
+            if data.get("id") is None:
+                data = dict(data, id=max(read_ids(sheet, columns), default=0) + 1)
+
+            # Encontrar la próxima fila vacía
+            next_row = sheet.max_row + 1
+            write_row(sheet, next_row, work_type, data, columns=columns)
+
+            workbook.save(str(self.excel_file))
+            tipo = "Obra agregada" if work_type == "obra" else "Informe agregado"
+            print(f"{tipo} en fila {next_row}")
+            return data["id"]
+        except Exception as e:
+            print(f"Error al agregar {work_type}: {e}")
+            return -1  # Retorna -1 en caso de error
+
+    def update(self, work_type, row_id, data):
+        """Actualiza los campos editables de un registro existente"""
+        try:
+            workbook = openpyxl.load_workbook(str(self.excel_file))
+
+            hoja = sheet_name_for(work_type)
+            if hoja not in workbook.sheetnames:
+                print(f"Hoja '{hoja}' no encontrada")
+                return False
+
+            sheet = workbook[hoja]
+            columns = sheet_columns(sheet, work_type)
+
+            # La fila se busca por la columna ID (no depende del orden de las filas)
+            row = read_ids(sheet, columns).get(row_id)
+            if row is None:
+                return False
+
+            write_row(sheet, row, work_type, data, only_updatable=True, columns=columns)
+
+            workbook.save(str(self.excel_file))
+            tipo = "Obra actualizada" if work_type == "obra" else "Informe actualizado"
+            print(f"{tipo} en fila {row}")
+            return True
+        except Exception as e:
+            print(f"Error al actualizar {work_type}: {e}")
+            return False
+
+    def apply_batch(self, appends, updates):
+        """
+        Aplica todos los cambios del lote con un solo guardado del Excel
+
+        Primero intenta modificar solo el XML de las hojas (xlsx_patch.py);
+        si el lote necesita cambios de estructura, lo guarda con openpyxl.
+        Las altas cuyo ID ya existe en la hoja se omiten, así que volver a
+        aplicar un lote ya guardado no duplica registros.
+        """
+        try:
+            agregados = patch_workbook(self.excel_file, appends, updates)
+            print(f"Excel guardado: {agregados} registros agregados y {len(updates)} actualizados")
+            return True
+        except Exception as e:
+            print(f"Guardado rápido no disponible ({e}), se guarda con openpyxl")
+        return self._apply_batch_openpyxl(appends, updates)
+
+    def _apply_batch_openpyxl(self, appends, updates):
+        """Aplica el lote cargando el libro completo con openpyxl y guardándolo"""
+        try:
+            workbook = openpyxl.load_workbook(str(self.excel_file))
+
+            # Ubicar las columnas y las filas de cada ID una sola vez para todo el lote
+            sheets = {}
+            agregados = 0
+            for work_type in {key[0] for key in updates} | {wt for wt, _ in appends}:
+                sheet = get_or_create_sheet(workbook, work_type)
+                columns = sheet_columns(sheet, work_type)
+                sheets[work_type] = (sheet, columns, read_ids(sheet, columns))
+
+            for work_type, data in appends:
+                sheet, columns, rows = sheets[work_type]
+                if data.get("id") is None:
+                    data = dict(data, id=max(rows, default=0) + 1)
+                elif data["id"] in rows:
+                    # Ya guardado (por ejemplo, un alta recuperada del diario)
+                    continue
+                row = sheet.max_row + 1
+                write_row(sheet, row, work_type, data, columns=columns)
+                rows[data["id"]] = row
+                agregados += 1
+
+            for (work_type, row_id), data in updates.items():
+                sheet, columns, rows = sheets[work_type]
+                row = rows.get(row_id)
+                if row is None:
+                    # Reintentar no serviría: se informa y se sigue con el resto
+                    print(f"ID {row_id} no encontrado en '{sheet.title}'")
+                    continue
+                write_row(sheet, row, work_type, data, only_updatable=True, columns=columns)
+
+            workbook.save(str(self.excel_file))
+            print(f"Excel guardado: {agregados} registros agregados y {len(updates)} actualizados")
+            return True
+        except Exception as e:
+            print(f"Error al guardar cambios en Excel: {e}")
+            return False
+
+    def remove(self, ids):
+        """
+        Elimina las filas de los registros indicados (por ejemplo, al archivarlos)
+
+        Args:
+            ids: Diccionario {work_type: conjunto de IDs a eliminar}
+
+        Returns:
+            int: Cantidad de filas eliminadas
+        """
+        workbook = openpyxl.load_workbook(str(self.excel_file))
+        eliminadas = 0
+        for work_type, row_ids in ids.items():
+            sheet = get_or_create_sheet(workbook, work_type)
+            rows = read_ids(sheet, sheet_columns(sheet, work_type))
+            eliminadas += delete_rows(sheet, [rows[row_id] for row_id in row_ids if row_id in rows])
+
+        workbook.save(str(self.excel_file))
+        return eliminadas
+
+    def replace_sheets(self, obras, informes):
+        """
+        Reemplaza el contenido de las dos hojas de registros (exportación)
+
+        A diferencia de save_all, conserva el resto del libro: las otras
+        hojas, los encabezados y el formato de las celdas de las filas que
+        siguen existiendo (cada registro se escribe en la fila de su ID).
+        Las filas cuyo ID ya no está se eliminan y los registros nuevos se
+        agregan al final.
+        """
+        if not self.excel_file.exists():
+            self.save_all(obras, informes)
+            return
+
+        workbook = openpyxl.load_workbook(str(self.excel_file))
+        for work_type, works in (("obra", obras), ("informe", informes)):
+            sheet = get_or_create_sheet(workbook, work_type)
+            columns = sheet_columns(sheet, work_type)
+            rows = read_ids(sheet, columns)
+
+            conservadas = set()
+            nuevos = []
+            for work in works:
+                row = rows.get(work["id"])
+                if row is None:
+                    nuevos.append(work)
+                    continue
+                write_row(sheet, row, work_type, work, columns=columns)
+                conservadas.add(row)
+
+            delete_rows(sheet, [row for row in range(2, sheet.max_row + 1) if row not in conservadas])
+            for work in nuevos:
+                write_row(sheet, sheet.max_row + 1, work_type, work, columns=columns)
+
+        # Archivo temporal + reemplazo: un error a mitad de camino no deja el libro cortado
+        temp_path = self.excel_file.with_name(self.excel_file.name + ".tmp")
+        try:
+            workbook.save(str(temp_path))
+            os.replace(temp_path, self.excel_file)
+        finally:
+            if temp_path.exists():
+                os.remove(temp_path)
+
+    def save_all(self, obras, informes):
+        """Reescribe ambas hojas completas con los registros dados (libro nuevo)"""
+        workbook = openpyxl.Workbook()
+        workbook.remove(workbook.active)
+
+        for work_type, works in (("obra", obras), ("informe", informes)):
+            sheet = create_sheet(workbook, work_type)
+            columns = sheet_columns(sheet, work_type)
+            for row, work in enumerate(works, 2):
+                write_row(sheet, row, work_type, work, columns=columns)
+
+        workbook.save(str(self.excel_file))
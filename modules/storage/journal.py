@@ -0,0 +1,90 @@
+"""
+Diario de cambios pendientes (registros.journal.jsonl).
+Cada alta o modificación se agrega como una línea JSON y se fuerza a
+disco antes de devolver el control, de modo que un cambio no se pierde
+aunque la aplicación se cierre antes de guardarse en el Excel. Cuando
+los cambios se guardan en el backend, el diario se compacta dejando
+solo lo que sigue pendiente.
+"""
+
+import os
+import json
+import threading
+from pathlib import Path
+
+
+def journal_path_for(excel_file):
+    """Ruta del diario que acompaña a un archivo de registros"""
+    return Path(excel_file).with_suffix(".journal.jsonl")
+
+
+class Journal:
+    """Archivo JSONL de solo agregado con los cambios aún no guardados"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def append(self, entry):
+        """
+        Agrega un cambio al diario y lo fuerza a disco
+
+        Args:
+            entry: {"op": "add", "work_type", "data"} o
+                   {"op": "update", "work_type", "id", "data"}
+        """
+        self.extend([entry])
+
+    def extend(self, entries):
+        """Agrega varios cambios al diario con una sola escritura a disco"""
+        if not entries:
+            return
+        lines = "".join(json.dumps(entry, ensure_ascii=False, default=str) + "\n" for entry in entries)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as journal_file:
+                journal_file.write(lines)
+                journal_file.flush()
+                os.fsync(journal_file.fileno())
+
+    def entries(self):
+        """
+        Lee los cambios del diario en orden
+
+        Una última línea incompleta (corte durante la escritura) se descarta.
+
+        Returns:
+            list: Cambios registrados (vacía si no hay diario)
+        """
+        with self._lock:
+            if not self.path.exists():
+                return []
+            entries = []
+            with open(self.path, encoding="utf-8") as journal_file:
+                for number, line in enumerate(journal_file, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        print(f"Línea {number} del diario ilegible, se omite")
+            return entries
+
+    def rewrite(self, entries):
+        """
+        Reemplaza el diario por los cambios indicados (compactación)
+
+        Se escribe un archivo temporal y se reemplaza el diario de una vez,
+        así que un corte a mitad de camino deja el diario anterior intacto.
+        """
+        with self._lock:
+            if not entries:
+                if self.path.exists():
+                    os.remove(self.path)
+                return
+            temp_path = self.path.with_name(self.path.name + ".tmp")
+            with open(temp_path, "w", encoding="utf-8") as journal_file:
+                for entry in entries:
+                    journal_file.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+                journal_file.flush()
+                os.fsync(journal_file.fileno())
+            os.replace(temp_path, self.path)
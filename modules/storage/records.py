@@ -0,0 +1,129 @@
+"""
+Registros compactos para obras e informes técnicos.
+Usan __slots__ en lugar de un diccionario por fila, lo que reduce
+bastante la memoria con registros grandes, y ofrecen la misma
+interfaz de lectura que un dict para el código existente de la GUI.
+"""
+
+from .base import OBRA_FIELDS, INFORME_FIELDS
+
+
+class Record:
+    """
+    Registro con un atributo por campo de la hoja más "id".
+
+    Se comporta como un diccionario de solo esas claves:
+    record["campo"], record.get("campo"), "campo" in record, dict(record),
+    keys()/values()/items() y update(). copy() devuelve un dict común,
+    que sí admite claves adicionales.
+    """
+
+    __slots__ = ()
+    fields = ()
+    _keyset = frozenset(("id",))
+
+    def __init__(self, id=None, **values):
+        self.id = id
+        for name in self.fields:
+            setattr(self, name, values.get(name))
+
+    @classmethod
+    def from_values(cls, row_id, values):
+        """Crea un registro a partir de los valores en el orden de los campos"""
+        record = cls.__new__(cls)
+        record.id = row_id
+        for name, value in zip(cls.fields, values):
+            setattr(record, name, value)
+        return record
+
+    @classmethod
+    def from_dict(cls, data):
+        """Crea un registro a partir de un diccionario (las claves desconocidas se ignoran)"""
+        record = cls.__new__(cls)
+        record.id = data.get("id")
+        for name in cls.fields:
+            setattr(record, name, data.get(name))
+        return record
+
+    # Interfaz de diccionario
+
+    def keys(self):
+        return ("id",) + self.fields
+
+    def values(self):
+        return [getattr(self, name) for name in self.keys()]
+
+    def items(self):
+        return [(name, getattr(self, name)) for name in self.keys()]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.fields) + 1
+
+    def __contains__(self, key):
+        return key in self._keyset
+
+    def __getitem__(self, key):
+        if key in self:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key not in self:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def get(self, key, default=None):
+        if key in self:
+            return getattr(self, key)
+        return default
+
+    def update(self, other=(), **values):
+        """Actualiza campos como dict.update (solo claves del registro)"""
+        if hasattr(other, "keys"):
+            other = [(key, other[key]) for key in other.keys()]
+        for key, value in list(other) + list(values.items()):
+            self[key] = value
+
+    def copy(self):
+        """Copia como dict común (editable y con claves libres)"""
+        return dict(self.items())
+
+    to_dict = copy
+
+    def clone(self):
+        """Copia como registro del mismo tipo"""
+        return self.from_values(self.id, [getattr(self, name) for name in self.fields])
+
+    def __eq__(self, other):
+        if isinstance(other, (Record, dict)):
+            return self.copy() == dict(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.copy()!r})"
+
+
+class Obra(Record):
+    """Registro de la hoja "Obras en general" """
+
+    __slots__ = ("id",) + OBRA_FIELDS
+    fields = OBRA_FIELDS
+    _keyset = frozenset(__slots__)
+
+
+class InformeTecnico(Record):
+    """Registro de la hoja "Informes técnicos" """
+
+    __slots__ = ("id",) + INFORME_FIELDS
+    fields = INFORME_FIELDS
+    _keyset = frozenset(__slots__)
+
+
+def record_class_for(work_type):
+    """Devuelve la clase de registro según el tipo de trabajo ("obra" o "informe")"""
+    return Obra if work_type == "obra" else InformeTecnico
@@ -0,0 +1,257 @@
+"""
+Esquema de columnas de las hojas del Excel.
+Describe cada campo (nombre, encabezado, posición y tipo) y genera
+conversores precompilados fila -> registro. Las columnas se ubican por
+el texto del encabezado, de modo que una hoja con las columnas en otro
+orden se sigue leyendo y escribiendo correctamente.
+"""
+
+import unicodedata
+from operator import itemgetter
+
+
+# Tipos de campo
+TEXT = "text"
+DATE = "date"
+NUMBER = "number"
+CURRENCY = "currency"
+
+# Columna con el identificador estable de cada registro (va después de los campos)
+ID_HEADER = "ID"
+
+
+def _header_key(value):
+    """Normaliza un encabezado para compararlo (minúsculas, sin acentos ni espacios extra)"""
+    if value is None:
+        return ""
+    text = unicodedata.normalize("NFKD", str(value))
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(text.lower().split())
+
+
+def parse_id(value):
+    """
+    Convierte el valor de la columna ID a entero
+
+    Returns:
+        int positivo, o None si la celda está vacía o no es un ID válido
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    elif isinstance(value, str) and value.strip().isdigit():
+        value = int(value.strip())
+    if isinstance(value, int) and value > 0:
+        return value
+    return None
+
+
+class Field:
+    """Un campo de la hoja: nombre interno, encabezado, columna por defecto (1-based) y tipo"""
+
+    __slots__ = ("name", "header", "column", "kind")
+
+    def __init__(self, name, header, column, kind=TEXT):
+        self.name = name
+        self.header = header
+        self.column = column
+        self.kind = kind
+
+    def __repr__(self):
+        return f"Field({self.name!r}, column={self.column})"
+
+
+# Posición de relleno que leen los campos que faltan en la hoja
+_PADDING_SLOT = (None,)
+
+
+class SheetSchema:
+    """
+    Esquema de una hoja: campos en el orden por defecto de las columnas,
+    campos editables y valores por defecto al agregar registros.
+    """
+
+    def __init__(self, work_type, sheet_name, fields, updatable=(), defaults=None):
+        """
+        Args:
+            work_type: "obra" o "informe"
+            sheet_name: Nombre de la hoja en el Excel
+            fields: Lista de (nombre, encabezado, tipo) en el orden de las columnas
+            updatable: Campos que se pueden modificar desde las ventanas de edición
+            defaults: Valores por defecto al agregar un registro
+        """
+        self.work_type = work_type
+        self.sheet_name = sheet_name
+        self.fields = tuple(
+            Field(name, header, column, kind)
+            for column, (name, header, kind) in enumerate(fields, 1)
+        )
+        # El ID no es un campo del registro (es su "id"), pero tiene su propia columna
+        self.id_field = Field("id", ID_HEADER, len(self.fields) + 1, NUMBER)
+        self.columns = self.fields + (self.id_field,)
+        self.names = tuple(field.name for field in self.fields)
+        self.headers = [field.header for field in self.columns]
+        self.currency_fields = tuple(f.name for f in self.fields if f.kind == CURRENCY)
+        self.updatable_fields = self.currency_fields + tuple(
+            name for name in updatable if name not in self.currency_fields
+        )
+        self.defaults = dict(defaults or {})
+        self._by_header = {_header_key(f.header): f for f in self.columns}
+
+    def __len__(self):
+        return len(self.fields)
+
+    def locate_columns(self, header_row):
+        """
+        Ubica cada campo en la hoja a partir de la fila de encabezados
+
+        Args:
+            header_row: Valores de la fila 1 (None o vacía para usar las posiciones por defecto)
+
+        Returns:
+            dict: {nombre del campo: columna 1-based}, incluida la del "id";
+            los campos sin encabezado no aparecen
+        """
+        keys = [_header_key(value) for value in (header_row or ())]
+        if not any(key in self._by_header for key in keys):
+            # Hoja sin encabezados reconocibles: posiciones por defecto
+            return {field.name: field.column for field in self.columns}
+
+        columns = {}
+        for column, key in enumerate(keys, 1):
+            field = self._by_header.get(key)
+            if field is not None and field.name not in columns:
+                columns[field.name] = column
+        return columns
+
+    def missing_fields(self, header_row):
+        """Devuelve los campos (incluida la columna ID) cuyo encabezado no está en la hoja"""
+        columns = self.locate_columns(header_row)
+        return [field for field in self.columns if field.name not in columns]
+
+    def row_converter(self, header_row=None, record_class=None):
+        """
+        Genera un conversor fila -> registro para una hoja
+
+        La ubicación de las columnas se resuelve una sola vez; convertir
+        cada fila es una sola llamada a itemgetter. El "id" se toma de la
+        columna ID (None si la fila no tiene un ID válido).
+
+        Args:
+            header_row: Valores de la fila de encabezados de la hoja
+            record_class: Clase de registro a crear (con from_values); None para dicts
+
+        Returns:
+            tuple: (función convert(values) -> registro, cantidad de columnas a leer)
+        """
+        columns = self.locate_columns(header_row)
+        width = max(columns.values(), default=0)
+
+        # Los campos que faltan en la hoja leen una posición de relleno (None),
+        # la columna width + 1: las filas se cortan en width y se completan,
+        # así que esa posición nunca toma el valor de una columna extra de la hoja
+        indices = [
+            columns[name] - 1 if name in columns else width
+            for name in self.names
+        ]
+        id_index = columns["id"] - 1 if "id" in columns else width
+        getter = itemgetter(*indices)
+        names = self.names
+        padding = (None,) * (width + 1)
+
+        if record_class is not None:
+            from_values = record_class.from_values
+
+            def convert(values):
+                if len(values) > width:
+                    values = tuple(values[:width]) + _PADDING_SLOT
+                else:
+                    values = tuple(values) + padding[:width + 1 - len(values)]
+                return from_values(parse_id(values[id_index]), getter(values))
+        else:
+            def convert(values):
+                if len(values) > width:
+                    values = tuple(values[:width]) + _PADDING_SLOT
+                else:
+                    values = tuple(values) + padding[:width + 1 - len(values)]
+                record = {"id": parse_id(values[id_index])}
+                record.update(zip(names, getter(values)))
+                return record
+
+        return convert, width
+
+
+OBRA_SCHEMA = SheetSchema(
+    "obra", "Obras en general",
+    [
+        ("fecha", "Fecha", DATE),
+        ("profesion", "Profesión", TEXT),
+        ("formato", "Formato", TEXT),
+        ("nro_copias", "Nro de Copias", NUMBER),
+        ("tipo_trabajo", "Tipo de trabajo", TEXT),
+        ("nombre_profesional", "Nombre del Profesional", TEXT),
+        ("nombre_comitente", "Nombre del Comitente", TEXT),
+        ("ubicacion", "Ubicación", TEXT),
+        ("nro_expte_municipal", "Nro de expte municipal", TEXT),
+        ("nro_sistema_gop", "Nro de sistema GOP", TEXT),
+        ("nro_partida_inmobiliaria", "Nro de partida inmobiliaria", TEXT),
+        ("tasa_sellado", "Tasa de sellado", CURRENCY),
+        ("tasa_visado", "Tasa de visado", CURRENCY),
+        ("visado_gas", "Visado de instalacion de Gas", CURRENCY),
+        ("visado_salubridad", "Visado de instalacion de Salubridad", CURRENCY),
+        ("visado_electrica", "Visado de instalacion electrica", CURRENCY),
+        ("visado_electromecanica", "Visado de instalacion electromecanica", CURRENCY),
+        ("estado_pago_sellado", "Estado pago sellado", TEXT),
+        ("estado_pago_visado", "Estado pago visado", TEXT),
+        ("nro_expediente_cpim", "Nro de expediente CPIM", TEXT),
+        ("fecha_salida", "Fecha de salida", DATE),
+        ("persona_retira", "Persona que retira", TEXT),
+        ("nro_caja", "Nro de Caja", NUMBER),
+        ("ruta_carpeta", "Ruta de carpeta", TEXT),
+        ("whatsapp_profesional", "WhatsApp Profesional", TEXT),
+        ("whatsapp_tramitador", "WhatsApp Tramitador", TEXT),
+        ("analizada_en_periodo", "Analizada en Periodo", TEXT),
+    ],
+    updatable=(
+        "estado_pago_sellado", "estado_pago_visado",
+        "nro_expediente_cpim", "fecha_salida", "persona_retira", "nro_caja",
+        "whatsapp_profesional", "whatsapp_tramitador", "analizada_en_periodo",
+    ),
+    defaults={"estado_pago_sellado": "No pagado", "estado_pago_visado": "No pagado"},
+)
+
+INFORME_SCHEMA = SheetSchema(
+    "informe", "Informes técnicos",
+    [
+        ("fecha", "Fecha", DATE),
+        ("profesion", "Profesión", TEXT),
+        ("formato", "Formato", TEXT),
+        ("nro_copias", "Nro de Copias", NUMBER),
+        ("tipo_trabajo", "Tipo de trabajo", TEXT),
+        ("detalle", "Detalle", TEXT),
+        ("profesional", "Profesional", TEXT),
+        ("comitente", "Comitente", TEXT),
+        ("tasa_sellado", "Tasa de sellado", CURRENCY),
+        ("estado_pago", "Estado de pago", TEXT),
+        ("nro_expediente_cpim", "Nro de expediente CPIM", TEXT),
+        ("fecha_salida", "Fecha de salida", DATE),
+        ("persona_retira", "Persona que retira", TEXT),
+        ("nro_caja", "Nro de Caja", NUMBER),
+        ("ruta_carpeta", "Ruta de carpeta", TEXT),
+        ("whatsapp_profesional", "WhatsApp Profesional", TEXT),
+        ("whatsapp_tramitador", "WhatsApp Tramitador", TEXT),
+    ],
+    updatable=(
+        "estado_pago", "nro_expediente_cpim", "fecha_salida", "persona_retira",
+        "nro_caja", "whatsapp_profesional", "whatsapp_tramitador",
+    ),
+    defaults={"estado_pago": "No pagado"},
+)
+
+SCHEMAS = {"obra": OBRA_SCHEMA, "informe": INFORME_SCHEMA}
+
+
+def schema_for(work_type):
+    """Devuelve el esquema según el tipo de trabajo ("obra" o "informe")"""
+    return OBRA_SCHEMA if work_type == "obra" else INFORME_SCHEMA
@@ -0,0 +1,163 @@
+"""
+Instantánea de los registros (registros.snapshot junto a registros.xlsx).
+Guarda los registros ya convertidos, identificados por la fecha de
+modificación, el tamaño y el hash del Excel del que salieron. Mientras
+el Excel no cambie, leer la instantánea evita interpretar el XML del
+libro al iniciar; si no coincide, se vuelve a leer el Excel y se
+reemplaza la instantánea.
+
+El archivo es JSON con los valores tal cual (las fechas como
+{"$datetime": "..."}): leerlo nunca ejecuta código, aunque alguien
+reemplace la instantánea en la carpeta compartida.
+"""
+
+import os
+import json
+import hashlib
+from pathlib import Path
+from datetime import datetime, date, time
+
+from .schema import schema_for
+from .records import record_class_for
+
+
+# Cambiar si cambia el formato de la instantánea
+SNAPSHOT_FORMAT = 2
+
+# Tipos que JSON no representa: se guardan como {"$tipo": texto ISO}
+_ENCODED_TYPES = (("$datetime", datetime), ("$date", date), ("$time", time))
+_DECODERS = {
+    "$datetime": datetime.fromisoformat,
+    "$date": date.fromisoformat,
+    "$time": time.fromisoformat,
+}
+
+
+def snapshot_path_for(excel_file):
+    """Ruta de la instantánea que acompaña a un archivo de registros"""
+    return Path(excel_file).with_suffix(".snapshot")
+
+
+def workbook_key(excel_file):
+    """
+    Identifica el contenido de un Excel
+
+    Returns:
+        tuple: (mtime_ns, tamaño, hash blake2b del archivo), o None si no existe
+    """
+    try:
+        stat = os.stat(excel_file)
+        digest = hashlib.blake2b(digest_size=16)
+        with open(excel_file, "rb") as workbook_file:
+            for chunk in iter(lambda: workbook_file.read(1 << 20), b""):
+                digest.update(chunk)
+        return (stat.st_mtime_ns, stat.st_size, digest.hexdigest())
+    except OSError:
+        return None
+
+
+def _schema_key():
+    """Columnas de ambas hojas: si cambia el esquema, las instantáneas viejas no sirven"""
+    return [list(schema_for(work_type).headers) for work_type in ("obra", "informe")]
+
+
+def _encode(value):
+    """Convierte a JSON las fechas y horas (cualquier otro tipo no se admite)"""
+    for tag, kind in _ENCODED_TYPES:
+        if isinstance(value, kind):
+            return {tag: value.isoformat()}
+    raise TypeError(f"valor no admitido en la instantánea: {type(value).__name__}")
+
+
+def _decode(obj):
+    """Vuelve a convertir los objetos {"$tipo": texto} en fechas y horas"""
+    if len(obj) == 1:
+        (tag, text), = obj.items()
+        decoder = _DECODERS.get(tag)
+        if decoder is not None:
+            return decoder(text)
+    return obj
+
+
+def load_snapshot(excel_file):
+    """
+    Lee la instantánea si corresponde al Excel tal como está ahora
+
+    Returns:
+        tuple: (obras, informes), o None si no hay instantánea válida
+    """
+    path = snapshot_path_for(excel_file)
+    if not path.exists():
+        return None
+    try:
+        with open(path, encoding="utf-8") as snapshot_file:
+            snapshot = json.load(snapshot_file, object_hook=_decode)
+        key = workbook_key(excel_file)
+        if (not isinstance(snapshot, dict) or
+                snapshot.get("format") != SNAPSHOT_FORMAT or
+                snapshot.get("schema") != _schema_key() or
+                key is None or snapshot.get("key") != list(key)):
+            return None
+
+        registros = []
+        for work_type in ("obra", "informe"):
+            from_values = record_class_for(work_type).from_values
+            registros.append([from_values(row[0], row[1:]) for row in snapshot[work_type]])
+        return registros[0], registros[1]
+    except Exception as e:
+        print(f"No se pudo leer la instantánea {path.name}: {e}")
+        return None
+
+
+def snapshot_rows(records):
+    """
+    Convierte registros en filas de la instantánea: (id, valor1, valor2, ...)
+
+    Los textos vacíos se guardan como None, que es como vuelven al leer
+    el Excel, para que la instantánea sea igual a una lectura del libro.
+    """
+    rows = []
+    for record in records:
+        rows.append((record.id,) + tuple(
+            None if value == "" else value
+            for value in (getattr(record, name) for name in record.fields)
+        ))
+    return rows
+
+
+def save_snapshot(excel_file, obras_rows, informes_rows, key=None):
+    """
+    Guarda la instantánea de los registros asociada al Excel actual
+
+    Args:
+        excel_file: Ruta de registros.xlsx (ya guardado con estos registros)
+        obras_rows: Filas de obras (ver snapshot_rows)
+        informes_rows: Filas de informes (ver snapshot_rows)
+        key: workbook_key del Excel tomada cuando las filas coincidían con
+             él (None para calcularla ahora)
+
+    Returns:
+        bool: True si se guardó
+    """
+    path = snapshot_path_for(excel_file)
+    try:
+        if key is None:
+            key = workbook_key(excel_file)
+        if key is None:
+            return False
+        snapshot = {
+            "format": SNAPSHOT_FORMAT,
+            "schema": _schema_key(),
+            "key": list(key),
+            "obra": obras_rows,
+            "informe": informes_rows,
+        }
+        # Archivo temporal + reemplazo: nunca queda una instantánea a medio escribir
+        temp_path = path.with_name(path.name + ".tmp")
+        with open(temp_path, "w", encoding="utf-8") as snapshot_file:
+            json.dump(snapshot, snapshot_file, default=_encode, ensure_ascii=False, separators=(",", ":"))
+        os.replace(temp_path, path)
+        return True
+    except Exception as e:
+        print(f"No se pudo guardar la instantánea {path.name}: {e}")
+        return False
@@ -0,0 +1,283 @@
+import re
+import sqlite3
+import threading
+from datetime import datetime, date, time
+from pathlib import Path
+
+from .base import (
+    StorageBackend, fields_for,
+    currency_fields_for, updatable_fields_for, defaults_for, parse_currency
+)
+from .excel_backend import ExcelBackend
+from .records import record_class_for
+
+
+TABLES = {"obra": "obras", "informe": "informes"}
+
+# Índices para las búsquedas más frecuentes
+INDEXES = {
+    "obras": (
+        "nombre_profesional", "nombre_comitente", "nro_partida_inmobiliaria",
+        "nro_sistema_gop", "nro_expediente_cpim", "fecha_salida"
+    ),
+    "informes": ("profesional", "comitente", "nro_expediente_cpim", "fecha_salida"),
+}
+
+
+# Fechas de celda guardadas en la base: texto ISO con hora ("2024-03-01T00:00:00")
+_ISO_DATETIME = re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d{1,6})?")
+
+
+def _to_sql_value(value):
+    """Convierte un valor de celda a un tipo que SQLite pueda guardar"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, date):
+        # openpyxl lee las celdas de fecha como datetime: se guardan igual
+        return datetime.combine(value, time()).isoformat()
+    return value
+
+
+def _from_sql_value(value):
+    """Vuelve a convertir en datetime las fechas de celda guardadas como texto ISO"""
+    if isinstance(value, str) and len(value) >= 19 and value[10] == "T" and _ISO_DATETIME.fullmatch(value):
+        return datetime.fromisoformat(value)
+    return value
+
+
+class SQLiteBackend(StorageBackend):
+    """
+    Backend que guarda los registros en una base SQLite.
+
+    registros.xlsx se mantiene como formato de importación/exportación:
+    se importa al crear la base (o si fue editado externamente) y se
+    vuelve a exportar al cerrar si hubo cambios.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, db_file, excel_file):
+        self.db_file = Path(db_file)
+        self.excel = ExcelBackend(excel_file)
+        self._lock = threading.RLock()
+        self._version = 0
+
+        # La conexión se comparte entre hilos, protegida por self._lock
+        self._connection = sqlite3.connect(str(self.db_file), check_same_thread=False)
+        self._create_schema()
+        self._sync_from_excel_if_needed()
+
+    def _create_schema(self):
+        """Crea las tablas e índices si no existen"""
+        with self._lock, self._connection:
+            for work_type, table in TABLES.items():
+                columns = ", ".join(fields_for(work_type))
+                self._connection.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} (id INTEGER PRIMARY KEY, {columns})"
+                )
+                for field in INDEXES[table]:
+                    self._connection.execute(
+                        f"CREATE INDEX IF NOT EXISTS idx_{table}_{field} ON {table} ({field})"
+                    )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+            )
+
+    def _get_meta(self, key, default=None):
+        row = self._connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, key, value):
+        self._connection.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value))
+        )
+
+    def _excel_signature_text(self):
+        signature = self.excel.signature()
+        return f"{signature[0]}:{signature[1]}" if signature else ""
+
+    def _sync_from_excel_if_needed(self):
+        """Importa el Excel si la base está vacía o si el Excel cambió desde la última sincronización"""
+        with self._lock:
+            excel_signature = self._excel_signature_text()
+            if not excel_signature:
+                return
+
+            vacia = self._connection.execute("SELECT COUNT(*) FROM obras").fetchone()[0] == 0 and \
+                self._connection.execute("SELECT COUNT(*) FROM informes").fetchone()[0] == 0
+
+            if vacia or excel_signature != self._get_meta("excel_signature"):
+                if not vacia and self._get_meta("dirty") == "1":
+                    print("ADVERTENCIA: el Excel fue modificado externamente pero la base tiene cambios "
+                          "sin exportar. Se conservan los datos de la base.")
+                    return
+                self.import_from_excel()
+
+    def import_from_excel(self):
+        """Reemplaza el contenido de la base con el de registros.xlsx"""
+        obras, informes = self.excel.load_all()
+
+        with self._lock, self._connection:
+            for work_type, works in (("obra", obras), ("informe", informes)):
+                table = TABLES[work_type]
+                fields = fields_for(work_type)
+                placeholders = ", ".join("?" * (len(fields) + 1))
+                self._connection.execute(f"DELETE FROM {table}")
+                self._connection.executemany(
+                    f"INSERT INTO {table} (id, {', '.join(fields)}) VALUES ({placeholders})",
+                    [[work["id"]] + [_to_sql_value(work.get(f)) for f in fields] for work in works]
+                )
+            self._set_meta("excel_signature", self._excel_signature_text())
+            self._set_meta("dirty", "0")
+            self._version += 1
+
+        print(f"Base SQLite importada desde Excel: {len(obras)} obras y {len(informes)} informes")
+
+    def export_to_excel(self):
+        """
+        Actualiza las hojas de registros.xlsx con el contenido actual de la base
+
+        Solo se reemplazan las dos hojas de registros; el resto del libro y
+        el formato de las celdas se conservan (ver ExcelBackend.replace_sheets).
+        """
+        with self._lock:
+            obras, informes = self.load_all()
+            self.excel.replace_sheets(obras, informes)
+            with self._connection:
+                self._set_meta("excel_signature", self._excel_signature_text())
+                self._set_meta("dirty", "0")
+        print(f"Excel exportado desde SQLite: {self.excel.excel_file}")
+
+    def signature(self):
+        """Cambia con cada escritura propia o de otra conexión a la base"""
+        with self._lock:
+            data_version = self._connection.execute("PRAGMA data_version").fetchone()[0]
+            return (self._version, data_version)
+
+    def load_all(self, min_ids=None):
+        """Carga ambas tablas como listas de registros ordenadas por ID (todos tienen ID)"""
+        try:
+            with self._lock:
+                result = []
+                for work_type in ("obra", "informe"):
+                    fields = fields_for(work_type)
+                    cursor = self._connection.execute(
+                        f"SELECT id, {', '.join(fields)} FROM {TABLES[work_type]} ORDER BY id"
+                    )
+                    from_values = record_class_for(work_type).from_values
+                    result.append([
+                        from_values(row[0], [_from_sql_value(value) for value in row[1:]])
+                        for row in cursor
+                    ])
+                return result[0], result[1]
+        except Exception as e:
+            print(f"Error al cargar registros desde SQLite: {e}")
+            return [], []
+
+    def _prepare_value(self, work_type, field, value):
+        if field in currency_fields_for(work_type):
+            return _to_sql_value(parse_currency(value))
+        return _to_sql_value(value)
+
+    def append(self, work_type, data):
+        """Agrega un registro con su ID (o el próximo disponible si no lo trae)"""
+        try:
+            table = TABLES[work_type]
+            fields = fields_for(work_type)
+            defaults = defaults_for(work_type)
+            values = [self._prepare_value(work_type, f, data.get(f, defaults.get(f, ""))) for f in fields]
+
+            with self._lock, self._connection:
+                row_id = data.get("id") or self._connection.execute(
+                    f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}"
+                ).fetchone()[0]
+                placeholders = ", ".join("?" * (len(fields) + 1))
+                self._connection.execute(
+                    f"INSERT INTO {table} (id, {', '.join(fields)}) VALUES ({placeholders})",
+                    [row_id] + values
+                )
+                self._set_meta("dirty", "1")
+                self._version += 1
+
+            print(f"Registro agregado en SQLite ({table}) con ID {row_id}")
+            return row_id
+        except Exception as e:
+            print(f"Error al agregar {work_type} en SQLite: {e}")
+            return -1
+
+    def update(self, work_type, row_id, data):
+        """Actualiza solo los campos editables presentes en data"""
+        try:
+            updatable = updatable_fields_for(work_type)
+            fields = [f for f in data if f in updatable]
+            if not fields:
+                return True
+
+            assignments = ", ".join(f"{f} = ?" for f in fields)
+            values = [self._prepare_value(work_type, f, data[f]) for f in fields]
+
+            with self._lock, self._connection:
+                cursor = self._connection.execute(
+                    f"UPDATE {TABLES[work_type]} SET {assignments} WHERE id = ?",
+                    values + [row_id]
+                )
+                if cursor.rowcount == 0:
+                    return False
+                self._set_meta("dirty", "1")
+                self._version += 1
+
+            print(f"Registro actualizado en SQLite ({TABLES[work_type]}) con ID {row_id}")
+            return True
+        except Exception as e:
+            print(f"Error al actualizar {work_type} en SQLite: {e}")
+            return False
+
+    def apply_batch(self, appends, updates):
+        """Aplica todos los cambios del lote en una sola transacción"""
+        try:
+            with self._lock, self._connection:
+                for work_type, data in appends:
+                    table = TABLES[work_type]
+                    fields = fields_for(work_type)
+                    defaults = defaults_for(work_type)
+                    row_id = data.get("id") or self._connection.execute(
+                        f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}"
+                    ).fetchone()[0]
+                    values = [self._prepare_value(work_type, f, data.get(f, defaults.get(f, ""))) for f in fields]
+                    placeholders = ", ".join("?" * (len(fields) + 1))
+                    # OR IGNORE: un alta ya guardada (mismo ID) no se duplica
+                    self._connection.execute(
+                        f"INSERT OR IGNORE INTO {table} (id, {', '.join(fields)}) VALUES ({placeholders})",
+                        [row_id] + values
+                    )
+
+                for (work_type, row_id), data in updates.items():
+                    updatable = updatable_fields_for(work_type)
+                    fields = [f for f in data if f in updatable]
+                    if not fields:
+                        continue
+                    assignments = ", ".join(f"{f} = ?" for f in fields)
+                    values = [self._prepare_value(work_type, f, data[f]) for f in fields]
+                    self._connection.execute(
+                        f"UPDATE {TABLES[work_type]} SET {assignments} WHERE id = ?",
+                        values + [row_id]
+                    )
+
+                self._set_meta("dirty", "1")
+                self._version += 1
+
+            print(f"SQLite actualizado: {len(appends)} registros agregados y {len(updates)} actualizados")
+            return True
+        except Exception as e:
+            print(f"Error al guardar cambios en SQLite: {e}")
+            return False
+
+    def close(self):
+        """Exporta los cambios pendientes al Excel y cierra la conexión"""
+        try:
+            with self._lock:
+                if self._get_meta("dirty") == "1":
+                    self.export_to_excel()
+                self._connection.close()
+        except Exception as e:
+            print(f"Error al cerrar la base SQLite: {e}")
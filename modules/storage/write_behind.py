@@ -0,0 +1,220 @@
+"""
+Cola de escritura diferida para los backends de almacenamiento.
+Los cambios se acumulan en memoria (combinando las actualizaciones de
+un mismo registro) y se guardan juntos en una sola operación del
+backend, pasado un breve intervalo sin nuevos cambios o al pedirlo
+explícitamente.
+Con un diario (journal.py), cada cambio queda en disco en el acto y el
+guardado en el backend pasa a ser una compactación periódica del diario.
+"""
+
+import threading
+from contextlib import contextmanager
+
+
+class WriteBehindQueue:
+    """
+    Acumula altas y modificaciones y las vuelca al backend en lote.
+
+    - Las altas se guardan en el orden en que se hicieron.
+    - Varias modificaciones del mismo registro se combinan en una sola.
+    - Si el guardado falla, los cambios vuelven a la cola para reintentarse.
+    - Con diario, los cambios se escriben en él antes de encolarse y el
+      diario se compacta después de cada guardado exitoso. Dentro de un
+      lote (batch) se escriben todos juntos al terminarlo.
+    """
+
+    def __init__(self, backend, delay=2.0, on_flush=None, journal=None):
+        """
+        Args:
+            backend: StorageBackend donde se guardan los cambios
+            delay: Segundos a esperar sin cambios antes de guardar (0 = guardar en el acto).
+                Con diario, segundos desde el primer cambio pendiente hasta compactar.
+            on_flush: Función opcional a llamar después de cada guardado exitoso
+            journal: Journal opcional donde se registra cada cambio antes de encolarlo
+        """
+        self.backend = backend
+        self.delay = delay
+        self.on_flush = on_flush
+        self.journal = journal
+
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._appends = []   # [(work_type, data)]
+        self._updates = {}   # {(work_type, row_id): {campo: valor}}
+        self._timer = None
+        self._flushing = False
+        self._batch_depth = 0
+        self._journal_buffer = []  # cambios del lote en curso aún no escritos en el diario
+
+    def add(self, work_type, data):
+        """Encola el alta de un registro"""
+        with self._lock:
+            data = dict(data)
+            self._journal({"op": "add", "work_type": work_type, "data": data})
+            self._appends.append((work_type, data))
+        self._schedule()
+
+    def update(self, work_type, row_id, data):
+        """Encola la modificación de un registro, combinándola con las pendientes"""
+        with self._lock:
+            self._journal({"op": "update", "work_type": work_type, "id": row_id, "data": dict(data)})
+            self._updates.setdefault((work_type, row_id), {}).update(data)
+        self._schedule()
+
+    def _journal(self, entry):
+        """Registra un cambio en el diario (dentro de un lote, al terminarlo)"""
+        if self.journal is None:
+            return
+        if self._batch_depth:
+            self._journal_buffer.append(entry)
+        else:
+            self.journal.append(entry)
+
+    def has_pending(self):
+        """Indica si hay cambios sin guardar o un guardado en curso"""
+        with self._lock:
+            return bool(self._appends or self._updates or self._flushing)
+
+    def recover(self):
+        """
+        Vuelve a encolar los cambios que quedaron en el diario sin guardarse
+
+        Las altas llevan su ID, así que si el diario ya se había guardado en
+        el backend (corte antes de compactarlo) no se duplican.
+
+        Returns:
+            list: Cambios recuperados, en orden, para que el llamador los
+            aplique también a sus datos en memoria (vacía si no hay diario)
+        """
+        if self.journal is None:
+            return []
+        entries = self.journal.entries()
+        with self._lock:
+            for entry in entries:
+                if entry.get("op") == "add":
+                    self._appends.append((entry["work_type"], entry["data"]))
+                elif entry.get("op") == "update":
+                    self._updates.setdefault((entry["work_type"], entry["id"]), {}).update(entry["data"])
+        return entries
+
+    def _pending_entries(self):
+        """Cambios pendientes en formato de diario (ya combinados)"""
+        entries = [{"op": "add", "work_type": work_type, "data": data} for work_type, data in self._appends]
+        entries.extend(
+            {"op": "update", "work_type": work_type, "id": row_id, "data": data}
+            for (work_type, row_id), data in self._updates.items()
+        )
+        return entries
+
+    def pending_count(self):
+        """Cantidad de altas y registros modificados pendientes de guardar"""
+        with self._lock:
+            return len(self._appends) + len(self._updates)
+
+    @contextmanager
+    def batch(self):
+        """
+        Agrupa los cambios hechos dentro del bloque para que se guarden juntos
+
+        Uso:
+            with queue.batch():
+                queue.update(...)
+                queue.update(...)
+        """
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                terminado = self._batch_depth == 0
+                if terminado and self._journal_buffer:
+                    # Un solo fsync para todos los cambios del lote
+                    entries, self._journal_buffer = self._journal_buffer, []
+                    self.journal.extend(entries)
+            if terminado and self.pending_count():
+                self._schedule()
+
+    def _schedule(self):
+        """Programa el guardado (o lo hace en el acto si no hay demora)"""
+        with self._lock:
+            if self._batch_depth:
+                # Se programa al terminar el lote
+                return
+
+        if not self.delay:
+            self.flush()
+            return
+
+        with self._lock:
+            if self._timer is not None:
+                if self.journal is not None:
+                    # Con diario no se espera a que no haya cambios: se compacta
+                    # cada `delay` segundos mientras haya algo pendiente
+                    return
+                self._timer.cancel()
+            # Hilo daemon: no demora la salida de la aplicación. Al salir,
+            # DataManager guarda lo pendiente con atexit (flush espera a que
+            # termine un guardado en curso) y con diario nada se pierde
+            self._timer = threading.Timer(self.delay, self._flush_if_idle)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush_if_idle(self):
+        """Guardado programado: no corta un lote en curso (se reprograma al terminarlo)"""
+        with self._lock:
+            if self._batch_depth:
+                self._timer = None
+                return
+        self.flush()
+
+    def flush(self):
+        """
+        Guarda todos los cambios pendientes en una sola operación del backend
+
+        Returns:
+            bool: True si no quedaron cambios pendientes
+        """
+        with self._flush_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                appends, updates = self._appends, self._updates
+                if not appends and not updates:
+                    return True
+                self._appends, self._updates = [], {}
+                self._flushing = True
+
+            try:
+                ok = self.backend.apply_batch(appends, updates)
+            except Exception as e:
+                print(f"Error al guardar cambios pendientes: {e}")
+                ok = False
+
+            with self._lock:
+                self._flushing = False
+                if ok and self.journal is not None:
+                    # Compactar: en el diario queda solo lo que llegó durante el guardado
+                    try:
+                        self.journal.rewrite(self._pending_entries())
+                    except Exception as e:
+                        # El diario conserva los cambios ya guardados; recuperarlos no duplica altas
+                        print(f"Error al compactar el diario: {e}")
+                if not ok:
+                    # Reencolar: lo que llegó durante el guardado es más reciente
+                    self._appends = appends + self._appends
+                    for key, data in self._updates.items():
+                        updates.setdefault(key, {}).update(data)
+                    self._updates = updates
+                    print(f"Quedan {self.pending_count()} cambios pendientes de guardar")
+
+        if ok and self.on_flush:
+            self.on_flush()
+        return ok
+
+    def close(self):
+        """Cancela el guardado programado y guarda lo pendiente"""
+        return self.flush()
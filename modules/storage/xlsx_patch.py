@@ -0,0 +1,396 @@
+"""
+Guardado rápido de altas y modificaciones en registros.xlsx.
+En lugar de cargar el libro completo con openpyxl y volver a guardarlo,
+modifica directamente el XML de las hojas afectadas dentro del .xlsx:
+agrega las filas nuevas al final y reemplaza solo las celdas que
+cambiaron. El resto de los archivos del libro se copian tal cual.
+
+Las celdas se escriben como las escribe openpyxl (textos en línea,
+números, moneda con el formato de CURRENCY_FORMAT). Ante cualquier cosa
+que requiera cambiar la estructura del libro (hojas o columnas que
+faltan, fórmulas, fechas, estilos inexistentes) se lanza
+XlsxFormatError y el llamador guarda con openpyxl.
+"""
+
+import os
+import re
+import zipfile
+from xml.etree.ElementTree import fromstring, iterparse
+from html import unescape
+from xml.sax.saxutils import escape
+
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.utils import get_column_letter
+
+from .base import CURRENCY_FORMAT, parse_currency
+from .schema import schema_for, parse_id
+from .xlsx_reader import XlsxReader, XlsxFormatError, MAIN_NS, _text_content, _SHARED_ITEM
+
+
+_ROW_TAG = re.compile(r'<row\b[^>]*?\br="(\d+)"[^>]*?(/?)>')
+_CELL = re.compile(r'<c\b[^>]*?\br="([A-Z]+)(\d+)"([^>]*?)(?:/>|>(.*?)</c>)', re.S)
+_STYLE_ATTR = re.compile(r'\bs="(\d+)"')
+_TYPE_ATTR = re.compile(r'\bt="(\w+)"')
+_VALUE = re.compile(r'<v>(.*?)</v>', re.S)
+_INLINE_TEXT = re.compile(r'<t\b[^>]*>(.*?)</t>', re.S)
+_DIMENSION = re.compile(r'<dimension\s+ref="([A-Z]*)(\d*)(?::([A-Z]+)(\d+))?"\s*/>')
+
+
+def _column_number(letters):
+    number = 0
+    for letter in letters:
+        number = number * 26 + ord(letter) - 64
+    return number
+
+
+def _number_text(value):
+    """Número como lo escribe openpyxl (1500.0 -> "1500")"""
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e16:
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def cell_xml(ref, value, style=None):
+    """
+    XML de una celda con el valor dado
+
+    Args:
+        ref: Coordenada de la celda ("B12")
+        value: Texto, número, booleano o vacío (None / "")
+        style: Índice de estilo a conservar o aplicar (atributo s)
+
+    Returns:
+        str: XML de la celda, o "" si queda vacía y sin estilo
+    """
+    style_attr = f' s="{style}"' if style is not None else ""
+
+    if value is None or value == "":
+        return f'<c r="{ref}"{style_attr}/>' if style_attr else ""
+    if isinstance(value, bool):
+        return f'<c r="{ref}"{style_attr} t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        return f'<c r="{ref}"{style_attr} t="n"><v>{_number_text(value)}</v></c>'
+    if isinstance(value, str):
+        if value.startswith("="):
+            raise XlsxFormatError(f"fórmula en {ref}")
+        if ILLEGAL_CHARACTERS_RE.search(value):
+            raise XlsxFormatError(f"caracteres no permitidos en {ref}")
+        space = ' xml:space="preserve"' if value != value.strip() else ""
+        return f'<c r="{ref}"{style_attr} t="inlineStr"><is><t{space}>{escape(value)}</t></is></c>'
+    raise XlsxFormatError(f"tipo {type(value).__name__} en {ref}")
+
+
+class SheetPatch:
+    """Cambios sobre el XML de una hoja, aplicados todos juntos al final"""
+
+    def __init__(self, xml, work_type, header_row, currency_style):
+        self.xml = xml
+        self.work_type = work_type
+        self.schema = schema_for(work_type)
+        self.currency_style = currency_style
+        self._edits = []      # [(inicio, fin, texto nuevo)] sobre self.xml
+        self._new_rows = {}   # {id: (número de fila, datos)} de las filas agregadas
+
+        missing = self.schema.missing_fields(header_row)
+        if not any(header_row) or missing:
+            raise XlsxFormatError(f"faltan columnas en '{self.schema.sheet_name}'")
+        self.columns = self.schema.locate_columns(header_row)
+        self.letters = {name: get_column_letter(column) for name, column in self.columns.items()}
+
+        data_end = xml.find("</sheetData>")
+        if data_end == -1:
+            raise XlsxFormatError(f"hoja '{self.schema.sheet_name}' sin filas")
+        self.data_end = data_end
+
+        # Posición de cada fila: {número: (inicio, fin de la etiqueta, fin de la fila)}
+        self.rows = {}
+        for match in _ROW_TAG.finditer(xml, 0, data_end):
+            if match.group(2):
+                end = match.end()
+            else:
+                end = xml.find("</row>", match.end())
+                if end == -1:
+                    raise XlsxFormatError("fila sin cerrar")
+                end += len("</row>")
+            self.rows[int(match.group(1))] = (match.start(), match.end(), end)
+        self.last_row = max(self.rows, default=1)
+        self.ids = self._read_ids()
+
+    def _read_ids(self):
+        """{id: número de fila} leyendo solo las celdas de la columna ID"""
+        ids = {}
+        letters = self.letters["id"]
+        pattern = re.compile(r'<c\b[^>]*?\br="%s(\d+)"([^>]*?)(?:/>|>(.*?)</c>)' % letters, re.S)
+        for match in pattern.finditer(self.xml, 0, self.data_end):
+            row = int(match.group(1))
+            if row == 1:
+                continue
+            content = match.group(3) or ""
+            data_type = _TYPE_ATTR.search(match.group(2))
+            data_type = data_type.group(1) if data_type else "n"
+            if data_type == "n":
+                value = _VALUE.search(content)
+                value = value.group(1) if value else None
+                if value is not None:
+                    value = float(value) if "." in value or "e" in value.lower() else int(value)
+            elif data_type in ("inlineStr", "str"):
+                value = "".join(_INLINE_TEXT.findall(content)) or None
+            else:
+                # IDs guardados como texto compartido: que lo resuelva openpyxl
+                raise XlsxFormatError(f"ID de la fila {row} con tipo {data_type}")
+            row_id = parse_id(value)
+            if row_id is not None and row_id not in ids:
+                ids[row_id] = row
+        return ids
+
+    def _field_value(self, name, value):
+        """Valor y estilo a escribir para un campo (los montos van con formato de moneda)"""
+        if name in self.schema.currency_fields:
+            value = parse_currency(value)
+            if isinstance(value, float):
+                if self.currency_style is None:
+                    raise XlsxFormatError("el libro no tiene el estilo de moneda")
+                return value, self.currency_style
+        return value, None
+
+    def append(self, data):
+        """
+        Agrega una fila al final con todos los campos del registro
+
+        Returns:
+            bool: False si el ID ya estaba en la hoja (alta ya guardada)
+        """
+        row_id = data.get("id")
+        if row_id is None:
+            row_id = max(self.ids, default=0) + 1
+        elif row_id in self.ids:
+            return False
+
+        self.last_row += 1
+        self._new_rows[row_id] = (self.last_row, dict(data))
+        self.ids[row_id] = self.last_row
+        return True
+
+    def _row_xml(self, row, row_id, data):
+        """XML de una fila nueva con todos los campos del registro"""
+        defaults = self.schema.defaults
+        cells = {}
+        for name in self.schema.names:
+            value, style = self._field_value(name, data.get(name, defaults.get(name, "")))
+            cells[self.columns[name]] = cell_xml(f"{self.letters[name]}{row}", value, style)
+        cells[self.columns["id"]] = cell_xml(f"{self.letters['id']}{row}", row_id)
+        return f'<row r="{row}">' + "".join(cells[column] for column in sorted(cells)) + "</row>"
+
+    def update(self, row_id, data):
+        """
+        Reemplaza las celdas de los campos editables presentes en data
+
+        Returns:
+            bool: False si el ID no está en la hoja
+        """
+        row = self.ids.get(row_id)
+        if row is None:
+            return False
+        if row_id in self._new_rows:
+            # Fila agregada en este mismo lote: los cambios se escriben con ella
+            self._new_rows[row_id][1].update(
+                (name, value) for name, value in data.items() if name in self.schema.updatable_fields
+            )
+            return True
+        if row not in self.rows:
+            raise XlsxFormatError(f"fila {row} no encontrada")
+
+        start, tag_end, end = self.rows[row]
+        if self.xml[tag_end - 2:tag_end] == "/>":
+            raise XlsxFormatError(f"fila {row} vacía")
+
+        # Celdas actuales de la fila: {columna: (inicio, fin, atributos)}
+        current = {}
+        for match in _CELL.finditer(self.xml, tag_end, end):
+            current[_column_number(match.group(1))] = (match.start(), match.end(), match.group(3))
+        if len(current) != self.xml.count("<c", tag_end, end):
+            raise XlsxFormatError(f"celdas sin coordenada en la fila {row}")
+
+        inserts = {}
+        for name, value in data.items():
+            if name not in self.schema.updatable_fields:
+                continue
+            column = self.columns[name]
+            value, style = self._field_value(name, value)
+            if column in current:
+                cell_start, cell_end, attrs = current[column]
+                if style is None:
+                    # Como openpyxl: cambia el valor y conserva el formato de la celda
+                    existing = _STYLE_ATTR.search(attrs)
+                    style = existing.group(1) if existing else None
+                self._edits.append((cell_start, cell_end, cell_xml(f"{self.letters[name]}{row}", value, style)))
+            else:
+                inserts[column] = cell_xml(f"{self.letters[name]}{row}", value, style)
+
+        # Las celdas nuevas se insertan antes de la primera celda de columna mayor
+        for column, xml in sorted(inserts.items()):
+            following = [current[c][0] for c in current if c > column]
+            position = min(following) if following else end - len("</row>")
+            self._edits.append((position, position, xml))
+        return True
+
+    def result(self):
+        """XML de la hoja con todos los cambios aplicados"""
+        edits = list(self._edits)
+        if self._new_rows:
+            rows = [self._row_xml(row, row_id, data) for row_id, (row, data) in self._new_rows.items()]
+            edits.append((self.data_end, self.data_end, "".join(rows)))
+            dimension = _DIMENSION.search(self.xml, 0, self.data_end)
+            if dimension is not None:
+                # openpyxl (solo lectura) no lee más allá de la dimensión declarada
+                first_col, first_row = dimension.group(1) or "A", dimension.group(2) or "1"
+                last_col = dimension.group(3) or first_col
+                width = max(_column_number(last_col), max(self.columns.values()))
+                ref = f"{first_col}{first_row}:{get_column_letter(width)}{self.last_row}"
+                edits.append((dimension.start(), dimension.end(), f'<dimension ref="{ref}"/>'))
+
+        parts = []
+        position = 0
+        for start, end, text in sorted(edits, key=lambda edit: (edit[0], edit[1])):
+            if start < position:
+                raise XlsxFormatError("cambios superpuestos en la hoja")
+            parts.append(self.xml[position:start])
+            parts.append(text)
+            position = end
+        parts.append(self.xml[position:])
+        return "".join(parts)
+
+
+def _currency_style(workbook_zip, styles_path):
+    """Índice del estilo de celda con el formato de moneda, o None si el libro no lo tiene"""
+    if styles_path is None:
+        return None
+    styles = fromstring(workbook_zip.read(styles_path))
+    ids = {
+        fmt.get("numFmtId")
+        for fmt in styles.iter(f"{{{MAIN_NS}}}numFmt")
+        if fmt.get("formatCode") == CURRENCY_FORMAT
+    }
+    cell_xfs = styles.find(f"{{{MAIN_NS}}}cellXfs")
+    if not ids or cell_xfs is None:
+        return None
+    for index, xf in enumerate(cell_xfs.iter(f"{{{MAIN_NS}}}xf")):
+        if xf.get("numFmtId") in ids:
+            return index
+    return None
+
+
+def _header_row(xml, shared_strings_path, workbook_zip):
+    """Valores de la fila 1 de una hoja (resolviendo solo los textos compartidos necesarios)"""
+    match = _ROW_TAG.search(xml)
+    if match is None or match.group(1) != "1" or match.group(2):
+        raise XlsxFormatError("la hoja no tiene encabezados")
+    end = xml.find("</row>", match.end())
+
+    cells = []
+    shared = {}
+    for cell in _CELL.finditer(xml, match.end(), end):
+        data_type = _TYPE_ATTR.search(cell.group(3))
+        data_type = data_type.group(1) if data_type else "n"
+        content = cell.group(4) or ""
+        if data_type == "s":
+            value = _VALUE.search(content)
+            shared[len(cells)] = int(value.group(1)) if value else None
+            value = None
+        elif data_type in ("inlineStr", "str"):
+            value = unescape("".join(_INLINE_TEXT.findall(content))) or None
+        else:
+            value = _VALUE.search(content)
+            value = value.group(1) if value else None
+        column = _column_number(cell.group(1))
+        cells.extend([None] * (column - 1 - len(cells)))
+        cells.append(value)
+
+    wanted = {index for index in shared.values() if index is not None}
+    if wanted:
+        if shared_strings_path is None:
+            raise XlsxFormatError("faltan los textos compartidos")
+        strings = {}
+        with workbook_zip.open(shared_strings_path) as source:
+            position = 0
+            for _, element in iterparse(source):
+                if element.tag == _SHARED_ITEM:
+                    if position in wanted:
+                        strings[position] = _text_content(element)
+                    position += 1
+                    element.clear()
+                    if len(strings) == len(wanted):
+                        break
+        for column, index in shared.items():
+            cells[column] = strings.get(index)
+    return tuple(cells)
+
+
+def patch_workbook(excel_file, appends, updates):
+    """
+    Guarda un lote de cambios modificando solo el XML de las hojas afectadas
+
+    Args:
+        excel_file: Ruta de registros.xlsx
+        appends: Lista de (work_type, data) a agregar, en orden
+        updates: Diccionario {(work_type, row_id): data} con los cambios a aplicar
+
+    Returns:
+        int: Cantidad de registros agregados (las altas con un ID ya guardado se omiten)
+
+    Raises:
+        XlsxFormatError: Si el lote necesita cambios de estructura (guardar con openpyxl)
+    """
+    reader = XlsxReader(excel_file)
+    try:
+        sheet_paths = {name: reader.sheet_path(name) for name in reader.sheetnames}
+        shared_strings_path = reader.shared_strings_path
+        styles_path = reader.styles_path
+    finally:
+        reader.close()
+
+    work_types = {work_type for work_type, _ in appends} | {key[0] for key in updates}
+    agregados = 0
+    replacements = {}
+
+    temp_path = f"{excel_file}.tmp"
+    try:
+        with zipfile.ZipFile(str(excel_file)) as workbook_zip:
+            currency_style = _currency_style(workbook_zip, styles_path)
+
+            patches = {}
+            for work_type in work_types:
+                sheet_name = schema_for(work_type).sheet_name
+                if sheet_name not in sheet_paths:
+                    raise XlsxFormatError(f"falta la hoja '{sheet_name}'")
+                xml = workbook_zip.read(sheet_paths[sheet_name]).decode("utf-8")
+                header_row = _header_row(xml, shared_strings_path, workbook_zip)
+                patches[work_type] = SheetPatch(xml, work_type, header_row, currency_style)
+
+            for work_type, data in appends:
+                if patches[work_type].append(data):
+                    agregados += 1
+
+            for (work_type, row_id), data in updates.items():
+                if not patches[work_type].update(row_id, data):
+                    print(f"ID {row_id} no encontrado en '{schema_for(work_type).sheet_name}'")
+
+            for work_type, patch in patches.items():
+                replacements[sheet_paths[schema_for(work_type).sheet_name]] = patch.result().encode("utf-8")
+
+            # Se escribe un libro nuevo al lado y se reemplaza de una vez
+            with zipfile.ZipFile(temp_path, "w") as output:
+                for info in workbook_zip.infolist():
+                    data = replacements.get(info.filename)
+                    if data is None:
+                        data = workbook_zip.read(info.filename)
+                    output.writestr(info, data, compress_type=info.compress_type)
+
+        # Con el libro abierto en Excel (Windows) el reemplazo falla: no dejar el temporal
+        os.replace(temp_path, str(excel_file))
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    return agregados
+
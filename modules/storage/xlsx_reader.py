@@ -0,0 +1,281 @@
+"""
+Lector rápido de registros.xlsx.
+Recorre con iterparse el XML de las hojas (y el de los textos
+compartidos) dentro del archivo .xlsx y devuelve directamente los
+valores de cada fila, sin crear celdas ni el resto del modelo de
+objetos de openpyxl. Los valores son los mismos que devuelve openpyxl
+en modo de solo lectura con iter_rows(values_only=True).
+Usa el iterparse de xml.etree de la biblioteca estándar y no lxml, que
+no es una dependencia del sistema.
+
+Solo cubre lo que usan nuestras hojas; ante cualquier otra cosa (por
+ejemplo, fórmulas compartidas) lanza XlsxFormatError y el llamador
+vuelve a leer el libro con openpyxl.
+"""
+
+import zipfile
+import posixpath
+from xml.etree.ElementTree import iterparse, fromstring
+
+from openpyxl.styles.stylesheet import Stylesheet
+from openpyxl.utils.datetime import from_excel, from_ISO8601, WINDOWS_EPOCH, MAC_EPOCH
+
+
+MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+_ROW = f"{{{MAIN_NS}}}row"
+_CELL = f"{{{MAIN_NS}}}c"
+_VALUE = f"{{{MAIN_NS}}}v"
+_FORMULA = f"{{{MAIN_NS}}}f"
+_INLINE = f"{{{MAIN_NS}}}is"
+_TEXT = f"{{{MAIN_NS}}}t"
+_RUN = f"{{{MAIN_NS}}}r"
+_SHARED_ITEM = f"{{{MAIN_NS}}}si"
+_DIMENSION = f"{{{MAIN_NS}}}dimension"
+
+_DIGITS = "0123456789"
+
+
+class XlsxFormatError(Exception):
+    """El libro usa algo que este lector no interpreta"""
+
+
+def _column_index(letters):
+    """Convierte las letras de una columna ("A", "AB") en su número (1-based)"""
+    index = 0
+    for letter in letters:
+        index = index * 26 + ord(letter) - 64
+    return index
+
+
+def _cast_number(text):
+    """Igual que openpyxl: float si tiene punto o exponente, int si no"""
+    if "." in text or "E" in text or "e" in text:
+        return float(text)
+    return int(text)
+
+
+def _text_content(element):
+    """Texto de un <si> o <is>: el <t> directo más los <t> de cada tramo con formato"""
+    if len(element) == 1 and element[0].tag == _TEXT:
+        return element[0].text or ""
+    snippets = []
+    plain = element.find(_TEXT)
+    if plain is not None and plain.text is not None:
+        snippets.append(plain.text)
+    for run in element.iterfind(_RUN):
+        text = run.find(_TEXT)
+        if text is not None and text.text is not None:
+            snippets.append(text.text)
+    return "".join(snippets)
+
+
+class XlsxSheet:
+    """Hoja de un XlsxReader, con la interfaz de lectura de una hoja de openpyxl"""
+
+    def __init__(self, reader, path):
+        self._reader = reader
+        self._path = path
+
+    def iter_rows(self, values_only=True):
+        """
+        Recorre las filas de la hoja como tuplas de valores, desde la fila 1
+
+        Las filas que faltan en el XML se devuelven vacías, igual que openpyxl.
+        """
+        if not values_only:
+            raise XlsxFormatError("solo se admite values_only=True")
+        return self._reader._iter_rows(self._path)
+
+
+class XlsxReader:
+    """
+    Libro abierto para leer valores
+
+    Uso:
+        reader = XlsxReader("registros.xlsx")
+        rows = reader["Obras en general"].iter_rows(values_only=True)
+        ...
+        reader.close()
+    """
+
+    def __init__(self, excel_file):
+        self._zip = zipfile.ZipFile(str(excel_file))
+        try:
+            self._read_workbook()
+        except XlsxFormatError:
+            self._zip.close()
+            raise
+        except (KeyError, ValueError, SyntaxError) as e:
+            self._zip.close()
+            raise XlsxFormatError(f"estructura no reconocida: {e}")
+        self._shared_strings = None
+
+    def _read_workbook(self):
+        """Lee los nombres de las hojas, sus archivos, el calendario y los estilos de fecha"""
+        workbook = fromstring(self._zip.read("xl/workbook.xml"))
+        if workbook.tag != f"{{{MAIN_NS}}}workbook":
+            raise XlsxFormatError(f"espacio de nombres no soportado: {workbook.tag}")
+
+        properties = workbook.find(f"{{{MAIN_NS}}}workbookPr")
+        date1904 = properties is not None and properties.get("date1904") in ("1", "true")
+        self._epoch = MAC_EPOCH if date1904 else WINDOWS_EPOCH
+
+        # Archivo de cada relación del libro (hojas, textos compartidos, estilos)
+        targets = {}
+        shared_strings = styles = None
+        rels = fromstring(self._zip.read("xl/_rels/workbook.xml.rels"))
+        for rel in rels.iter(f"{{{PKG_REL_NS}}}Relationship"):
+            target = rel.get("Target")
+            if target.startswith("/"):
+                target = target[1:]
+            else:
+                target = posixpath.normpath(posixpath.join("xl", target))
+            targets[rel.get("Id")] = target
+            kind = rel.get("Type", "").rsplit("/", 1)[-1]
+            if kind == "sharedStrings":
+                shared_strings = target
+            elif kind == "styles":
+                styles = target
+        self.shared_strings_path = shared_strings
+        self.styles_path = styles
+
+        self._sheets = {}
+        for sheet in workbook.iter(f"{{{MAIN_NS}}}sheet"):
+            self._sheets[sheet.get("name")] = targets[sheet.get(f"{{{REL_NS}}}id")]
+
+        # Estilos con formato de fecha (como en el XML, "s"): sus números se convierten a datetime
+        self._date_styles = set()
+        if styles is not None:
+            stylesheet = Stylesheet.from_tree(fromstring(self._zip.read(styles)))
+            self._date_styles = {str(index) for index in stylesheet.date_formats}
+
+    @property
+    def sheetnames(self):
+        return list(self._sheets)
+
+    def __getitem__(self, name):
+        return XlsxSheet(self, self._sheets[name])
+
+    def sheet_path(self, name):
+        """Archivo del XML de una hoja dentro del .xlsx"""
+        return self._sheets[name]
+
+    def close(self):
+        self._zip.close()
+
+    def _get_shared_strings(self):
+        """Lee la tabla de textos compartidos la primera vez que se necesita"""
+        if self._shared_strings is None:
+            strings = []
+            if self.shared_strings_path is not None:
+                with self._zip.open(self.shared_strings_path) as source:
+                    for _, element in iterparse(source):
+                        if element.tag == _SHARED_ITEM:
+                            strings.append(_text_content(element).replace("x005F_", ""))
+                            element.clear()
+            self._shared_strings = strings
+        return self._shared_strings
+
+    def _iter_rows(self, path):
+        shared = self._get_shared_strings()
+        date_styles = self._date_styles
+        epoch = self._epoch
+        columns = {}  # letras -> número de columna
+        max_row = None
+        expected = 1  # próxima fila a devolver
+
+        with self._zip.open(path) as source:
+            for _, element in iterparse(source):
+                tag = element.tag
+                if tag == _DIMENSION:
+                    # openpyxl devuelve filas vacías hasta la dimensión y no lee más allá
+                    ref = element.get("ref", "").rpartition(":")[2]
+                    digits = ref.lstrip("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+                    max_row = int(digits) if digits.isdigit() else None
+                    continue
+                if tag != _ROW:
+                    continue
+
+                number = element.get("r")
+                number = int(number) if number else expected
+                if max_row is not None and number > max_row:
+                    break
+                while expected < number:
+                    expected += 1
+                    yield ()
+
+                values = []
+                column = 0
+                for cell in element:
+                    if cell.tag != _CELL:
+                        continue
+                    ref = cell.get("r")
+                    if ref:
+                        letters = ref.rstrip(_DIGITS)
+                        column = columns.get(letters)
+                        if column is None:
+                            column = columns[letters] = _column_index(letters)
+                    else:
+                        column += 1
+                    if column > len(values) + 1:
+                        values.extend([None] * (column - 1 - len(values)))
+
+                    # Casos más comunes (texto compartido o número sin fórmula) sin llamadas extra
+                    if len(cell) == 1 and cell[0].tag == _VALUE and cell[0].text:
+                        data_type = cell.get("t")
+                        if data_type == "s":
+                            values.append(shared[int(cell[0].text)])
+                            continue
+                        if data_type is None and cell.get("s") not in date_styles:
+                            values.append(_cast_number(cell[0].text))
+                            continue
+                    values.append(self._cell_value(cell, shared, date_styles, epoch))
+
+                expected = number + 1
+                # Liberar las celdas ya leídas para no construir el árbol completo
+                element.clear()
+                yield tuple(values)
+
+        if max_row is not None:
+            while expected <= max_row:
+                expected += 1
+                yield ()
+
+    @staticmethod
+    def _cell_value(cell, shared, date_styles, epoch):
+        """Valor de una celda, con las mismas conversiones que openpyxl"""
+        data_type = cell.get("t", "n")
+
+        formula = cell.find(_FORMULA)
+        if formula is not None:
+            if formula.get("t") is not None:
+                raise XlsxFormatError(f"fórmula {formula.get('t')} en {cell.get('r')}")
+            return "=" + (formula.text or "")
+
+        if data_type == "inlineStr":
+            inline = cell.find(_INLINE)
+            return _text_content(inline) if inline is not None else None
+
+        value = cell.findtext(_VALUE) or None
+        if value is None:
+            return None
+
+        if data_type == "n":
+            value = _cast_number(value)
+            if cell.get("s") in date_styles:
+                try:
+                    return from_excel(value, epoch)
+                except (OverflowError, ValueError):
+                    return "#VALUE!"
+            return value
+        if data_type == "s":
+            return shared[int(value)]
+        if data_type == "b":
+            return bool(int(value))
+        if data_type == "d":
+            return from_ISO8601(value)
+        # "str" (resultado de fórmula) y "e" (error) quedan como texto
+        return value
@@ -24,14 +24,17 @@ class TasasAnalyzer:
     def get_obras_with_visados(self, fecha_inicio=None, fecha_fin=None, incluir_analizadas=False, solo_pagadas=False):
         """Obtiene todas las obras que tienen tasas de visado en el período especificado"""
         try:
-            obras = self.data_manager.get_all_works("obra")
+            # De los años archivados solo se leen los que pueden aportar obras al período
+            archived_years = None
+            if fecha_inicio and fecha_fin:
+                archived_years = self.data_manager.archive.years_for_visados(fecha_inicio, fecha_fin)
+            
+            # Se filtra sobre los registros del almacén sin copiarlos; solo se
+            # copian los que se devuelven, que otros hilos pueden modificar
+            obras = self.data_manager.get_all_works_detailed("obra", copy=False, archived_years=archived_years)
             obras_con_visados = []
             
-            for obra in obras:
-                obra_completa = self.data_manager.get_work_by_id("obra", obra["id"])
-                if not obra_completa:
-                    continue
-                
+            for obra_completa in obras:
                 # Verificar si tiene alguna tasa de visado
                 tiene_visados = any([
                     obra_completa.get("visado_gas") and str(obra_completa["visado_gas"]).strip(),
@@ -76,7 +79,7 @@ class TasasAnalyzer:
                     if obra_completa.get("analizada_en_periodo"):
                         continue
                 
-                obras_con_visados.append(obra_completa)
+                obras_con_visados.append(dict(obra_completa))
             
             return obras_con_visados
         except Exception as e:
@@ -166,8 +169,8 @@ class TasasAnalyzer:
             primer_dia = datetime(año, mes, 1)
             ultimo_dia = datetime(año, mes, calendar.monthrange(año, mes)[1])
             
-            # Obtener obras con visados (todas, para luego separar)
-            todas_obras_con_visados = self.get_obras_with_visados(incluir_analizadas=False)
+            # Obtener obras con visados (pagadas en el período y todas las no pagadas, para luego separar)
+            todas_obras_con_visados = self.get_obras_with_visados(primer_dia, ultimo_dia, incluir_analizadas=False)
             
             if not todas_obras_con_visados:
                 return {
@@ -215,8 +218,9 @@ class TasasAnalyzer:
             # Marcar obras como analizadas si se solicita (solo las pagadas en el período)
             if marcar_como_analizadas:
                 periodo_marca = f"{mes:02d}/{año}"
-                for obra in obras_pagadas_en_periodo:
-                    self.marcar_obra_como_analizada(obra["id"], periodo_marca)
+                self.marcar_obras_como_analizadas(
+                    [obra["id"] for obra in obras_pagadas_en_periodo], periodo_marca
+                )
             
             return {
                 "periodo": f"{calendar.month_name[mes]} {año}",
@@ -240,8 +244,8 @@ class TasasAnalyzer:
     def generar_analisis_fechas(self, fecha_inicio, fecha_fin, marcar_como_analizadas=False):
         """Genera el análisis completo para un rango de fechas específico"""
         try:
-            # Obtener obras con visados (todas, para luego separar)
-            todas_obras_con_visados = self.get_obras_with_visados(incluir_analizadas=False)
+            # Obtener obras con visados (pagadas en el período y todas las no pagadas, para luego separar)
+            todas_obras_con_visados = self.get_obras_with_visados(fecha_inicio, fecha_fin, incluir_analizadas=False)
             
             if not todas_obras_con_visados:
                 return {
@@ -291,8 +295,9 @@ class TasasAnalyzer:
             # Marcar obras como analizadas si se solicita (solo las pagadas en el período)
             if marcar_como_analizadas:
                 periodo_marca = f"{fecha_inicio.strftime('%d/%m/%Y')} - {fecha_fin.strftime('%d/%m/%Y')}"
-                for obra in obras_pagadas_en_periodo:
-                    self.marcar_obra_como_analizada(obra["id"], periodo_marca)
+                self.marcar_obras_como_analizadas(
+                    [obra["id"] for obra in obras_pagadas_en_periodo], periodo_marca
+                )
             
             # Crear descripción del período
             fecha_inicio_str = fecha_inicio.strftime("%d/%m/%Y")
@@ -327,6 +332,17 @@ class TasasAnalyzer:
             print(f"Error al marcar obra como analizada: {e}")
             return False
     
+    def marcar_obras_como_analizadas(self, obra_ids, periodo):
+        """Marca varias obras como analizadas en un período, con un solo guardado"""
+        try:
+            if not obra_ids:
+                return 0
+            data = {"analizada_en_periodo": periodo}
+            return self.data_manager.update_many("obra", obra_ids, data)
+        except Exception as e:
+            print(f"Error al marcar obras como analizadas: {e}")
+            return 0
+    
     def exportar_a_excel(self, analisis, ruta_archivo):
         """Exporta el análisis a un archivo Excel con auto-ajuste de columnas"""
         try:
@@ -1,4 +1,3 @@
-import webbrowser
 import urllib.parse
 import subprocess
 import os
@@ -95,6 +94,8 @@ class WhatsAppSender:
             
             # Función para abrir WhatsApp Web
             def open_whatsapp():
+                # webbrowser se importa recién al abrir WhatsApp (acelera el arranque)
+                import webbrowser
                 encoded_message = urllib.parse.quote(message)
                 url = f"{WHATSAPP_WEB_URL}?phone={formatted_phone}&text={encoded_message}"
                 webbrowser.open(url)
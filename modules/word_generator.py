@@ -1,9 +1,15 @@
 import os
 from datetime import datetime
-from docx import Document
 from pathlib import Path
 from config import TEMPLATE_OBRA_SELLADO, TEMPLATE_OBRA_VISADO, TEMPLATE_INFORME
 
+
+def _open_template(path):
+    """Abre una plantilla Word; python-docx (y lxml) se importan recién al generar el primer documento"""
+    from docx import Document
+    return Document(path)
+
+
 class WordGenerator:
     def __init__(self):
         self.template_obra_sellado = TEMPLATE_OBRA_SELLADO
@@ -39,7 +45,7 @@ class WordGenerator:
         
         try:
             # Cargar la plantilla
-            doc = Document(self.template_obra_sellado)
+            doc = _open_template(self.template_obra_sellado)
             
             # Preparar los reemplazos
             replacements = {
@@ -204,7 +210,7 @@ class WordGenerator:
         
         try:
             # Cargar la plantilla
-            doc = Document(self.template_obra_visado)
+            doc = _open_template(self.template_obra_visado)
             
             # Preparar los reemplazos
             replacements = {
@@ -371,7 +377,7 @@ class WordGenerator:
         
         try:
             # Cargar la plantilla
-            doc = Document(self.template_informe)
+            doc = _open_template(self.template_informe)
             
             # Función para obtener el valor de reemplazo
             def get_replacement(placeholder):
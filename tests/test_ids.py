@@ -0,0 +1,193 @@
+"""
+Asignación de IDs: libros anteriores a la columna ID, filas agregadas a
+mano y trabajos de años archivados.
+"""
+
+import os
+import sys
+import atexit
+import tempfile
+import unittest
+from pathlib import Path
+
+import openpyxl
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modules.data_manager import DataManager
+from modules.storage.excel_backend import (
+    assign_missing_ids, create_sheet, headers_for, read_ids, sheet_columns, sheet_name_for
+)
+
+
+def crear_libro_sin_ids(path, obras, informes):
+    """Libro como los de antes de la columna ID: mismos encabezados, sin "ID" """
+    workbook = openpyxl.Workbook()
+    workbook.remove(workbook.active)
+    for work_type, nombres in (("obra", obras), ("informe", informes)):
+        sheet = workbook.create_sheet(sheet_name_for(work_type))
+        headers = [header for header in headers_for(work_type) if header != "ID"]
+        sheet.append(headers)
+        columna = headers.index("Nombre del Profesional" if work_type == "obra" else "Profesional")
+        for nombre in nombres:
+            row = [None] * len(headers)
+            row[0] = "01/03/2024"
+            row[columna] = nombre
+            sheet.append(row)
+    workbook.save(path)
+
+
+def agregar_fila_a_mano(path, work_type, **values):
+    """Agrega al final de la hoja una fila escrita a mano en Excel (sin ID si no se indica)"""
+    workbook = openpyxl.load_workbook(path)
+    sheet = workbook[sheet_name_for(work_type)]
+    columns = sheet_columns(sheet, work_type, add_missing=False)
+    row = sheet.max_row + 1
+    for field, value in values.items():
+        sheet.cell(row=row, column=columns[field], value=value)
+    workbook.save(path)
+
+
+def ids_en_disco(path, work_type):
+    """{id: fila} leído de la columna ID del libro"""
+    workbook = openpyxl.load_workbook(path)
+    sheet = workbook[sheet_name_for(work_type)]
+    return read_ids(sheet, sheet_columns(sheet, work_type, add_missing=False))
+
+
+class DataManagerTestCase(unittest.TestCase):
+    """DataManager sobre un directorio temporal"""
+
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._dir = tempfile.TemporaryDirectory()
+        os.chdir(self._dir.name)
+        self.path = Path("registros.xlsx")
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._dir.cleanup()
+
+    def _open(self):
+        """DataManager sobre el directorio temporal (sin guardado al salir fuera de él)"""
+        data_manager = DataManager()
+        self.addCleanup(atexit.unregister, data_manager.flush)
+        return data_manager
+
+
+class AssignMissingIdsTest(unittest.TestCase):
+
+    def _sheet(self, ids):
+        workbook = openpyxl.Workbook()
+        workbook.remove(workbook.active)
+        sheet = create_sheet(workbook, "obra")
+        columns = sheet_columns(sheet, "obra")
+        for row, row_id in enumerate(ids, 2):
+            sheet.cell(row=row, column=columns["nombre_profesional"], value=f"Fila {row}")
+            sheet.cell(row=row, column=columns["id"], value=row_id)
+        return sheet, columns
+
+    def test_rows_without_id_get_their_position(self):
+        sheet, columns = self._sheet([None, None, None])
+
+        self.assertEqual(assign_missing_ids(sheet, "obra", columns), 3)
+        self.assertEqual(read_ids(sheet, columns), {1: 2, 2: 3, 3: 4})
+
+    def test_repeated_or_taken_ids_get_the_next_free_one(self):
+        # La posición de la fila 4 (3) ya es el ID de la fila 2; la fila 5 repite el 7
+        sheet, columns = self._sheet([3, 7, None, 7])
+
+        self.assertEqual(assign_missing_ids(sheet, "obra", columns), 2)
+        self.assertEqual(read_ids(sheet, columns), {3: 2, 7: 3, 8: 4, 4: 5})
+
+    def test_assigned_ids_stay_above_min_id(self):
+        sheet, columns = self._sheet([None, 50, None])
+
+        assign_missing_ids(sheet, "obra", columns, min_id=40)
+        ids = read_ids(sheet, columns)
+        self.assertEqual(len(ids), 3)
+        self.assertTrue(all(row_id > 40 for row_id in ids))
+
+
+class LegacyWorkbookTest(DataManagerTestCase):
+
+    def test_repair_assigns_ids_and_saves_them(self):
+        crear_libro_sin_ids(self.path, ["Ana", "Beto", "Carla"], ["Dario", "Elena"])
+
+        data_manager = self._open()
+        obras = {record["id"]: record["nombre_profesional"] for record in data_manager.get_all_works("obra")}
+        informes = [record["id"] for record in data_manager.get_all_works("informe")]
+        self.assertEqual(obras, {1: "Ana", 2: "Beto", 3: "Carla"})
+        self.assertEqual(informes, [1, 2])
+
+        # Los IDs quedaron escritos en el libro
+        self.assertEqual(ids_en_disco(self.path, "obra"), {1: 2, 2: 3, 3: 4})
+        self.assertEqual(ids_en_disco(self.path, "informe"), {1: 2, 2: 3})
+
+        self.assertEqual(data_manager.add_obra_general({"fecha": "02/03/2024", "nombre_profesional": "Diego"}), 4)
+        data_manager.close()
+
+        data_manager = self._open()
+        self.assertEqual(data_manager.get_work_by_id("obra", 2)["nombre_profesional"], "Beto")
+        self.assertEqual(data_manager.get_work_by_id("obra", 4)["nombre_profesional"], "Diego")
+        data_manager.close()
+
+    def test_rows_added_by_hand_get_a_new_id(self):
+        crear_libro_sin_ids(self.path, ["Ana", "Beto"], [])
+        self._open().close()
+
+        agregar_fila_a_mano(self.path, "obra", fecha="05/03/2024", nombre_profesional="Mano", id=1)
+        agregar_fila_a_mano(self.path, "obra", fecha="05/03/2024", nombre_profesional="Sin ID")
+
+        data_manager = self._open()
+        obras = {record["id"]: record["nombre_profesional"] for record in data_manager.get_all_works("obra")}
+        data_manager.close()
+        self.assertEqual(obras, {1: "Ana", 2: "Beto", 3: "Mano", 4: "Sin ID"})
+
+
+class ArchivedIdsTest(DataManagerTestCase):
+
+    def setUp(self):
+        super().setUp()
+        data_manager = self._open()
+        for nombre in ("Ana", "Beto", "Carla"):
+            data_manager.add_obra_general({
+                "fecha": "10/05/2023", "nombre_profesional": nombre, "fecha_salida": "20/06/2023"
+            })
+        data_manager.add_obra_general({"fecha": "10/05/2024", "nombre_profesional": "Abierta"})
+        self.assertEqual(data_manager.archive_year(2023), 3)
+        self.assertEqual(data_manager.archive.max_id("obra"), 3)
+        data_manager.close()
+
+    def test_new_works_do_not_reuse_archived_ids(self):
+        data_manager = self._open()
+        nuevo_id = data_manager.add_obra_general({"fecha": "01/07/2024", "nombre_profesional": "Nueva"})
+        data_manager.close()
+
+        self.assertEqual(nuevo_id, 5)
+
+    def test_rows_added_by_hand_stay_above_archived_ids(self):
+        # La fila 3 tendría el ID 2 por su posición, que es de un trabajo archivado
+        agregar_fila_a_mano(self.path, "obra", fecha="05/07/2024", nombre_profesional="Mano 1")
+        agregar_fila_a_mano(self.path, "obra", fecha="05/07/2024", nombre_profesional="Mano 2")
+
+        data_manager = self._open()
+        obras = data_manager.get_all_works("obra")
+        ids = [record["id"] for record in obras]
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertEqual(len(ids), 6)
+
+        a_mano = {record["nombre_profesional"]: record["id"] for record in obras
+                  if record["nombre_profesional"].startswith("Mano")}
+        self.assertTrue(all(row_id > 4 for row_id in a_mano.values()))
+
+        # Los IDs archivados siguen llevando a los trabajos archivados
+        self.assertEqual(data_manager.get_work_by_id("obra", 2)["nombre_profesional"], "Beto")
+        self.assertEqual(data_manager.get_work_by_id("obra", a_mano["Mano 1"])["nombre_profesional"], "Mano 1")
+        self.assertEqual(data_manager.add_obra_general({"fecha": "06/07/2024", "nombre_profesional": "Nueva"}),
+                         max(ids) + 1)
+        data_manager.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
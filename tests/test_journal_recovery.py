@@ -0,0 +1,83 @@
+"""
+Recuperación del diario después de un cierre inesperado.
+"""
+
+import os
+import sys
+import atexit
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modules.data_manager import DataManager
+from modules.storage.excel_backend import ExcelBackend
+from modules.storage.journal import journal_path_for
+
+
+class FailOnceBackend(ExcelBackend):
+    """ExcelBackend cuyo primer guardado falla (como con el Excel abierto)"""
+
+    def __init__(self, excel_file):
+        super().__init__(excel_file)
+        self.failures = 1
+
+    def apply_batch(self, appends, updates):
+        if self.failures:
+            self.failures -= 1
+            raise PermissionError("registros.xlsx está abierto en otro programa")
+        return super().apply_batch(appends, updates)
+
+
+class JournalRecoveryTest(unittest.TestCase):
+
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._dir = tempfile.TemporaryDirectory()
+        os.chdir(self._dir.name)
+
+        data_manager = self._open()
+        for numero in range(4):
+            data_manager.add_obra_general({"fecha": "01/03/2024", "nombre_profesional": f"Profesional {numero}"})
+        data_manager.close()
+
+        # Alta que quedó en el diario sin llegar al Excel
+        entry = {"op": "add", "work_type": "obra", "data": {"fecha": "02/03/2024", "nombre_profesional": "Lost?", "id": 5}}
+        with open(journal_path_for(Path("registros.xlsx")), "w", encoding="utf-8") as journal_file:
+            journal_file.write(json.dumps(entry) + "\n")
+
+    def _open(self, backend=None):
+        """DataManager sobre el directorio temporal (sin guardado al salir fuera de él)"""
+        data_manager = DataManager(backend=backend)
+        self.addCleanup(atexit.unregister, data_manager.flush)
+        return data_manager
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._dir.cleanup()
+
+    def test_failed_first_flush_does_not_reuse_recovered_ids(self):
+        backend = FailOnceBackend(Path("registros.xlsx"))
+        data_manager = self._open(backend)
+        self.assertEqual(backend.failures, 0)
+
+        # El alta recuperada está en memoria aunque el guardado falló
+        self.assertEqual(data_manager.get_work_by_id("obra", 5)["nombre_profesional"], "Lost?")
+
+        second_id = data_manager.add_obra_general({"fecha": "03/03/2024", "nombre_profesional": "Second"})
+        self.assertEqual(second_id, 6)
+        self.assertTrue(data_manager.flush())
+        data_manager.close()
+
+        data_manager = self._open()
+        nombres = {work["id"]: work["nombre_profesional"] for work in data_manager.get_all_works("obra")}
+        data_manager.close()
+        self.assertEqual(nombres[5], "Lost?")
+        self.assertEqual(nombres[6], "Second")
+        self.assertEqual(len(nombres), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+"""
+Conversión de filas de una hoja en registros según su fila de encabezados.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modules.storage.schema import schema_for
+from modules.storage.records import record_class_for
+
+
+class RowConverterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.schema = schema_for("obra")
+
+    def test_extra_column_is_not_read_as_missing_id(self):
+        # Todos los campos, sin columna ID y con una columna de notas al final
+        header = [field.header for field in self.schema.fields] + ["Notas"]
+        convert, _ = self.schema.row_converter(header, record_class_for("obra"))
+
+        record = convert(tuple(f"valor {n}" for n in range(len(self.schema.fields))) + (42,))
+        self.assertIsNone(record.id)
+        self.assertEqual(record.fecha, "valor 0")
+
+    def test_extra_column_is_not_read_as_missing_field(self):
+        header = ["Fecha", "Notas"]
+        convert, _ = self.schema.row_converter(header)
+
+        record = convert(("01/03/2024", "nota"))
+        self.assertEqual(record["fecha"], "01/03/2024")
+        self.assertIsNone(record["profesion"])
+        self.assertIsNone(record["id"])
+
+    def test_short_rows_are_padded(self):
+        header = [field.header for field in self.schema.columns]
+        convert, width = self.schema.row_converter(header, record_class_for("obra"))
+
+        record = convert(("01/03/2024",))
+        self.assertEqual(record.fecha, "01/03/2024")
+        self.assertIsNone(record.nro_caja)
+        self.assertIsNone(record.id)
+
+        row = [None] * width
+        row[-1] = 7
+        self.assertEqual(convert(tuple(row) + ("extra",)).id, 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+"""
+Guardado de lotes modificando el XML de las hojas (xlsx_patch.py) y su
+alternativa con openpyxl.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import openpyxl
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modules.storage.excel_backend import ExcelBackend, create_sheet
+from modules.storage.xlsx_patch import patch_workbook
+from modules.storage.xlsx_reader import XlsxFormatError
+
+
+def crear_libro(path):
+    """Libro vacío con las dos hojas y sus encabezados"""
+    workbook = openpyxl.Workbook()
+    workbook.remove(workbook.active)
+    create_sheet(workbook, "obra")
+    create_sheet(workbook, "informe")
+    workbook.save(path)
+
+
+def informe(row_id, **values):
+    data = {"fecha": "02/03/2024", "profesional": f"Profesional {row_id}", "id": row_id}
+    data.update(values)
+    return data
+
+
+def obra(row_id, **values):
+    data = {"fecha": "01/03/2024", "nombre_profesional": f"Profesional {row_id}", "id": row_id}
+    data.update(values)
+    return data
+
+
+class XlsxPatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.path = Path(self._dir.name) / "registros.xlsx"
+        crear_libro(self.path)
+        self.backend = ExcelBackend(self.path)
+        # El primer guardado con openpyxl deja en el libro el estilo de moneda
+        # que necesita el guardado rápido
+        self.assertTrue(self.backend._apply_batch_openpyxl([("obra", obra(1, tasa_sellado=1500.0))], {}))
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+    def _obras(self):
+        obras, _ = ExcelBackend(self.path)._read_records()
+        return {record.id: record for record in obras}
+
+    def _registros(self, path):
+        obras, informes = ExcelBackend(path)._read_records()
+        return [dict(record) for record in obras], [dict(record) for record in informes]
+
+    def test_appends_and_updates_round_trip_like_openpyxl(self):
+        copia = Path(self._dir.name) / "copia.xlsx"
+        shutil.copy(self.path, copia)
+        appends = [
+            ("obra", obra(2, nombre_comitente="Pérez & Hijos <SA>", tasa_sellado=2500.5, nro_caja="12")),
+            ("obra", obra(3, ubicacion="  Calle 3 ", nro_copias=2)),
+            ("informe", informe(1, detalle="Informe \"técnico\"", tasa_sellado=300.0)),
+        ]
+        updates = {("obra", 1): {"nro_caja": 4, "estado_pago_sellado": "Pagado", "tasa_sellado": 1750.0}}
+
+        self.assertEqual(patch_workbook(self.path, appends, updates), 3)
+        self.assertTrue(ExcelBackend(copia)._apply_batch_openpyxl(appends, updates))
+
+        obras, informes = self._registros(self.path)
+        self.assertEqual((obras, informes), self._registros(copia))
+        self.assertEqual([record["id"] for record in obras], [1, 2, 3])
+        self.assertEqual(obras[0]["nro_caja"], 4)
+        self.assertEqual(obras[0]["tasa_sellado"], 1750.0)
+        self.assertEqual(obras[1]["nombre_comitente"], "Pérez & Hijos <SA>")
+        self.assertEqual(informes[0]["detalle"], 'Informe "técnico"')
+
+        # El libro guardado por el XML se sigue abriendo con openpyxl
+        sheet = openpyxl.load_workbook(self.path)["Obras en general"]
+        self.assertEqual(sheet.max_row, 4)
+
+        # Un segundo lote sobre las filas agregadas; repetir las altas no las duplica
+        self.assertEqual(patch_workbook(self.path, appends[:1], {("obra", 3): {"persona_retira": "Juan"}}), 0)
+        obras = self._obras()
+        self.assertEqual(len(obras), 3)
+        self.assertEqual(obras[3]["persona_retira"], "Juan")
+        self.assertEqual(obras[3]["ubicacion"], "  Calle 3 ")
+
+    def test_falls_back_to_openpyxl_on_format_error(self):
+        with mock.patch("modules.storage.excel_backend.patch_workbook",
+                        side_effect=XlsxFormatError("formato no soportado")) as patch, \
+                mock.patch.object(ExcelBackend, "_apply_batch_openpyxl",
+                                  wraps=self.backend._apply_batch_openpyxl) as fallback:
+            self.assertTrue(self.backend.apply_batch([("obra", obra(2))], {("obra", 1): {"nro_caja": 4}}))
+
+        patch.assert_called_once()
+        fallback.assert_called_once()
+        obras = self._obras()
+        self.assertEqual(obras[2]["nombre_profesional"], "Profesional 2")
+        self.assertEqual(obras[1]["nro_caja"], 4)
+
+    def test_failed_replace_leaves_no_temporary_file(self):
+        before = self.path.read_bytes()
+        with mock.patch("modules.storage.xlsx_patch.os.replace",
+                        side_effect=PermissionError("registros.xlsx está abierto en Excel")):
+            with self.assertRaises(PermissionError):
+                patch_workbook(self.path, [("obra", obra(2))], {})
+
+        self.assertEqual(os.listdir(self._dir.name), ["registros.xlsx"])
+        self.assertEqual(self.path.read_bytes(), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Compara el lector rápido de Excel (modules/storage/xlsx_reader.py) con openpyxl
+Genera un libro sintético con las hojas de registros.xlsx, lo lee con
+cada método, verifica que los registros obtenidos sean iguales y muestra
+los tiempos.
+
+Uso:
+    python tools/benchmark_xlsx.py [cantidad de obras] [repeticiones]
+"""
+
+import os
+import sys
+import time
+import random
+import tempfile
+from datetime import datetime
+
+import openpyxl
+
+# Se ejecuta desde tools/: los módulos del sistema están en la carpeta superior
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.storage.excel_backend import create_sheet, read_records, read_workbook
+from modules.storage.schema import schema_for
+from modules.storage.xlsx_reader import XlsxReader
+
+
+PROFESIONALES = ["PÉREZ JUAN", "GÓMEZ ANA", "López Carlos", "Núñez María", "IMLAUER FERNANDO"]
+COMITENTES = ["Municipalidad de Posadas", "ACME SA", "José Martínez", "Cooperativa Eléctrica"]
+
+
+def crear_libro(path, cantidad_obras):
+    """Crea un registros.xlsx sintético con cantidad_obras obras y una décima parte de informes"""
+    random.seed(1)
+    workbook = openpyxl.Workbook()
+    workbook.remove(workbook.active)
+
+    for work_type, cantidad in (("obra", cantidad_obras), ("informe", max(cantidad_obras // 10, 1))):
+        sheet = create_sheet(workbook, work_type)
+        schema = schema_for(work_type)
+        for row_id in range(1, cantidad + 1):
+            values = []
+            for field in schema.fields:
+                if field.name == "fecha":
+                    # Mezcla de fechas como texto y como fecha de Excel
+                    value = datetime(2024, random.randint(1, 12), random.randint(1, 28)) if row_id % 5 == 0 \
+                        else f"{random.randint(1, 28):02d}/{random.randint(1, 12):02d}/2024"
+                elif field.name in schema.currency_fields:
+                    value = float(random.randint(1, 50) * 100) if row_id % 3 else None
+                elif "profesional" in field.name:
+                    value = random.choice(PROFESIONALES)
+                elif "comitente" in field.name:
+                    value = random.choice(COMITENTES)
+                elif field.name == "nro_caja":
+                    value = row_id // 20 + 1 if row_id % 7 else None
+                elif field.name == "nro_copias":
+                    value = random.randint(1, 4)
+                else:
+                    value = f"{field.header} {row_id}" if row_id % 2 else None
+                values.append(value)
+            values.append(row_id)  # columna ID
+            sheet.append(values)
+
+    workbook.save(path)
+
+
+def medir(nombre, funcion, repeticiones):
+    """Ejecuta la función varias veces y devuelve (mejor tiempo, último resultado)"""
+    mejor = None
+    resultado = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        transcurrido = time.perf_counter() - inicio
+        mejor = transcurrido if mejor is None else min(mejor, transcurrido)
+    print(f"  {nombre:<42} {mejor * 1000:9.1f} ms")
+    return mejor, resultado
+
+
+def leer_openpyxl_completo(path):
+    """openpyxl.load_workbook en modo normal (construye todas las celdas)"""
+    workbook = openpyxl.load_workbook(path)
+    try:
+        return read_records(workbook)
+    finally:
+        workbook.close()
+
+
+def leer_openpyxl_solo_lectura(path):
+    """openpyxl.load_workbook con read_only=True"""
+    workbook = openpyxl.load_workbook(path, read_only=True)
+    try:
+        return read_records(workbook)
+    finally:
+        workbook.close()
+
+
+def leer_rapido(path):
+    """Lector rápido (iterparse sobre el XML del libro)"""
+    workbook = XlsxReader(path)
+    try:
+        return read_records(workbook)
+    finally:
+        workbook.close()
+
+
+def main():
+    cantidad_obras = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    repeticiones = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        path = os.path.join(carpeta, "registros.xlsx")
+        print(f"Generando libro con {cantidad_obras} obras...")
+        crear_libro(path, cantidad_obras)
+        print(f"Tamaño del archivo: {os.path.getsize(path) / 1024:.0f} KB")
+
+        print(f"Mejor de {repeticiones} lecturas:")
+        completo, esperado = medir("openpyxl.load_workbook", lambda: leer_openpyxl_completo(path), repeticiones)
+        solo_lectura, esperado_ro = medir("openpyxl.load_workbook(read_only=True)", lambda: leer_openpyxl_solo_lectura(path), repeticiones)
+        rapido, obtenido = medir("xlsx_reader.XlsxReader", lambda: leer_rapido(path), repeticiones)
+        medir("read_workbook (usado por ExcelBackend)", lambda: read_workbook(path, read_records), repeticiones)
+
+        iguales = all(
+            [record.copy() for record in a] == [record.copy() for record in b]
+            for registros in (esperado, esperado_ro)
+            for a, b in zip(registros, obtenido)
+        )
+        print(f"Registros iguales a los de openpyxl: {'sí' if iguales else 'NO'}")
+        print(f"Mejora: {completo / rapido:.1f}x sobre load_workbook, {solo_lectura / rapido:.1f}x sobre read_only")
+        return iguales
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)